@@ -0,0 +1,394 @@
+"""
+Gemini optimization tips for app.py: prompt, model selection, a persistent
+size-bounded tip cache and a process-wide client that coalesces, rate-limits
+and streams requests.
+
+Nothing here imports Streamlit, so latency and cache hit rate can be measured
+offline by pointing GEMINI_MODEL at the local fake model ("fake" or
+"fake:<latency seconds>").
+"""
+
+import hashlib
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+GEMINI_MODEL = os.environ.get("GEMINI_MODEL", "gemini-2.5-flash")
+TIP_CACHE_PATH = os.environ.get(
+    "TIP_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".tip_cache.sqlite3"),
+)
+TIP_CACHE_MAX_BYTES = int(os.environ.get("TIP_CACHE_MAX_BYTES", 8 * 1024 * 1024))
+# Upstream budget for the whole process (all sessions together)
+GEMINI_RPM = int(os.environ.get("GEMINI_RPM", 60))
+GEMINI_MAX_CONCURRENCY = int(os.environ.get("GEMINI_MAX_CONCURRENCY", 4))
+
+
+# mix is a concrete_mix.MixRecord (anything with its attributes will do)
+def tip_prompt(mix, target_strength):
+    return f"""
+    You are a civil engineer expert in Indian IS codes (10262:2019, 456:2000).
+    Given this concrete mix for {target_strength} MPa strength:
+    Cement: {mix.cement} kg, Water: {mix.water} L, Sand: {mix.sand} kg,
+    Coarse Agg: {mix.coarse_agg} kg, w/c: {mix.wc}.
+    Suggest 2-3 NOVEL ways to increase strength or reduce cost (e.g., add fly ash per IS 3812, up to 30%).
+    Keep suggestions short, practical, and compliant. Format as bullet points.
+    """
+
+
+def tip_key(mix, target_strength, model_name=GEMINI_MODEL):
+    # Only the values that reach the prompt, so equal mixes share one entry
+    normalized = [
+        model_name,
+        target_strength,
+        mix.cement,
+        mix.water,
+        mix.sand,
+        mix.coarse_agg,
+        mix.wc,
+    ]
+    return hashlib.sha1(json.dumps(normalized).encode()).hexdigest()
+
+
+class TipCache:
+    """SQLite-backed tip store with LRU eviction once the stored text exceeds max_bytes."""
+
+    def __init__(self, path=TIP_CACHE_PATH, max_bytes=TIP_CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = self.misses = self.evictions = 0
+        self._lock = threading.Lock()
+        try:
+            self._create()
+        except sqlite3.OperationalError:
+            # Unwritable app directory: keep the cache in the temp dir instead
+            self.path = os.path.join(tempfile.gettempdir(), os.path.basename(path))
+            self._create()
+
+    @contextmanager
+    def _db(self):
+        db = sqlite3.connect(self.path, timeout=10)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def _create(self):
+        with self._db() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS tips ("
+                "key TEXT PRIMARY KEY, tip TEXT NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS tips_last_used ON tips (last_used)")
+
+    def get(self, key):
+        with self._lock, self._db() as db:
+            row = db.execute("SELECT tip FROM tips WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            db.execute("UPDATE tips SET last_used = ? WHERE key = ?", (time.time(), key))
+            self.hits += 1
+            return row[0]
+
+    def put(self, key, tip):
+        size = len(tip.encode())
+        if size > self.max_bytes:
+            return
+        try:
+            with self._lock, self._db() as db:
+                db.execute("INSERT OR REPLACE INTO tips VALUES (?, ?, ?, ?)", (key, tip, size, time.time()))
+                total = db.execute("SELECT COALESCE(SUM(size), 0) FROM tips").fetchone()[0]
+                while total > self.max_bytes:
+                    old_key, old_size = db.execute(
+                        "SELECT key, size FROM tips ORDER BY last_used LIMIT 1"
+                    ).fetchone()
+                    db.execute("DELETE FROM tips WHERE key = ?", (old_key,))
+                    total -= old_size
+                    self.evictions += 1
+        except sqlite3.Error:
+            pass  # a failed cache write must not cost the user their tip
+
+    def stats(self):
+        with self._db() as db:
+            entries, size = db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM tips").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "bytes": size,
+        }
+
+    def prometheus_text(self):
+        stats = self.stats()
+        lines = []
+        for name, help_text in (("hits", "Tip cache hits."), ("misses", "Tip cache misses."),
+                                ("evictions", "Tip cache LRU evictions.")):
+            lines += [
+                f"# HELP app_tip_cache_{name}_total {help_text}",
+                f"# TYPE app_tip_cache_{name}_total counter",
+                f"app_tip_cache_{name}_total {stats[name]}",
+            ]
+        lines += [
+            "# HELP app_tip_cache_entries Tips stored in the tip cache.",
+            "# TYPE app_tip_cache_entries gauge",
+            f"app_tip_cache_entries {stats['entries']}",
+            "# HELP app_tip_cache_bytes Bytes of tip text stored in the tip cache.",
+            "# TYPE app_tip_cache_bytes gauge",
+            f"app_tip_cache_bytes {stats['bytes']}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+FAKE_TIP = (
+    "- Replace 20-25% of OPC with fly ash (IS 3812) to cut cement cost and heat of hydration.\n"
+    "- Add a PCE superplasticizer to keep the slump while lowering w/c by ~0.05.\n"
+    "- Use well-graded crushed sand (Zone II) to reduce paste demand.\n"
+)
+
+
+class QuotaExceeded(Exception):
+    """Raised by FakeTipModel the way the real API raises ResourceExhausted (HTTP 429)."""
+
+    code = 429
+
+
+def _is_quota_error(exc):
+    # google.api_core.exceptions.ResourceExhausted carries code 429 too
+    return getattr(exc, "code", None) == 429
+
+
+class FakeTipModel:
+    """Offline stand-in for genai.GenerativeModel with the same generate_content API."""
+
+    def __init__(self, latency=0.5, chunk_delay=0.01, text=FAKE_TIP, quota_errors=0):
+        self.latency = latency
+        self.chunk_delay = chunk_delay
+        self.text = text
+        self.quota_errors = quota_errors
+        self.calls = self.active = self.max_active = 0
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt, stream=False):
+        with self._lock:
+            self.calls += 1
+            if self.quota_errors > 0:
+                self.quota_errors -= 1
+                raise QuotaExceeded("fake quota exceeded")
+        if not stream:
+            with self._track():
+                time.sleep(self.latency)
+            return SimpleNamespace(text=self.text)
+        return self._stream()
+
+    @contextmanager
+    def _track(self):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.active -= 1
+
+    def _stream(self):
+        with self._track():
+            time.sleep(self.latency)
+            for line in self.text.splitlines(keepends=True):
+                time.sleep(self.chunk_delay)
+                yield SimpleNamespace(text=line)
+
+
+def make_model(name=GEMINI_MODEL, api_key=""):
+    if name.startswith("fake"):
+        _, _, latency = name.partition(":")
+        return FakeTipModel(latency=float(latency or 0.5))
+    import google.generativeai as genai
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel(name)
+
+
+class _Call:
+    """One upstream generate_content call; every subscriber replays its chunks from the start."""
+
+    def __init__(self):
+        self.chunks = []
+        self.done = False
+        self.error = None
+        self._cond = threading.Condition()
+
+    def push(self, text):
+        with self._cond:
+            self.chunks.append(text)
+            self._cond.notify_all()
+
+    def finish(self, error=None):
+        with self._cond:
+            self.done = True
+            self.error = error
+            self._cond.notify_all()
+
+    def __iter__(self):
+        seen = 0
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: len(self.chunks) > seen or self.done)
+                new, done, error = self.chunks[seen:], self.done, self.error
+            yield from new
+            seen += len(new)
+            if done:
+                if error is not None:
+                    raise error
+                return
+
+
+class GeminiClient:
+    """
+    Process-wide front for one model. Identical in-flight prompts share a
+    single upstream call; calls start no faster than `rpm` per minute and at
+    most `max_concurrency` at a time; quota errors pause every caller with
+    exponential backoff before retrying.
+    """
+
+    def __init__(self, model, rpm=GEMINI_RPM, max_concurrency=GEMINI_MAX_CONCURRENCY,
+                 max_retries=4, backoff_base=2.0, backoff_max=60.0):
+        self.model = model
+        self.rpm = rpm
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="gemini")
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._starts = deque()
+        self._paused_until = 0.0
+        self._waits = deque(maxlen=1000)
+        self.requests = self.coalesced = self.retries = self.quota_errors = self.queued = 0
+
+    def stream(self, prompt, on_complete=None):
+        """Iterable of text chunks; on_complete(text) runs once the upstream call succeeds."""
+        with self._lock:
+            call = self._inflight.get(prompt)
+            if call is not None:
+                self.coalesced += 1
+                return call
+            call = self._inflight[prompt] = _Call()
+            self.queued += 1
+        self._executor.submit(self._run, prompt, call, on_complete, time.monotonic())
+        return call
+
+    def generate(self, prompt):
+        return "".join(self.stream(prompt))
+
+    def _run(self, prompt, call, on_complete, submitted):
+        with self._lock:
+            self.queued -= 1
+        error = None
+        try:
+            for attempt in range(self.max_retries + 1):
+                self._wait_for_budget()
+                if attempt == 0:
+                    self._waits.append(time.monotonic() - submitted)
+                with self._lock:
+                    self.requests += 1
+                try:
+                    for chunk in self.model.generate_content(prompt, stream=True):
+                        call.push(chunk.text)
+                    break
+                except Exception as exc:
+                    # Text already streamed to users cannot be retried
+                    if not _is_quota_error(exc) or call.chunks or attempt == self.max_retries:
+                        raise
+                    self._back_off(attempt)
+            if on_complete is not None:
+                on_complete("".join(call.chunks))
+        except Exception as exc:
+            error = exc
+        finally:
+            with self._lock:
+                self._inflight.pop(prompt, None)
+            call.finish(error)
+
+    def _wait_for_budget(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._starts and now - self._starts[0] >= 60:
+                    self._starts.popleft()
+                delay = self._paused_until - now
+                if delay <= 0:
+                    if len(self._starts) < self.rpm:
+                        self._starts.append(now)
+                        return
+                    delay = 60 - (now - self._starts[0])
+            time.sleep(delay)
+
+    def _back_off(self, attempt):
+        delay = min(self.backoff_base * 2 ** attempt, self.backoff_max) * random.uniform(1.0, 1.25)
+        with self._lock:
+            self.quota_errors += 1
+            self.retries += 1
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+
+    def stats(self):
+        with self._lock:
+            waits = sorted(self._waits)
+            stats = {
+                "requests": self.requests,
+                "coalesced": self.coalesced,
+                "retries": self.retries,
+                "quota_errors": self.quota_errors,
+                "queue_depth": self.queued,
+                "in_flight": len(self._inflight),
+            }
+        stats["wait_p50_ms"] = waits[len(waits) // 2] * 1000 if waits else 0.0
+        stats["wait_p99_ms"] = waits[min(len(waits) - 1, int(len(waits) * 0.99))] * 1000 if waits else 0.0
+        return stats
+
+    def prometheus_text(self):
+        stats = self.stats()
+        lines = []
+        for name, help_text in (("requests", "Upstream Gemini calls started, retries included."),
+                                ("coalesced", "Tip requests served by an identical in-flight call."),
+                                ("retries", "Gemini calls retried after a quota error."),
+                                ("quota_errors", "Gemini quota (429) errors.")):
+            lines += [
+                f"# HELP app_gemini_{name}_total {help_text}",
+                f"# TYPE app_gemini_{name}_total counter",
+                f"app_gemini_{name}_total {stats[name]}",
+            ]
+        lines += [
+            "# HELP app_gemini_queue_depth Gemini calls waiting for a worker.",
+            "# TYPE app_gemini_queue_depth gauge",
+            f"app_gemini_queue_depth {stats['queue_depth']}",
+            "# HELP app_gemini_in_flight Gemini calls queued or streaming.",
+            "# TYPE app_gemini_in_flight gauge",
+            f"app_gemini_in_flight {stats['in_flight']}",
+            "# HELP app_gemini_wait_seconds Time a call waited for a worker and the rate budget (last 1000 calls).",
+            "# TYPE app_gemini_wait_seconds summary",
+            f'app_gemini_wait_seconds{{quantile="0.5"}} {stats["wait_p50_ms"] / 1000:.6f}',
+            f'app_gemini_wait_seconds{{quantile="0.99"}} {stats["wait_p99_ms"] / 1000:.6f}',
+        ]
+        return "\n".join(lines) + "\n"
+
+
+def request_tip(client, cache, mix, target_strength, model_name=GEMINI_MODEL):
+    """Text chunks for the tip: the whole cached tip at once, or a live stream that fills the cache when it completes."""
+    key = tip_key(mix, target_strength, model_name)
+    cached = cache.get(key)
+    if cached is not None:
+        return [cached]
+    return client.stream(tip_prompt(mix, target_strength), on_complete=lambda tip: cache.put(key, tip))
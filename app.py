@@ -1,11 +1,17 @@
 
+import functools
 import streamlit as st
-import google.generativeai as genai
-import pandas as pd
-import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+import ai_tips
+import perf
+import result_cache
+# Engineering layer (IS 10262 formulas, prices, lookup table) lives in the
+# headless concrete_mix package; app.py only renders it.
+from concrete_mix import (
+    EXPOSURE_LIMITS, PRICES, PriceBook, cost_by_region, design_project, lookup_record, optimize_mix,
+    project_csv, read_project_schedule, solve_blend, summarize_project,
+)
+# google.generativeai, pandas and plotly are imported where they are first
+# needed, so a cold start paints the page without paying for them.
 
 # Page config for modern look (wide layout, fav icon)
 st.set_page_config(
@@ -19,8 +25,23 @@ st.set_page_config(
 if "dark_mode" not in st.session_state:
     st.session_state.dark_mode = False
 
+# Stage timings for this rerun (sidebar "Performance" toggle, or PERF_* env export).
+# Fragments time their own reruns under their own scope; the latest timings
+# of each scope (and the chart bytes it sent) are kept in perf_last /
+# perf_payload for the sidebar panel.
+perf_run = perf.start_rerun(st.session_state.get("perf_panel", False))
+perf.serve_metrics()
+if "perf_last" not in st.session_state:
+    st.session_state.perf_last = {}
+    st.session_state.perf_payload = {}
+
+def keep_timings(run):
+    if run.enabled:
+        st.session_state.perf_last[run.scope] = run.stages
+        st.session_state.perf_payload[run.scope] = run.payload
+
 # Custom CSS for professional, modern civil theme (concrete grays, clean lines)
-st.markdown("""
+BASE_CSS = """
 <style>
     :root {
         --concrete-100: #f5f6f7;
@@ -86,7 +107,7 @@ st.markdown("""
     }
 
     /* Buttons - safety orange primary */
-    .stButton > button {
+    .stButton > button, [data-testid="stFormSubmitButton"] > button {
         background: linear-gradient(45deg, var(--accent-orange), #d35400);
         color: #fff;
         border-radius: 10px;
@@ -96,8 +117,8 @@ st.markdown("""
         box-shadow: 0 4px 10px rgba(243, 156, 18, 0.35);
         transition: transform 0.08s ease-out, filter 0.12s ease-out;
     }
-    .stButton > button:hover { filter: brightness(1.05); transform: translateY(-1px); }
-    .stButton > button:active { transform: translateY(0); }
+    .stButton > button:hover, [data-testid="stFormSubmitButton"] > button:hover { filter: brightness(1.05); transform: translateY(-1px); }
+    .stButton > button:active, [data-testid="stFormSubmitButton"] > button:active { transform: translateY(0); }
 
     /* Metrics - card with rebar accent */
     div[data-testid="stMetric"] {
@@ -126,7 +147,7 @@ st.markdown("""
     .stExpander .streamlit-expanderHeader { color: var(--steel-700); }
 
     /* Data table - concrete frame */
-    .stDataFrame table, .stTable table {
+    .stDataFrame table, .stTable table, .stMarkdown table {
         border: 1px solid var(--concrete-400);
         border-radius: 12px;
         overflow: hidden;
@@ -189,12 +210,10 @@ st.markdown("""
     }
     .footer-bar a { color: var(--accent-orange); text-decoration: none; font-weight: 600; }
 </style>
-""", unsafe_allow_html=True)
+"""
 
 # Dark theme overrides (conditionally injected)
-if st.session_state.dark_mode:
-    st.markdown(
-        """
+DARK_CSS = """
         <style>
             :root {
                 --concrete-100: #0d1116; /* deep slate */
@@ -222,7 +241,7 @@ if st.session_state.dark_mode:
             .brand-banner { background: var(--concrete-200); border-color: var(--concrete-400); }
 
             /* Panels and containers */
-            .stDataFrame table, .stTable table, .stExpander, .plotly, .stPlotlyChart, div[data-testid="stMetric"] {
+            .stDataFrame table, .stTable table, .stMarkdown table, .stExpander, .plotly, .stPlotlyChart, div[data-testid="stMetric"] {
                 background: var(--concrete-200);
                 border-color: var(--concrete-400);
                 color: var(--steel-700);
@@ -236,9 +255,15 @@ if st.session_state.dark_mode:
             /* Tooltips */
             .stTooltip { background: var(--steel-800); color: var(--steel-700); }
         </style>
-        """,
-        unsafe_allow_html=True,
-    )
+        """
+
+# Styling, header, banner and the About tab are only sent on full reruns (page
+# load, theme change, sample mix); widget interactions rerun just the fragment
+# they belong to.
+with perf_run.span("css"):
+    st.markdown(BASE_CSS, unsafe_allow_html=True)
+    if st.session_state.dark_mode:
+        st.markdown(DARK_CSS, unsafe_allow_html=True)
 
 # Your Gemini API Key
 try:
@@ -246,71 +271,97 @@ try:
 except KeyError:
     GEMINI_API_KEY = ""
     st.warning("🔑 Gemini API key missing; AI suggestions disabled. Add to .streamlit/secrets.toml.")
-if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY)
-
-# IS 10262 Simple Formulas (unchanged)
-def calculate_mix(target_strength, slump=50, max_agg_size=20):
-    if target_strength <= 20: wc = 0.60
-    elif target_strength <= 30: wc = 0.50
-    elif target_strength <= 40: wc = 0.42
-    else: wc = 0.38
-    
-    water = 186 + (slump - 50) * 3
-    if max_agg_size == 10: water -= 10
-    elif max_agg_size == 40: water += 10
-    
-    cement = max(water / wc, 300)
-    
-    total_vol = 1 - (cement/3100 + water/1000 + 0.02)
-    sand_vol = total_vol * 0.4
-    agg_vol = total_vol * 0.6
-    sand = sand_vol * 2600
-    coarse_agg = agg_vol * 1600
-    
-    compliant = wc <= 0.50 and cement >= 300
-    return {
-        'Cement (kg/m³)': round(cement),
-        'Water (L/m³)': round(water),
-        'Fine Aggregate - Sand (kg/m³)': round(sand),
-        'Coarse Aggregate (kg/m³)': round(coarse_agg),
-        'Water-Cement Ratio (w/c)': round(wc, 2),
-        'IS Compliance': ' Fully Compliant' if compliant else '⚠️ Review Required'
-    }
+# Tips need a key, unless GEMINI_MODEL points at the local fake model
+TIPS_ENABLED = bool(GEMINI_API_KEY) or ai_tips.GEMINI_MODEL.startswith("fake")
 
-# Cost calc (unchanged)
-def calculate_cost(mix):
-    prices = {'Cement (kg/m³)': 7, 'Fine Aggregate - Sand (kg/m³)': 1.8, 'Coarse Aggregate (kg/m³)': 1.1, 'Water (L/m³)': 0.05}
-    cost = sum(mix[k] * prices[k] for k in prices if k in mix)
-    return round(cost, 0)
-
-# Gemini tip (FIXED: Updated to stable 'gemini-2.5-flash')
-@st.cache_data(ttl=300)
-def get_gemini_tip(mix, target_strength):
-    model = genai.GenerativeModel('gemini-2.5-flash')  # Updated model name
-    prompt = f"""
-    You are a civil engineer expert in Indian IS codes (10262:2019, 456:2000).
-    Given this concrete mix for {target_strength} MPa strength:
-    Cement: {mix['Cement (kg/m³)']} kg, Water: {mix['Water (L/m³)']} L, Sand: {mix['Fine Aggregate - Sand (kg/m³)']} kg, 
-    Coarse Agg: {mix['Coarse Aggregate (kg/m³)']} kg, w/c: {mix['Water-Cement Ratio (w/c)']}.
-    Suggest 2-3 NOVEL ways to increase strength or reduce cost (e.g., add fly ash per IS 3812, up to 30%).
-    Keep suggestions short, practical, and compliant. Format as bullet points.
-    """
-    response = model.generate_content(prompt)
-    return response.text
+# Gemini tip (FIXED: Updated to stable 'gemini-2.5-flash'; model set by GEMINI_MODEL)
+# Tips live in a persistent on-disk LRU cache shared by all sessions, so a
+# mix that has been answered once never reaches the API again. Misses go
+# through one process-wide client that merges identical in-flight prompts
+# and keeps to the GEMINI_RPM / GEMINI_MAX_CONCURRENCY budget. Queue depth,
+# wait times and tip cache hits go to the Performance panel and /metrics.
+@st.cache_resource(show_spinner=False)
+def _tip_client():
+    client = ai_tips.GeminiClient(ai_tips.make_model(ai_tips.GEMINI_MODEL, GEMINI_API_KEY))
+    perf.add_metrics(client.prometheus_text)
+    return client
 
-# Interactive Charts Function (unchanged from last fix)
-def create_interactive_charts(mix, cost):
-    is_dark = st.session_state.get("dark_mode", False)
-    # Prepare data for charts
-    materials = ['Cement', 'Water', 'Sand', 'Coarse Aggregate']
-    quantities = [mix['Cement (kg/m³)'], mix['Water (L/m³)'], mix['Fine Aggregate - Sand (kg/m³)'], mix['Coarse Aggregate (kg/m³)']]
-    
-    # Pie Chart: Material Proportions (% of total mass)
+@st.cache_resource(show_spinner=False)
+def _tip_cache():
+    cache = ai_tips.TipCache()
+    perf.add_metrics(cache.prometheus_text)
+    return cache
+
+def stream_gemini_tip(mix, target_strength):
+    return ai_tips.request_tip(_tip_client(), _tip_cache(), mix, target_strength)
+
+def write_tip(mix, target_strength):
+    try:
+        st.write_stream(stream_gemini_tip(mix, target_strength))
+    except Exception as exc:
+        st.warning(f"🤖 AI suggestions unavailable right now: {exc}")
+
+# On a full rerun the design panel runs before the other tabs and the
+# sidebar, so a tip it finds is only given a placeholder there and streamed
+# at the end of the script; a Generate (fragment) rerun streams it in place.
+# The list belongs to this run of the script: a full rerun starts a fresh
+# one, and a fragment rerun never uses it, so an interrupted run leaves
+# nothing behind.
+deferred_tips = []
+
+def _fragment_rerun():
+    # Streamlit names the fragments to run when a rerun is for fragments only
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx is not None and bool(ctx.fragment_ids_this_run)
+
+# Regional prices: one process-wide book over the price database; it rereads
+# the file only when it changes, so weekly updates need no redeploy.
+DEFAULT_REGION = "All-India average"
+
+@st.cache_resource(show_spinner=False)
+def _price_book():
+    return PriceBook()
+
+# Shared result cache: designed mixes, proportion tables, chart figures,
+# simulations and sensitivity surfaces for every session, LRU-evicted to stay
+# under RESULT_CACHE_MAX_BYTES. Its hit, miss and eviction counters go to the
+# Performance panel and /metrics.
+@st.cache_resource(show_spinner=False)
+def _result_cache():
+    cache = result_cache.ResultCache()
+    perf.add_metrics(cache.prometheus_text)
+    return cache
+
+def _cached(kind):
+    # Memoizes a builder in the result cache under its normalized arguments
+    def decorate(build):
+        @functools.wraps(build)
+        def cached(*args):
+            return _result_cache().get(kind, args, lambda: build(*args))
+        cached.clear = lambda: _result_cache().clear(kind)
+        return cached
+    return decorate
+
+# Interactive Charts: each figure is built once per (quantities, cost, theme)
+# and shared across sessions through the result cache; Plotly figures are
+# only read by st.plotly_chart. The layouts below run once per theme, on
+# placeholder values, to make skeletons; a mix's figure is a copy of the
+# skeleton with its values patched in.
+CHART_MATERIALS = ['Cement', 'Water', 'Sand', 'Coarse Aggregate']
+
+def _chart_quantities(mix):
+    return (mix.cement, mix.water, mix.sand, mix.coarse_agg)
+
+def _chart_percentages(quantities):
     total_mass = sum(quantities)
-    percentages = [q / total_mass * 100 for q in quantities]
+    return [q / total_mass * 100 for q in quantities]
+
+# Pie Chart: Material Proportions (% of total mass)
+def _pie_layout(quantities, is_dark):
+    import plotly.express as px
     fig_pie = px.pie(
-        values=percentages, names=materials,
+        values=_chart_percentages(quantities), names=CHART_MATERIALS,
         title="Material Proportions (%)",
         color_discrete_sequence=(px.colors.qualitative.Dark24 if is_dark else px.colors.qualitative.Set3),
         hole=0.3  # Donut style for modern look
@@ -323,13 +374,16 @@ def create_interactive_charts(mix, cost):
         paper_bgcolor='rgba(0,0,0,0)',
         plot_bgcolor='rgba(0,0,0,0)'
     )
-    
-    # Bar Chart: Quantities per m³ (interactive hover)
+    return fig_pie
+
+# Bar Chart: Quantities per m³ (interactive hover)
+def _bar_layout(quantities, cost, is_dark):
+    import plotly.express as px
     fig_bar = px.bar(
-        x=materials, y=quantities,
+        x=CHART_MATERIALS, y=list(quantities),
         title="Quantities per m³",
         labels={'y': 'Quantity (kg/m³)', 'x': 'Materials'},
-        color=quantities,
+        color=list(quantities),
         color_continuous_scale=('Oranges' if is_dark else 'Blues')
     )
     fig_bar.update_layout(
@@ -340,8 +394,12 @@ def create_interactive_charts(mix, cost):
         plot_bgcolor='rgba(0,0,0,0)'
     )
     fig_bar.add_hline(y=cost, line_dash="dash", line_color="red", annotation_text="Cost Line (₹/m³ scaled)")
-    
-    # Combined Chart: Use make_subplots for side-by-side pie + horizontal bar (fixes domain error)
+    return fig_bar
+
+# Combined Chart: Use make_subplots for side-by-side pie + horizontal bar (fixes domain error)
+def _combined_layout(quantities, is_dark):
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
     fig_combined = make_subplots(
         rows=1, cols=2,
         subplot_titles=('Proportions (%)', 'Quantities (kg/m³)'),
@@ -351,7 +409,7 @@ def create_interactive_charts(mix, cost):
     # Add pie to first subplot
     fig_combined.add_trace(
         go.Pie(
-            labels=materials, values=percentages, name="Proportions",
+            labels=CHART_MATERIALS, values=_chart_percentages(quantities), name="Proportions",
             hole=0.3, showlegend=False
         ),
         row=1, col=1
@@ -360,7 +418,7 @@ def create_interactive_charts(mix, cost):
     # Add horizontal bar to second subplot
     fig_combined.add_trace(
         go.Bar(
-            y=materials, x=quantities, orientation='h', name="Quantities",
+            y=CHART_MATERIALS, x=list(quantities), orientation='h', name="Quantities",
             marker_color=('orange' if is_dark else 'lightblue'), showlegend=False
         ),
         row=1, col=2
@@ -378,8 +436,222 @@ def create_interactive_charts(mix, cost):
     )
     fig_combined.update_xaxes(title_text="kg/m³", row=1, col=2)
     fig_combined.update_yaxes(title_text="Materials", row=1, col=2)
+    return fig_combined
+
+# Template layout entries for subplot types and widgets these charts never use
+UNUSED_TEMPLATE_LAYOUT = ('geo', 'mapbox', 'polar', 'scene', 'ternary', 'sliderdefaults', 'updatemenudefaults')
+
+def _trim_template(fig):
+    # plotly_dark carries defaults for every trace type (~8 KB per spec);
+    # keep only what this figure can use. The figure looks the same.
+    template = fig.layout.template.to_plotly_json()
+    if not template:
+        return fig
+    layout = fig.layout.to_plotly_json()
+    used = {trace.type for trace in fig.data}
+    template['data'] = {kind: value for kind, value in template.get('data', {}).items() if kind in used}
+    template['layout'] = {
+        key: value for key, value in template.get('layout', {}).items()
+        if key not in UNUSED_TEMPLATE_LAYOUT and (key not in layout or isinstance(layout[key], dict))
+    }
+    fig.layout.template = template
+    return fig
+
+CHART_LAYOUTS = {
+    'pie': lambda is_dark: _pie_layout((1, 1, 1, 1), is_dark),
+    'bar': lambda is_dark: _bar_layout((1, 1, 1, 1), 0.0, is_dark),
+    'combined': lambda is_dark: _combined_layout((1, 1, 1, 1), is_dark),
+}
+
+# Skeletons are kept as plain dicts: Plotly figure objects are not safe to
+# read from several session threads at once, so each build deep-copies the
+# dict, patches it and makes its own figure from it.
+@st.cache_resource(show_spinner=False)
+def _chart_skeleton(kind, is_dark):
+    fig = _trim_template(CHART_LAYOUTS[kind](is_dark))
+    spec = fig.to_plotly_json()
+    if not fig.layout.template.to_plotly_json():
+        spec['layout'].pop('template', None)
+    return spec
+
+def _from_skeleton(kind, is_dark, patch):
+    import copy
+    import plotly.graph_objects as go
+    spec = copy.deepcopy(_chart_skeleton(kind, is_dark))
+    patch(spec['data'], spec['layout'])
+    fig = go.Figure(spec)
+    if 'template' not in spec['layout']:
+        fig.layout.template = None  # a new figure would get the default template
+    return fig
+
+@_cached("pie_chart")
+def build_pie_chart(quantities, is_dark):
+    def patch(data, layout):
+        data[0]['values'] = _chart_percentages(quantities)
+    return _from_skeleton('pie', is_dark, patch)
+
+@_cached("bar_chart")
+def build_bar_chart(quantities, cost, is_dark):
+    def patch(data, layout):
+        data[0]['y'] = data[0]['marker']['color'] = list(quantities)
+        layout['shapes'][0].update(y0=cost, y1=cost)
+        layout['annotations'][0]['y'] = cost
+    return _from_skeleton('bar', is_dark, patch)
+
+@_cached("combined_chart")
+def build_combined_chart(quantities, is_dark):
+    def patch(data, layout):
+        data[0]['values'] = _chart_percentages(quantities)
+        data[1]['x'] = list(quantities)
+    return _from_skeleton('combined', is_dark, patch)
+
+def plotly_chart(fig, run):
+    # Counts the spec st.plotly_chart ships, when the rerun is instrumented
+    if run.enabled:
+        run.add_bytes("charts", len(fig.to_json(validate=False)))
+    st.plotly_chart(fig, use_container_width=True)
+
+# Pareto front: cheapest mix for each level of workability
+@_cached("pareto_chart")
+def build_pareto_chart(slumps, costs, is_dark):
+    import plotly.graph_objects as go
+    fig_pareto = go.Figure(go.Scatter(
+        x=list(slumps), y=list(costs), mode='lines+markers', name="Pareto front",
+        line=dict(shape='hv', color=('orange' if is_dark else '#2980b9')),
+        hovertemplate="Slump %{x} mm<br>₹%{y}/m³<extra></extra>",
+    ))
+    fig_pareto.update_layout(
+        title="Cost vs Workability (Pareto Front)",
+        xaxis_title="Slump (mm)",
+        yaxis_title="₹/m³",
+        template=("plotly_dark" if is_dark else None),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)'
+    )
+    return fig_pareto
+
+# Advanced Combined View: built only once the user asks for it. The toggle
+# reruns just this fragment, so the rest of the results stay on screen.
+@st.fragment
+def render_combined_view(mix):
+    if st.toggle("Show combined chart", key="show_combined_view"):
+        is_dark = st.session_state.get("dark_mode", False)
+        st.plotly_chart(build_combined_chart(_chart_quantities(mix), is_dark), use_container_width=True)
+
+# Blended binder: the cheapest fly ash / GGBS replacement for the displayed
+# mix. Solving takes well under a millisecond, so every price edit reruns
+# just this fragment and re-solves.
+BLEND_PRICE_INPUTS = [
+    ('Cement (kg/m³)', "Cement ₹/kg"),
+    ('Fly Ash (kg/m³)', "Fly Ash ₹/kg"),
+    ('GGBS (kg/m³)', "GGBS ₹/kg"),
+]
+
+@st.fragment
+def render_blend_view(result):
+    # Start from the prices the mix was costed at, so the OPC-only cost here
+    # matches the headline cost for its region
+    region = result.get("region", DEFAULT_REGION)
+    prices = dict(PRICES if region == DEFAULT_REGION else _price_book().prices(region))
+    cols = st.columns(len(BLEND_PRICE_INPUTS))
+    prices.update({
+        key: col.number_input(label, min_value=0.0, value=float(prices[key]), step=0.1, key=f"blend_price_{i}")
+        for i, (col, (key, label)) in enumerate(zip(cols, BLEND_PRICE_INPUTS))
+    })
+    blend = solve_blend(
+        result["target_strength"], result["slump"], result["max_agg_size"],
+        prices, result.get("exposure", "Mild")
+    )
+    if not blend["feasible"][0]:
+        st.warning("No blend within the IS replacement limits meets the w/c and cement rules for this exposure.")
+        return
+    fly_ash_pct, ggbs_pct = blend["fly_ash_pct"][0], blend["ggbs_pct"][0]
+    cost, opc_cost = blend["cost"][0], blend["opc_cost"][0]
+    col1, col2, col3 = st.columns(3)
+    col1.metric("🌿 Best Blend", f"{fly_ash_pct:.0f}% FA + {ggbs_pct:.0f}% GGBS")
+    col2.metric("💰 Blend Cost", f"₹{cost:.0f}/m³", delta=f"{cost - opc_cost:+.0f} vs OPC only", delta_color="inverse")
+    col3.metric("🔍 w/b Ratio", f"{blend['wc'][0]}")
+    st.write(
+        f"Cement {blend['cement'][0]} kg · Fly Ash {blend['fly_ash'][0]} kg · GGBS {blend['ggbs'][0]} kg · "
+        f"Water {blend['water'][0]} L · Sand {blend['sand'][0]} kg · Coarse Agg {blend['coarse_agg'][0]} kg (per m³)"
+    )
+    st.caption("Fly ash and GGBS count at 0.4 and 0.6 of OPC's strength contribution; replacement limits per IS 10262:2019.")
+
+# Monte Carlo uncertainty: densities, air, batching and prices sampled in
+# chunks into streaming histograms (bounded memory at any sample count).
+# Results are seeded, so each (mix, samples, volume) is simulated once and
+# shared across sessions.
+SIMULATION_SAMPLES = {"100k": 100_000, "1M": 1_000_000, "5M": 5_000_000}
+
+@_cached("simulation")
+def run_simulation(target_strength, slump, max_agg_size, samples, volume):
+    from concrete_mix.uncertainty import simulate_mix
+    return simulate_mix(target_strength, slump, max_agg_size, samples=samples, volume=volume)
+
+@_cached("distribution_chart")
+def build_distribution_chart(edges, counts, p5, p95, is_dark):
+    import plotly.graph_objects as go
+    centres = [(lo + hi) / 2 for lo, hi in zip(edges[:-1], edges[1:])]
+    total = sum(counts)
+    fig_dist = go.Figure(go.Bar(
+        x=centres, y=[c / total * 100 for c in counts], name="Samples",
+        marker_color=('orange' if is_dark else '#2980b9'),
+        hovertemplate="₹%{x:.0f}/m³<br>%{y:.2f}% of batches<extra></extra>",
+    ))
+    for value, label in ((p5, "P5"), (p95, "P95")):
+        fig_dist.add_vline(x=value, line_dash="dash", line_color="red", annotation_text=label)
+    fig_dist.update_layout(
+        title="Cost Distribution (₹/m³)",
+        xaxis_title="₹/m³",
+        yaxis_title="% of batches",
+        bargap=0,
+        template=("plotly_dark" if is_dark else None),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)'
+    )
+    return fig_dist
+
+@st.fragment
+def render_uncertainty_view(result):
+    inputs = (result["target_strength"], result["slump"], result["max_agg_size"])
+    with st.form("uncertainty_inputs", border=False):
+        col1, col2 = st.columns(2)
+        samples = col1.selectbox("Samples", list(SIMULATION_SAMPLES), index=1)
+        volume = col2.number_input("Project Volume (m³)", min_value=1.0, value=100.0, step=10.0)
+        if st.form_submit_button("🎲 Run Simulation"):
+            st.session_state.uncertainty_request = (inputs, SIMULATION_SAMPLES[samples], volume)
+    
+    request = st.session_state.get("uncertainty_request")
+    if request is None or request[0] != inputs:
+        st.caption("Samples densities (±1-5%), air content (2 ± 0.5%), batching errors and prices (±8%).")
+        return
+    with st.spinner("Simulating..."):
+        sim = run_simulation(*inputs, request[1], request[2])
+    cost = sim["percentiles"]["cost"]
+    project = sim["percentiles"]["project_cost"]
+    col1, col2, col3 = st.columns(3)
+    col1.metric("💰 Cost P50", f"₹{cost[50]:.0f}/m³", help=f"P5 ₹{cost[5]:.0f} · P95 ₹{cost[95]:.0f}")
+    col2.metric("🏗️ Project P95", f"₹{project[95]:,.0f}", help=f"{request[2]:g} m³; P5 ₹{project[5]:,.0f} · P50 ₹{project[50]:,.0f}")
+    col3.metric("⚠️ P(Non-Compliance)", f"{sim['p_noncompliant']:.1%}", help="Batches whose as-batched w/c or cement breaks IS 456")
     
-    return fig_pie, fig_bar, fig_combined
+    import pandas as pd
+    labels = {'cement': 'Cement (kg/m³)', 'water': 'Water (L/m³)', 'sand': 'Sand (kg/m³)',
+              'coarse_agg': 'Coarse Agg (kg/m³)', 'wc': 'w/c', 'cost': 'Cost (₹/m³)'}
+    st.dataframe(
+        pd.DataFrame(
+            [[label] + [round(sim["percentiles"][name][p], 3) for p in (5, 50, 95)] for name, label in labels.items()],
+            columns=['Quantity', 'P5', 'P50', 'P95']
+        ),
+        use_container_width=True, hide_index=True
+    )
+    edges, counts = sim["histograms"]["cost"].coarsen(64)
+    st.plotly_chart(
+        build_distribution_chart(
+            tuple(edges.tolist()), tuple(counts.tolist()), cost[5], cost[95], st.session_state.get("dark_mode", False)
+        ),
+        use_container_width=True
+    )
+    st.caption(f"{sim['samples']:,} simulated batches.")
 
 # Header
 st.markdown("# AI Concrete Mix Optimizer")
@@ -410,78 +682,490 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
-# Tabs for user-friendly navigation
-tab1, tab2 = st.tabs([" Design Mix", "ℹ️ About & Compliance"])
+# Design inputs and results: one fragment, so Generate reruns only this panel.
+# The inputs sit in a form, so editing them costs no rerun at all, and the
+# last result is kept in session state as a compact MixRecord (display labels
+# are applied only when the table is drawn); a theme change redraws it from
+# the cached figures without recomputing the mix.
+@_cached("mix")
+def design_mix(target_strength, slump, max_agg_size):
+    return lookup_record(target_strength, slump, max_agg_size)
 
-with tab1:
-    # Inputs in columns for clean layout
-    col1, col2 = st.columns(2)
-    with col1:
-        target_strength = st.number_input(
-            "Target Compressive Strength (MPa)", 
-            min_value=15, max_value=60, value=25,
-            help="e.g., 25 for M25 grade (IS 456)"
-        )
-        slump = st.slider(
-            "Workability - Slump (mm)", 
-            25, 150, 50,
-            help="Higher slump for better flow (IS 10262)"
+@_cached("table")
+def proportions_table(mix):
+    import pandas as pd
+    return pd.DataFrame(list(mix.to_dict().items()), columns=['Property', 'Value'])
+
+def render_results(result, run):
+    mix, cost, target_strength = result["mix"], result["cost"], result["target_strength"]
+
+    # Metrics row for quick insights
+    col1, col2, col3 = st.columns(3)
+    col1.metric("💰 Estimated Cost", f"₹{cost}/m³", help=result.get("region", DEFAULT_REGION))
+    col2.metric("💪 Target Strength", f"{target_strength} MPa")
+    col3.metric("🔍 w/c Ratio", f"{mix.wc}")
+    
+    # Mix table - clean and centered
+    st.subheader("📋 Mix Proportions (per m³)")
+    with run.span("dataframe"):
+        st.dataframe(proportions_table(mix), use_container_width=True, hide_index=True)
+    
+    # Interactive Charts Section
+    st.subheader("📈 Interactive Mix Visualizations")
+    st.write("Hover, zoom, and explore the mix composition below.")
+    
+    is_dark = st.session_state.get("dark_mode", False)
+    with run.span("charts_build"):
+        quantities = _chart_quantities(mix)
+        fig_pie = build_pie_chart(quantities, is_dark)
+        fig_bar = build_bar_chart(quantities, float(cost), is_dark)
+    col_chart1, col_chart2 = st.columns(2)
+    with col_chart1, run.span("charts_render"):
+        plotly_chart(fig_pie, run)
+    
+    with col_chart2, run.span("charts_render"):
+        plotly_chart(fig_bar, run)
+    
+    # Combined Chart Expander
+    with st.expander("🔍 Advanced Combined View"):
+        render_combined_view(mix)
+    
+    # Regional comparison: this mix costed in every region in one step
+    regions, region_costs = cost_by_region(mix.quantities(), _price_book())
+    if regions:
+        with st.expander("📍 Regional Comparison"):
+            import pandas as pd
+            comparison = pd.DataFrame({'Region': regions, 'Cost (₹/m³)': region_costs}).sort_values('Cost (₹/m³)')
+            st.dataframe(comparison, use_container_width=True, hide_index=True)
+            st.caption("Prices in force today; regions without a price for a material use the All-India average.")
+    
+    # Uncertainty expander
+    with st.expander("🎲 Uncertainty (Monte Carlo)"):
+        render_uncertainty_view(result)
+    
+    # Blended binder expander
+    with st.expander("🌿 Blended Binder (Fly Ash / GGBS)"):
+        render_blend_view(result)
+    
+    # Gemini section - expander for cleanliness; streamed last so the charts
+    # are on screen before the first token arrives
+    if TIPS_ENABLED:
+        with st.expander("🤖 AI-Powered Optimizations "):
+            st.markdown(f"**Suggestions:**")
+            slot = st.container()
+            if _fragment_rerun():
+                with slot, run.span("gemini_tip"):
+                    write_tip(mix, target_strength)
+            else:
+                deferred_tips.append((slot, mix, target_strength))
+    else:
+        st.info("🔑 Add your Gemini API key in the code to enable AI suggestions!")
+
+@st.fragment
+def design_panel():
+    run = perf.start_rerun(st.session_state.get("perf_panel", False), scope="design")
+    with st.form("design_inputs", border=False):
+        # Inputs in columns for clean layout
+        col1, col2 = st.columns(2)
+        with col1:
+            target_strength = st.number_input(
+                "Target Compressive Strength (MPa)", 
+                min_value=15, max_value=60, value=25,
+                help="e.g., 25 for M25 grade (IS 456)"
+            )
+            slump = st.slider(
+                "Workability - Slump (mm)", 
+                25, 150, 50,
+                help="Higher slump for better flow (IS 10262)"
+            )
+        with col2:
+            max_agg_size = st.selectbox(
+                "Max Coarse Aggregate Size (mm)", 
+                [10, 20, 40],
+                help="Affects water demand (IS 383)"
+            )
+            exposure = st.selectbox(
+                "Exposure Condition", 
+                ["Mild", "Moderate", "Severe"],
+                help="Impacts durability requirements (IS 456 Table 5)"
+            )
+            region = st.selectbox(
+                "Price Region",
+                [DEFAULT_REGION, *_price_book().regions()],
+                help="Unit prices in force today for this region (price database)"
+            )
+        
+        # Calculate button with progress
+        generate = st.form_submit_button("🔬 Generate Optimized Mix", type="primary")
+    
+    if generate:
+        with st.spinner("Analyzing per IS 10262..."), run.span("mix"):
+            mix, cost = design_mix(target_strength, slump, max_agg_size)
+            if region != DEFAULT_REGION:
+                cost = mix.cost(_price_book().prices(region))
+        st.session_state.design_result = {
+            "target_strength": target_strength, "slump": slump, "max_agg_size": max_agg_size,
+            "exposure": exposure, "region": region, "mix": mix, "cost": cost,
+        }
+    
+    result = st.session_state.get("design_result")
+    if result is not None:
+        render_results(result, run)
+    
+    run.finish()
+    keep_timings(run)
+
+# Cost optimizer: searches every design strength, slump and aggregate size in
+# the given ranges in one vectorized pass (well under a millisecond), so it
+# runs on each submit of its own form without caching.
+OPTIMIZER_COLUMNS = {
+    'target_strength': 'Design Strength (MPa)', 'slump': 'Slump (mm)', 'max_agg_size': 'Max Agg (mm)',
+    'cement': 'Cement (kg/m³)', 'water': 'Water (L/m³)', 'sand': 'Sand (kg/m³)',
+    'coarse_agg': 'Coarse Agg (kg/m³)', 'wc': 'w/c', 'cost': 'Cost (₹/m³)',
+}
+
+@st.fragment
+def optimizer_panel():
+    run = perf.start_rerun(st.session_state.get("perf_panel", False), scope="optimizer")
+    with st.form("optimizer_inputs", border=False):
+        col1, col2 = st.columns(2)
+        with col1:
+            grade = st.number_input(
+                "Required Grade (MPa)",
+                min_value=15, max_value=60, value=25,
+                help="Characteristic strength the mix must reach, e.g. 25 for M25"
+            )
+            exposure = st.selectbox(
+                "Exposure Condition",
+                list(EXPOSURE_LIMITS),
+                help="Max w/c and min cement per IS 456 Table 5"
+            )
+        with col2:
+            slump_range = st.slider(
+                "Acceptable Slump (mm)",
+                25, 150, (25, 150),
+                help="Any slump in this range is workable enough"
+            )
+            agg_sizes = st.multiselect(
+                "Allowed Max Aggregate Sizes (mm)",
+                [10, 20, 40], default=[10, 20, 40],
+                help="Sizes available for this pour"
+            )
+        optimize = st.form_submit_button("🎯 Find Cheapest Compliant Mix", type="primary")
+    
+    if optimize:
+        if not agg_sizes:
+            st.warning("Select at least one aggregate size.")
+        else:
+            with run.span("optimize"):
+                st.session_state.optimizer_result = optimize_mix(grade, exposure, slump_range, tuple(agg_sizes))
+    
+    result = st.session_state.get("optimizer_result")
+    if result is not None:
+        cheapest, pareto = result['cheapest'], result['pareto']
+        if result['feasible'] == 0:
+            st.warning("No compliant mix in these ranges; widen the slump range or relax the exposure.")
+        else:
+            col1, col2, col3 = st.columns(3)
+            col1.metric("💰 Lowest Cost", f"₹{cheapest['cost'][0]}/m³")
+            col2.metric("💪 Design Strength", f"{cheapest['target_strength'][0]} MPa")
+            col3.metric("✅ Compliant Candidates", f"{result['feasible']} / {result['evaluated']}")
+            
+            st.subheader("🏷️ Cheapest Compliant Mixes (per m³)")
+            with run.span("dataframe"):
+                import pandas as pd
+                st.dataframe(
+                    pd.DataFrame({label: cheapest[name] for name, label in OPTIMIZER_COLUMNS.items()}),
+                    use_container_width=True, hide_index=True
+                )
+            
+            with run.span("charts_build"):
+                fig_pareto = build_pareto_chart(
+                    tuple(pareto['slump'].tolist()), tuple(pareto['cost'].tolist()),
+                    st.session_state.get("dark_mode", False)
+                )
+            with run.span("charts_render"):
+                plotly_chart(fig_pareto, run)
+            st.caption("Each point is the cheapest compliant mix that reaches at least that slump.")
+    
+    run.finish()
+    keep_timings(run)
+
+# Sensitivity: quantity grids over strength x slump are sliced from the mix
+# table once per aggregate size and shared by every session; a price edit
+# recomputes only the cost layer, and what-if points between grid nodes are
+# interpolated from the grids instead of recomputed.
+SURFACE_LAYERS = {
+    'Cost (₹/m³)': 'cost', 'Cement (kg/m³)': 'cement', 'Water (L/m³)': 'water',
+    'Sand (kg/m³)': 'sand', 'Coarse Agg (kg/m³)': 'coarse_agg', 'w/c Ratio': 'wc',
+}
+SURFACE_PRICE_INPUTS = [
+    ('Cement (kg/m³)', "Cement ₹/kg"),
+    ('Fine Aggregate - Sand (kg/m³)', "Sand ₹/kg"),
+    ('Coarse Aggregate (kg/m³)', "Coarse Agg ₹/kg"),
+    ('Water (L/m³)', "Water ₹/L"),
+]
+
+@_cached("surface")
+def sensitivity_surface(max_agg_size):
+    from concrete_mix.surface import quantity_surface
+    return quantity_surface(max_agg_size)
+
+@_cached("surface_cost")
+def sensitivity_cost(max_agg_size, prices):
+    from concrete_mix.surface import cost_layer
+    return cost_layer(sensitivity_surface(max_agg_size), dict(prices))
+
+def sensitivity_layer(max_agg_size, layer, prices):
+    if layer == 'cost':
+        return sensitivity_cost(max_agg_size, prices)
+    return sensitivity_surface(max_agg_size)[layer]
+
+@_cached("surface_chart")
+def build_surface_chart(max_agg_size, label, prices, kind, is_dark):
+    import plotly.graph_objects as go
+    surface = sensitivity_surface(max_agg_size)
+    trace = go.Contour if kind == "Contour" else go.Heatmap
+    fig_surface = go.Figure(trace(
+        x=surface['slumps'], y=surface['strengths'],
+        z=sensitivity_layer(max_agg_size, SURFACE_LAYERS[label], prices),
+        colorscale=('Oranges' if is_dark else 'Blues'), colorbar=dict(title=label),
+        hovertemplate="Slump %{x} mm<br>%{y} MPa<br>%{z}<extra></extra>",
+    ))
+    fig_surface.update_layout(
+        title=f"{label} — {max_agg_size} mm aggregate",
+        xaxis_title="Slump (mm)",
+        yaxis_title="Target Strength (MPa)",
+        height=480,
+        template=("plotly_dark" if is_dark else None),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)'
+    )
+    return fig_surface
+
+@st.fragment
+def sensitivity_panel():
+    run = perf.start_rerun(st.session_state.get("perf_panel", False), scope="sensitivity")
+    col1, col2, col3 = st.columns(3)
+    max_agg_size = col1.selectbox("Max Coarse Aggregate Size (mm)", [10, 20, 40], index=1, key="surface_agg")
+    label = col2.selectbox("Layer", list(SURFACE_LAYERS), key="surface_layer")
+    kind = col3.radio("Chart", ["Heatmap", "Contour"], horizontal=True, key="surface_kind")
+    
+    with st.expander("💱 Prices"):
+        cols = st.columns(len(SURFACE_PRICE_INPUTS))
+        prices = tuple(
+            (key, col.number_input(label_, min_value=0.0, value=float(PRICES[key]), step=0.05, key=f"surface_price_{i}"))
+            for i, (col, (key, label_)) in enumerate(zip(cols, SURFACE_PRICE_INPUTS))
         )
-    with col2:
-        max_agg_size = st.selectbox(
-            "Max Coarse Aggregate Size (mm)", 
-            [10, 20, 40],
-            help="Affects water demand (IS 383)"
+    
+    # The surface chart is ~40 KB per render; it is built and sent only once
+    # asked for, not on every full rerun while this tab is hidden
+    if st.toggle("Show surface chart", key="surface_show"):
+        with run.span("charts_build"):
+            fig_surface = build_surface_chart(max_agg_size, label, prices, kind, st.session_state.get("dark_mode", False))
+        with run.span("charts_render"):
+            plotly_chart(fig_surface, run)
+    
+    st.markdown("**What-if point**")
+    col1, col2 = st.columns(2)
+    strength = col1.slider("Target Strength (MPa)", 15.0, 60.0, 25.0, step=0.5, key="surface_strength")
+    slump = col2.slider("Slump (mm)", 25.0, 150.0, 50.0, step=0.5, key="surface_slump")
+    with run.span("interpolate"):
+        from concrete_mix.surface import interpolate_surface
+        surface = sensitivity_surface(max_agg_size)
+        point = {
+            layer: float(interpolate_surface(surface, sensitivity_layer(max_agg_size, layer, prices), strength, slump))
+            for layer in ('cost', 'cement', 'wc')
+        }
+    col1, col2, col3 = st.columns(3)
+    col1.metric("💰 Cost", f"₹{point['cost']:.0f}/m³")
+    col2.metric("🧱 Cement", f"{point['cement']:.0f} kg/m³")
+    col3.metric("🔍 w/c Ratio", f"{point['wc']:.2f}")
+    st.caption("Interpolated from the precomputed grid (1 MPa × 1 mm nodes).")
+    
+    run.finish()
+    keep_timings(run)
+
+# Project bill of quantities: an uploaded pour schedule is designed in one
+# batch (100k elements in well under a second) and totalled by grade and by
+# pour date. The result and its CSV are kept in session state, so paging the
+# grid or switching the grouping only slices them, and only the current page
+# of rows is sent to the browser.
+PROJECT_COLUMNS = {
+    'element': 'Element', 'grade': 'Grade', 'slump': 'Slump (mm)', 'max_agg_size': 'Max Agg (mm)',
+    'volume': 'Volume (m³)', 'pour_date': 'Pour Date', 'cement': 'Cement (kg/m³)', 'wc': 'w/c',
+    'compliant': 'Compliant', 'cost': 'Cost (₹/m³)', 'cement_kg': 'Cement (kg)', 'water_l': 'Water (L)',
+    'sand_kg': 'Sand (kg)', 'coarse_agg_kg': 'Coarse Agg (kg)', 'amount': 'Amount (₹)',
+}
+PROJECT_SUMMARY_COLUMNS = {
+    'grade': 'Grade', 'pour_date': 'Pour Date', 'elements': 'Elements', 'volume': 'Volume (m³)',
+    'cement_kg': 'Cement (kg)', 'water_l': 'Water (L)', 'sand_kg': 'Sand (kg)',
+    'coarse_agg_kg': 'Coarse Agg (kg)', 'amount': 'Amount (₹)', 'review': 'Needs Review',
+}
+PROJECT_GROUPINGS = {"Grade": "grade", "Pour Date": "pour_date"}
+
+def design_uploaded_schedule(upload, region, run):
+    import pandas as pd
+    with run.span("read"):
+        raw = pd.read_parquet(upload) if upload.name.endswith((".parquet", ".pq")) else pd.read_csv(upload)
+        schedule = read_project_schedule(raw)
+    with run.span("design"):
+        prices = PRICES if region == DEFAULT_REGION else _price_book().prices(region)
+        rows = design_project(schedule, prices)
+    with run.span("aggregate"):
+        summaries = {by: summarize_project(rows, by) for by in PROJECT_GROUPINGS.values() if by in rows.columns}
+    with run.span("csv"):
+        csv = project_csv(rows)
+    return {"name": upload.name, "region": region, "rows": rows, "summaries": summaries, "csv": csv}
+
+@st.fragment
+def project_panel():
+    run = perf.start_rerun(st.session_state.get("perf_panel", False), scope="project")
+    with st.form("project_inputs", border=False):
+        col1, col2 = st.columns([2, 1])
+        upload = col1.file_uploader(
+            "Pour Schedule (CSV or Parquet)", type=["csv", "parquet", "pq"],
+            help="Columns: element, grade (M25 or 25), slump, max_agg_size, volume (m³), pour_date"
         )
-        exposure = st.selectbox(
-            "Exposure Condition", 
-            ["Mild", "Moderate", "Severe"],
-            help="Impacts durability requirements (IS 456 Table 5)"
+        region = col2.selectbox(
+            "Price Region",
+            [DEFAULT_REGION, *_price_book().regions()],
+            key="project_region",
+            help="Unit prices in force today for this region (price database)"
         )
+        compute = st.form_submit_button("🏗️ Compute Bill of Quantities", type="primary")
     
-    # Calculate button with progress
-    if st.button("🔬 Generate Optimized Mix", type="primary"):
-        with st.spinner("Analyzing per IS 10262..."):
-            mix = calculate_mix(target_strength, slump, max_agg_size)
-            cost = calculate_cost(mix)
-        
-        # Metrics row for quick insights
-        col1, col2, col3 = st.columns(3)
-        col1.metric("💰 Estimated Cost", f"₹{cost}/m³")
-        col2.metric("💪 Target Strength", f"{target_strength} MPa")
-        col3.metric("🔍 w/c Ratio", f"{mix['Water-Cement Ratio (w/c)']}")
-        
-        # Mix table - clean and centered
-        st.subheader("📋 Mix Proportions (per m³)")
-        mix_df = pd.DataFrame(list(mix.items()), columns=['Property', 'Value'])
-        st.dataframe(mix_df, use_container_width=True, hide_index=True)
-        
-        # Interactive Charts Section
-        st.subheader("📈 Interactive Mix Visualizations")
-        st.write("Hover, zoom, and explore the mix composition below.")
-        
-        col_chart1, col_chart2 = st.columns(2)
-        with col_chart1:
-            fig_pie, _, _ = create_interactive_charts(mix, cost)
-            st.plotly_chart(fig_pie, use_container_width=True)
+    if compute:
+        if upload is None:
+            st.warning("Upload a pour schedule first.")
+        else:
+            try:
+                with st.spinner("Designing every element..."):
+                    st.session_state.project_result = design_uploaded_schedule(upload, region, run)
+                st.session_state.project_page = 1
+            except ValueError as exc:
+                st.error(f"Schedule not understood: {exc}")
+    
+    result = st.session_state.get("project_result")
+    if result is not None:
+        rows = result["rows"]
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("🧱 Elements", f"{len(rows):,}")
+        col2.metric("📦 Volume", f"{rows['volume'].sum():,.1f} m³")
+        col3.metric("🏭 Cement", f"{rows['cement_kg'].sum() / 1000:,.1f} t")
+        col4.metric("💰 Amount", f"₹{rows['amount'].sum():,.0f}", help=result["region"])
         
-        with col_chart2:
-            _, fig_bar, _ = create_interactive_charts(mix, cost)
-            st.plotly_chart(fig_bar, use_container_width=True)
+        st.subheader("📊 Bill of Quantities")
+        groupings = [label for label, by in PROJECT_GROUPINGS.items() if by in result["summaries"]]
+        by = PROJECT_GROUPINGS[st.radio("Total by", groupings, horizontal=True, key="project_group")]
+        summary = result["summaries"][by]
+        with run.span("dataframe"):
+            st.dataframe(
+                summary.rename(columns=PROJECT_SUMMARY_COLUMNS), use_container_width=True, hide_index=True,
+            )
         
-        # Combined Chart Expander
-        with st.expander("🔍 Advanced Combined View"):
-            _, _, fig_combined = create_interactive_charts(mix, cost)
-            st.plotly_chart(fig_combined, use_container_width=True)
+        st.subheader("📋 Elements")
+        col1, col2, col3 = st.columns([1, 1, 2])
+        page_size = col1.selectbox("Rows per page", [50, 100, 500, 1000], index=1, key="project_page_size")
+        pages = max(1, -(-len(rows) // page_size))
+        page = col2.number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, value=1, key="project_page")
+        start = (min(page, pages) - 1) * page_size
+        col3.caption(f"Rows {start + 1:,}–{min(start + page_size, len(rows)):,} of {len(rows):,}")
+        with run.span("dataframe"):
+            st.dataframe(
+                rows.iloc[start:start + page_size][[c for c in PROJECT_COLUMNS if c in rows.columns]]
+                .rename(columns=PROJECT_COLUMNS),
+                use_container_width=True, hide_index=True,
+                column_config={"Pour Date": st.column_config.DateColumn()},
+            )
         
-        # Gemini section - expander for cleanliness
-        if GEMINI_API_KEY != "YOUR_API_KEY_HERE":
-            with st.expander("🤖 AI-Powered Optimizations "):
-                tip = get_gemini_tip(mix, target_strength)
-                st.markdown(f"**Suggestions:**")
-                st.markdown(tip)
+        stem = result["name"].rsplit(".", 1)[0]
+        col1, col2 = st.columns(2)
+        col1.download_button(
+            "⬇️ Designed elements (CSV)", result["csv"], file_name=f"{stem}_designed.csv", mime="text/csv",
+            use_container_width=True,
+        )
+        col2.download_button(
+            f"⬇️ Totals by {by.replace('_', ' ')} (CSV)", project_csv(summary),
+            file_name=f"{stem}_by_{by}.csv", mime="text/csv", use_container_width=True,
+        )
+    
+    run.finish()
+    keep_timings(run)
+
+# Sidebar tools below the theme switch: a fragment, so the Performance toggle
+# reruns only the sidebar. The sample button changes the results panel, which
+# a fragment cannot rerun directly, so it asks for a full rerun.
+@st.fragment
+def sidebar_tools():
+    st.write("**Modern Features:**")
+    st.write("- Clean, tabbed interface")
+    st.write("- Professional gray-blue theme")
+    st.write("- Tooltips for guidance")
+    st.write("- **Interactive Charts:** Pie/Bar with hover & zoom")
+    st.write("- Responsive layout")
+    
+    if st.toggle("⏱️ Performance", key="perf_panel", help="Show how long each stage of the latest reruns took"):
+        perf_last = st.session_state.perf_last
+        if perf_last:
+            st.caption("Stage timings, latest rerun per scope")
+            st.markdown(
+                "| Scope | Stage | ms |\n|---|---|---:|\n"
+                + "\n".join(
+                    f"| {scope} | {stage} | {seconds * 1000:.1f} |"
+                    for scope, stages in perf_last.items() for stage, seconds in stages.items()
+                )
+            )
         else:
-            st.info("🔑 Add your Gemini API key in the code to enable AI suggestions!")
+            st.caption("Timings appear after the next interaction.")
+        payload = {scope: nbytes for scope, nbytes in st.session_state.perf_payload.items() if nbytes}
+        if payload:
+            st.caption("Chart specs sent, latest rerun: " + ", ".join(
+                f"{scope} {sum(nbytes.values()) / 1024:.1f} KB" for scope, nbytes in payload.items()
+            ))
+        cache = _result_cache().stats()
+        st.caption(
+            f"Result cache: {cache['hit_rate']:.0%} hits ({cache['hits']} / {cache['hits'] + cache['misses']}), "
+            f"{cache['evictions']} evictions, {cache['entries']} entries, "
+            f"{cache['bytes'] / 2**20:.1f} / {cache['max_bytes'] / 2**20:.0f} MiB"
+        )
+        if TIPS_ENABLED:
+            tips, gemini = _tip_cache().stats(), _tip_client().stats()
+            st.caption(
+                f"Gemini tips: {tips['hit_rate']:.0%} cache hits ({tips['hits']} / {tips['hits'] + tips['misses']}), "
+                f"{gemini['queue_depth']} queued, {gemini['in_flight']} in flight, "
+                f"wait p50 {gemini['wait_p50_ms']:.0f} ms / p99 {gemini['wait_p99_ms']:.0f} ms, "
+                f"{gemini['coalesced']} coalesced, {gemini['retries']} retries"
+            )
+    
+    if st.button("📈 View Sample Mix (M25)"):
+        mix, cost = design_mix(25, 50, 20)
+        st.session_state.design_result = {
+            "target_strength": 25, "slump": 50, "max_agg_size": 20, "exposure": "Mild",
+            "mix": mix, "cost": cost,
+        }
+        st.rerun()
+    
+    st.header("📚 Resources")
+    st.write("[IS 10262:2019 PDF](https://bis.gov.in) | [Gemini Docs](https://ai.google.dev) | [Plotly Docs](https://plotly.com/python)")
+    st.caption("Built with Streamlit | Deploy: GitHub + Streamlit Cloud")
+
+# Tabs for user-friendly navigation
+tab1, tab_optimize, tab_sensitivity, tab_project, tab2 = st.tabs(
+    [" Design Mix", "🎯 Cost Optimizer", "🗺️ Sensitivity", "🏗️ Project", "ℹ️ About & Compliance"]
+)
+
+with tab1:
+    design_panel()
+
+with tab_optimize:
+    optimizer_panel()
+
+with tab_sensitivity:
+    sensitivity_panel()
+
+with tab_project:
+    project_panel()
 
 with tab2:
     st.subheader("📖 Project Overview")
@@ -494,36 +1178,27 @@ with tab2:
     """)
     
     st.subheader("⚖️ Key IS Compliance")
-    compliance_df = pd.DataFrame({
-        "Aspect": ["w/c Ratio", "Min Cement Content", "Durability"],
-        "Requirement": ["≤0.50 (mild exposure)", "≥300 kg/m³ (M20+)", "Per IS 456 Table 5"],
-        "Status": ["Auto-checked", "Enforced", "Exposure-based"]
-    })
-    st.table(compliance_df)
+    # Static table as Markdown: st.table would pull in pandas on every page load
+    st.markdown(
+        """
+| Aspect | Requirement | Status |
+|---|---|---|
+| w/c Ratio | ≤0.50 (mild exposure) | Auto-checked |
+| Min Cement Content | ≥300 kg/m³ (M20+) | Enforced |
+| Durability | Per IS 456 Table 5 | Exposure-based |
+"""
+    )
     
     st.subheader("💼 Pricing Basis (Avg. India 2025)")
-    st.write("• Cement (OPC 53): ₹7/kg\n• Sand (Zone II): ₹1.8/kg\n• Coarse Agg (20mm): ₹1.1/kg\n• Water: ₹0.05/L")
-    st.caption("Update prices in code for regional accuracy.")
+    st.write("• Cement (OPC 53): ₹7/kg\n• Sand (Zone II): ₹1.8/kg\n• Coarse Agg (20mm): ₹1.1/kg\n• Water: ₹0.05/L\n• Fly Ash: ₹2.5/kg\n• GGBS: ₹3.8/kg")
+    st.caption("Regional prices: import them with `python -m concrete_mix prices import prices.csv`; the app picks up changes without a restart.")
 
 # Sidebar for quick access & info
 with st.sidebar:
     st.header("🛠️ Quick Tools")
-    # Dark mode toggle
+    # Dark mode toggle: outside any fragment, since the theme CSS needs a full rerun
     st.checkbox("🌑 Dark Theme", value=st.session_state.get("dark_mode", False), key="dark_mode")
-    st.write("**Modern Features:**")
-    st.write("- Clean, tabbed interface")
-    st.write("- Professional gray-blue theme")
-    st.write("- Tooltips for guidance")
-    st.write("- **Interactive Charts:** Pie/Bar with hover & zoom")
-    st.write("- Responsive layout")
-    
-    if st.button("📈 View Sample Mix (M25)"):
-        st.session_state.sample_mix = calculate_mix(25)
-        st.rerun()
-    
-    st.header("📚 Resources")
-    st.write("[IS 10262:2019 PDF](https://bis.gov.in) | [Gemini Docs](https://ai.google.dev) | [Plotly Docs](https://plotly.com/python)")
-    st.caption("Built with Streamlit | Deploy: GitHub + Streamlit Cloud")
+    sidebar_tools()
 
 # Footer (civil-themed)
 st.markdown(
@@ -536,3 +1211,10 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
+# Tips deferred by this full rerun, now that the rest of the page is drawn
+for slot, mix, target_strength in deferred_tips:
+    with slot, perf_run.span("gemini_tip"):
+        write_tip(mix, target_strength)
+
+perf_run.finish()
+keep_timings(perf_run)
@@ -0,0 +1,4 @@
+"""
+Benchmark suite and focused timing scripts. Run each one as a module from
+the repo root, e.g. `python -m benchmarks.suite --help`.
+"""
@@ -0,0 +1,58 @@
+"""
+Pieces every benchmark script shares: its command-line parser, the metadata
+saved with results, and the comparison against a saved baseline.
+"""
+
+import argparse
+import datetime
+import os
+import platform
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parser(doc):
+    """Argument parser described by the first line of a script's docstring."""
+    return argparse.ArgumentParser(description=doc.strip().splitlines()[0])
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_meta(**extra):
+    """Commit, time and machine of a run, for saved results."""
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        **extra,
+    }
+
+
+def compare(rows, baseline, threshold):
+    """
+    Prints each (name, current, baseline value, higher_is_better) row as a
+    ratio to the baseline and returns the names that got worse by more than
+    threshold (0.25 = 25%). A row without a baseline value prints as new.
+    """
+    regressions = []
+    print(f"\nvs baseline {baseline['meta'].get('commit')} (threshold {threshold:.0%})")
+    for name, current, base, higher_is_better in rows:
+        if not base:
+            print(f"  {name:<34} new")
+            continue
+        ratio = current / base
+        regressed = ratio < 1 - threshold if higher_is_better else ratio > 1 + threshold
+        if regressed:
+            regressions.append(name)
+        print(f"  {name:<34} {ratio:6.2f}x  {'REGRESSION' if regressed else 'ok'}")
+    return regressions
@@ -0,0 +1,82 @@
+"""
+Blend solver timing: solve_blend (every fly ash / GGBS blend for every
+design point in one array pass) against a brute-force loop over
+calculate_blend_mix / calculate_cost. Exits with status 1 if they pick
+different blends.
+
+Usage:  python -m benchmarks.blend_solver [--brute-force-points 300]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from concrete_mix import COMPLIANT_LABEL, EXPOSURE_LIMITS, PRICES, calculate_cost
+from concrete_mix.blend import blend_grid, calculate_blend_mix, solve_blend
+
+from . import _common
+
+
+def brute_force(points, prices, exposure="Mild"):
+    max_wc, min_cement = EXPOSURE_LIMITS[exposure]
+    blends = list(zip(*blend_grid()))
+    best = []
+    for strength, slump, agg in points:
+        choice = None
+        for fly_ash, ggbs in blends:
+            mix = calculate_blend_mix(strength, slump, agg, fly_ash, ggbs)
+            binder = mix['Cement (kg/m³)'] + mix['Fly Ash (kg/m³)'] + mix['GGBS (kg/m³)']
+            if (mix['IS Compliance'] != COMPLIANT_LABEL or mix['Water-Cement Ratio (w/c)'] > max_wc
+                    or binder < min_cement):
+                continue
+            cost = calculate_cost(mix, prices)
+            if choice is None or cost < choice[0]:
+                choice = (cost, fly_ash, ggbs)
+        best.append(choice)
+    return best
+
+
+def timed(fn, repeat=5):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - start)
+    return result, min(samples)
+
+
+def main():
+    parser = _common.parser(__doc__)
+    parser.add_argument("--brute-force-points", type=int, default=300)
+    args = parser.parse_args()
+
+    prices = {**PRICES, 'Cement (kg/m³)': 6.2, 'GGBS (kg/m³)': 4.4}
+    rng = np.random.default_rng(0)
+    t = rng.integers(15, 61, args.brute_force_points)
+    s = rng.integers(25, 151, args.brute_force_points)
+    g = rng.choice([10, 20, 40], args.brute_force_points)
+    points = list(zip(t.tolist(), s.tolist(), g.tolist()))
+    print(f"{len(blend_grid()[0])} blends per design point, cement ₹{prices['Cement (kg/m³)']}/kg")
+
+    reference, brute_seconds = timed(lambda: brute_force(points, prices), repeat=1)
+    solution, batch_seconds = timed(lambda: solve_blend(t, s, g, prices))
+    disagree = sum(
+        ref is None or (ref[0], ref[1] * 100, ref[2] * 100) != (cost, fa, gg)
+        for ref, cost, fa, gg in zip(reference, solution['cost'], solution['fly_ash_pct'], solution['ggbs_pct'])
+    )
+    print(f"{len(points)} points: brute force {brute_seconds * 1000:9.1f} ms, "
+          f"solve_blend {batch_seconds * 1000:7.2f} ms ({brute_seconds / batch_seconds:,.0f}x), "
+          f"{disagree} disagreements")
+
+    _, one = timed(lambda: solve_blend(30, 75, 20, prices), repeat=50)
+    print(f"1 point (live re-solve on a price edit): {one * 1000:.3f} ms")
+    grid = np.meshgrid(np.arange(15, 61), np.arange(25, 151), [10, 20, 40], indexing='ij')
+    _, every = timed(lambda: solve_blend(*(a.ravel() for a in grid), prices), repeat=3)
+    print(f"{grid[0].size} points (every UI input combination): {every * 1000:.1f} ms")
+    if disagree:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
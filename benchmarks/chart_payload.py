@@ -0,0 +1,87 @@
+"""
+Chart build time and payload per render, light and dark: a full Plotly
+Express build of each results chart (the old path, and what the skeletons
+are made from) against a copy of the trimmed skeleton with the mix's
+values patched in, and the bytes of each spec st.plotly_chart sends, with
+the transfer time they take on a slow site link.
+
+Usage:  python -m benchmarks.chart_payload [--kbps 512]
+"""
+
+import logging
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+logging.disable(logging.WARNING)  # bare-mode warnings from importing app
+import app  # noqa: E402
+from concrete_mix import lookup_record  # noqa: E402
+
+from . import _common  # noqa: E402
+
+REPEAT = 20
+
+
+def per_call_ms(fn, cases):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        for case in cases:
+            fn(*case)
+    return (time.perf_counter() - start) / (REPEAT * len(cases)) * 1000
+
+
+def concurrent_check(charts, threads):
+    # Every (chart, mix, theme) built once serially, then all of them at once
+    cases = [
+        (name, chart_args(app._chart_quantities(mix), cost) + (is_dark,))
+        for name, (_, _, chart_args) in charts.items()
+        for mix, cost in (lookup_record(t, s, g) for t in range(15, 61, 5) for s in (25, 75, 150) for g in (10, 20, 40))
+        for is_dark in (False, True)
+    ]
+    build = lambda case: charts[case[0]][1](*case[1]).to_json(validate=False)  # noqa: E731
+    expected = [build(case) for case in cases]
+    with ThreadPoolExecutor(threads) as pool:
+        futures = [pool.submit(build, case) for case in cases * 4]
+    errors = mismatches = 0
+    for i, future in enumerate(futures):
+        try:
+            mismatches += future.result() != expected[i % len(cases)]
+        except Exception:
+            errors += 1
+    print(f"concurrent builds on {threads} threads: {len(futures):,} specs, {mismatches} differ from serial, {errors} failed")
+    return not (errors or mismatches)
+
+
+def main():
+    parser = _common.parser(__doc__)
+    parser.add_argument("--kbps", type=float, default=512, help="link speed for the transfer estimate, kbit/s")
+    parser.add_argument("--threads", type=int, default=16, help="threads for the concurrent build check")
+    args = parser.parse_args()
+
+    mixes = [lookup_record(t, s, 20) for t, s in ((20, 50), (25, 75), (30, 100), (40, 125))]
+    charts = {
+        "pie": (app._pie_layout, app.build_pie_chart.__wrapped__, lambda q, cost: (q,)),
+        "bar": (app._bar_layout, app.build_bar_chart.__wrapped__, lambda q, cost: (q, float(cost))),
+        "combined": (app._combined_layout, app.build_combined_chart.__wrapped__, lambda q, cost: (q,)),
+    }
+    print(f"{'chart':<16} {'full build':>11} {'skeleton':>10} {'old bytes':>10} {'new bytes':>10} {f'@{args.kbps:g} kbit/s':>16}")
+    totals = [0, 0]
+    for is_dark in (False, True):
+        for name, (full, patched, chart_args) in charts.items():
+            cases = [chart_args(app._chart_quantities(mix), cost) + (is_dark,) for mix, cost in mixes]
+            patched(*cases[0])  # skeleton and Plotly's lazy imports
+            old_bytes = len(full(*cases[0]).to_json(validate=False))
+            new_bytes = len(patched(*cases[0]).to_json(validate=False))
+            totals[0] += old_bytes
+            totals[1] += new_bytes
+            seconds = lambda nbytes: nbytes * 8 / (args.kbps * 1000)  # noqa: E731
+            print(f"{name + (' dark' if is_dark else ' light'):<16} {per_call_ms(full, cases):8.2f} ms "
+                  f"{per_call_ms(patched, cases):7.2f} ms {old_bytes:10,} {new_bytes:10,} "
+                  f"{seconds(old_bytes) * 1000:6.0f} -> {seconds(new_bytes) * 1000:4.0f} ms")
+    print(f"all six specs: {totals[0]:,} -> {totals[1]:,} bytes ({1 - totals[1] / totals[0]:.0%} smaller)")
+    if not concurrent_check(charts, args.threads):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Chart-building time per Generate click: the old path (every figure built
+in full with Plotly Express, three times) against the cached builders, cold
+and warm.
+
+Usage:  python -m benchmarks.chart_timing
+"""
+
+import logging
+import time
+
+logging.disable(logging.WARNING)  # bare-mode warnings from importing app
+import app  # noqa: E402
+
+CLICKS = 20
+
+
+def legacy_click(mix, cost, is_dark):
+    # What the Generate handler used to do: build all three figures, three times
+    for _ in range(3):
+        app._pie_layout(app._chart_quantities(mix), is_dark)
+        app._bar_layout(app._chart_quantities(mix), float(cost), is_dark)
+        app._combined_layout(app._chart_quantities(mix), is_dark)
+
+
+def cached_click(mix, cost, is_dark):
+    # Pie and bar on every click; the combined view only when it is opened
+    quantities = app._chart_quantities(mix)
+    app.build_pie_chart(quantities, is_dark)
+    app.build_bar_chart(quantities, float(cost), is_dark)
+
+
+def per_click_ms(click, cases, clear=False):
+    start = time.perf_counter()
+    for mix, cost, is_dark in cases:
+        if clear:
+            app.build_pie_chart.clear()
+            app.build_bar_chart.clear()
+        click(mix, cost, is_dark)
+    return (time.perf_counter() - start) / len(cases) * 1000
+
+
+def main():
+    cases = []
+    for i in range(CLICKS):
+        mix, cost = app.lookup_record(20 + i, 50 + i, 20)
+        cases.append((mix, cost, bool(i % 2)))
+
+    cached_click(*cases[0])  # warm up Plotly's lazy imports
+    legacy = per_click_ms(legacy_click, cases)
+    cold = per_click_ms(cached_click, cases, clear=True)
+    per_click_ms(cached_click, cases)
+    warm = per_click_ms(cached_click, cases)
+
+    print(f"legacy (3x full Plotly Express build): {legacy:8.2f} ms/click")
+    print(f"cached, first view of a mix:           {cold:8.2f} ms/click  ({legacy / cold:5.1f}x)")
+    print(f"cached, repeat view:                   {warm:8.3f} ms/click  ({legacy / warm:5.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Burst of simultaneous Generate clicks against the shared Gemini client,
+offline with the fake model: upstream calls, coalescing, queueing and the
+per-user latency distribution, optionally with injected quota errors.
+
+Usage:
+    python -m benchmarks.gemini_burst [--users 200] [--latency 0.5] [--rpm 30] [--quota-errors 2]
+"""
+
+import random
+import statistics
+import threading
+import time
+
+import ai_tips
+
+from . import _common
+
+# Popular grades dominate a burst
+GRADES = [20, 25, 30, 35, 40]
+WEIGHTS = [5, 45, 35, 10, 5]
+
+
+def main():
+    parser = _common.parser(__doc__)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--rpm", type=int, default=30)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--quota-errors", type=int, default=0)
+    parser.add_argument("--backoff", type=float, default=0.5)
+    parser.add_argument("--distinct", action="store_true", help="one prompt per user (no coalescing possible)")
+    args = parser.parse_args()
+
+    model = ai_tips.FakeTipModel(latency=args.latency, quota_errors=args.quota_errors)
+    client = ai_tips.GeminiClient(model, rpm=args.rpm, max_concurrency=args.concurrency, backoff_base=args.backoff)
+    rng = random.Random(3)
+    prompts = [f"tip for M{rng.choices(GRADES, WEIGHTS)[0]}" for _ in range(args.users)]
+    if args.distinct:
+        prompts = [f"{p} #{i}" for i, p in enumerate(prompts)]
+
+    latencies, errors = [], []
+    max_depth = 0
+    barrier = threading.Barrier(args.users)
+
+    def user(prompt):
+        barrier.wait()
+        start = time.perf_counter()
+        try:
+            client.generate(prompt)
+            latencies.append(time.perf_counter() - start)
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=user, args=(p,)) for p in prompts]
+    for t in threads:
+        t.start()
+    while any(t.is_alive() for t in threads):
+        max_depth = max(max_depth, client.stats()["queue_depth"])
+        time.sleep(0.01)
+
+    stats = client.stats()
+    q = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    print(f"users {args.users}  distinct prompts {len(set(prompts))}  failed {len(errors)}")
+    print(f"upstream calls {model.calls}  coalesced {stats['coalesced']}  quota errors {stats['quota_errors']}  "
+          f"max concurrent {model.max_active}  max queue depth {max_depth}")
+    print(f"latency p50 {q[49] * 1000:7.1f} ms  p99 {q[98] * 1000:7.1f} ms  "
+          f"queue wait p50 {stats['wait_p50_ms']:7.1f} ms  p99 {stats['wait_p99_ms']:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
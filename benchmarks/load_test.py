@@ -0,0 +1,384 @@
+"""
+Multi-session load test: starts app.py under a real Streamlit server with
+Gemini pointed at the local fake model, then drives many concurrent
+browser-like sessions over Streamlit's websocket protocol. Each session
+loads the page and then, with think time in between, submits the design
+form with realistic inputs (common grades, slump ranges by pour type,
+mostly 20 mm aggregate), toggles the theme now and then, or opens the
+sample mix.
+
+Reported: actions per second, client-side latency per action
+(p50/p95/p99), the app's own per-stage latencies from PERF_LOG (per
+scope, e.g. design/mix, design/charts_render, design/gemini_tip), and the
+server's CPU time and peak RSS (Linux /proc). Results are JSON with the
+commit and parameters, so runs can be compared across commits.
+
+Usage:
+    python -m benchmarks.load_test --users 50 --actions 10 --think 1 --gemini-latency 0.5 --save load.json
+    python -m benchmarks.load_test --users 50 --compare load.json --threshold 0.25
+
+--compare exits with status 1 when throughput drops, or a p95 grows, by
+more than the threshold.
+"""
+
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from tornado.websocket import websocket_connect
+
+from . import _common
+
+# Input distributions: popular grades dominate; slump by pour type
+GRADES = [20, 25, 30, 35, 40, 50]
+GRADE_WEIGHTS = [10, 35, 30, 12, 8, 5]
+SLUMP_RANGES = [(25, 50), (50, 100), (100, 150)]  # footings, slabs/beams, pumped
+SLUMP_WEIGHTS = [20, 50, 30]
+AGG_SIZES = [10, 20, 40]
+AGG_WEIGHTS = [15, 70, 15]
+
+DESIGN_FORM = "design_inputs"
+WIDGET_TYPES = ("button", "checkbox", "number_input", "selectbox", "slider")
+DONE = ForwardMsg.ScriptFinishedStatus
+PERCENTILES = (50, 95, 99)
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _percentiles(samples):
+    ordered = sorted(samples)
+    row = {"count": len(ordered)}
+    for p in PERCENTILES:
+        # Nearest rank
+        row[f"p{p}_ms"] = ordered[max(0, -(-p * len(ordered) // 100) - 1)] * 1000 if ordered else None
+    row["mean_ms"] = statistics.fmean(ordered) * 1000 if ordered else None
+    return row
+
+
+class Server:
+    """streamlit run app.py in a subprocess; collects PERF_LOG lines and samples CPU / RSS."""
+
+    def __init__(self, gemini_latency, gemini_rpm=None, port=None):
+        self.port = port or _free_port()
+        self.tmp = tempfile.mkdtemp()
+        env = {
+            **os.environ,
+            "GEMINI_MODEL": f"fake:{gemini_latency}",
+            "TIP_CACHE_PATH": os.path.join(self.tmp, "tips.sqlite3"),
+            "PERF_LOG": "1",
+            "PYTHONUNBUFFERED": "1",
+        }
+        if gemini_rpm:
+            env["GEMINI_RPM"] = str(gemini_rpm)
+        self.proc = subprocess.Popen(
+            [sys.executable, "-m", "streamlit", "run", "app.py", "--server.headless", "true",
+             "--server.port", str(self.port), "--server.fileWatcherType", "none",
+             "--browser.gatherUsageStats", "false"],
+            cwd=_common.ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+        )
+        self.reruns = []
+        self.peak_rss = 0
+        self._reader = threading.Thread(target=self._read_log, daemon=True)
+        self._reader.start()
+
+    def _read_log(self):
+        for line in self.proc.stderr:
+            if line.startswith('{"event": "rerun"'):
+                self.reruns.append(json.loads(line))
+
+    def wait_ready(self, timeout=60):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.proc.poll() is not None:
+                raise RuntimeError("streamlit exited during startup")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{self.port}/_stcore/health", timeout=1) as r:
+                    if r.status == 200:
+                        return
+            except OSError:
+                time.sleep(0.2)
+        raise RuntimeError("streamlit did not become healthy")
+
+    def cpu_seconds(self):
+        # utime + stime of the server process, from /proc/<pid>/stat
+        with open(f"/proc/{self.proc.pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+    def rss_bytes(self):
+        with open(f"/proc/{self.proc.pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+        return 0
+
+    async def sample_rss(self, interval=0.25):
+        while True:
+            self.peak_rss = max(self.peak_rss, self.rss_bytes())
+            await asyncio.sleep(interval)
+
+    def stop(self):
+        self.proc.terminate()
+        try:
+            self.proc.wait(10)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+
+
+class Session:
+    """One browser tab: sends rerun requests with widget states, reads deltas until the run finishes."""
+
+    def __init__(self, url):
+        self.url = url
+        self.widgets = {}  # (form_id, label) -> (kind, proto, fragment_id)
+        self.states = {}  # widget id -> the value this tab last set
+        self.cache = {}  # ForwardMsg hash -> message, for ref_hash replies
+        self.exceptions = 0
+        self.conn = None
+
+    async def connect(self):
+        self.conn = await websocket_connect(self.url, max_message_size=64 * 2**20)
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+
+    async def run(self, widget_states=(), fragment_id=""):
+        # Like the browser, send every value set so far, not just this action's;
+        # a widget missing from a rerun falls back to its default
+        triggers = []
+        for widget_state in widget_states:
+            if widget_state.WhichOneof("value") == "trigger_value":
+                triggers.append(widget_state)
+            else:
+                self.states[widget_state.id] = widget_state
+        msg = BackMsg()
+        state = msg.rerun_script
+        state.page_script_hash = ""
+        state.fragment_id = fragment_id
+        state.widget_states.widgets.extend(list(self.states.values()) + triggers)
+        await self.conn.write_message(msg.SerializeToString(), binary=True)
+        while True:
+            data = await self.conn.read_message()
+            if data is None:
+                raise ConnectionError("server closed the session")
+            fwd = ForwardMsg()
+            fwd.ParseFromString(data)
+            if fwd.WhichOneof("type") == "ref_hash":
+                fwd = self.cache[fwd.ref_hash]
+            elif fwd.metadata.cacheable:
+                self.cache[fwd.hash] = fwd
+            kind = fwd.WhichOneof("type")
+            if kind == "delta":
+                self._record(fwd.delta)
+            elif kind == "script_finished" and fwd.script_finished != DONE.FINISHED_EARLY_FOR_RERUN:
+                return
+
+    def _record(self, delta):
+        if delta.WhichOneof("type") != "new_element":
+            return
+        element = delta.new_element
+        kind = element.WhichOneof("type")
+        if kind == "exception":
+            self.exceptions += 1
+        elif kind in WIDGET_TYPES:
+            proto = getattr(element, kind)
+            self.widgets[(proto.form_id, proto.label)] = (kind, proto, delta.fragment_id)
+
+    def widget(self, label, form_id=""):
+        return self.widgets[(form_id, label)]
+
+    def submit_design(self, strength, slump, agg):
+        states = []
+        for label, value in (("Target Compressive Strength (MPa)", strength), ("Workability - Slump (mm)", slump),
+                             ("Max Coarse Aggregate Size (mm)", agg)):
+            kind, proto, _ = self.widget(label, DESIGN_FORM)
+            state = WidgetState(id=proto.id)
+            if kind == "number_input":
+                state.int_value = value
+            elif kind == "slider":
+                state.double_array_value.data.append(value)
+            else:
+                state.int_value = list(proto.options).index(str(value))
+            states.append(state)
+        _, button, fragment_id = self.widget("🔬 Generate Optimized Mix", DESIGN_FORM)
+        states.append(WidgetState(id=button.id, trigger_value=True))
+        return self.run(states, fragment_id)
+
+    def click(self, label):
+        _, button, fragment_id = self.widget(label)
+        return self.run([WidgetState(id=button.id, trigger_value=True)], fragment_id)
+
+    def toggle_theme(self, dark):
+        _, checkbox, fragment_id = self.widget("🌑 Dark Theme")
+        return self.run([WidgetState(id=checkbox.id, bool_value=dark)], fragment_id)
+
+
+async def user(url, args, seed, latencies, errors):
+    rng = random.Random(seed)
+    session = Session(url)
+    dark = False
+
+    async def timed(action, coro):
+        start = time.perf_counter()
+        await coro
+        latencies.setdefault(action, []).append(time.perf_counter() - start)
+
+    try:
+        await session.connect()
+        await timed("load", session.run())
+        for _ in range(args.actions):
+            await asyncio.sleep(rng.expovariate(1 / args.think) if args.think else 0)
+            roll = rng.random()
+            if roll < args.theme_rate:
+                dark = not dark
+                await timed("theme_toggle", session.toggle_theme(dark))
+            elif roll < args.theme_rate + args.sample_rate:
+                await timed("sample", session.click("📈 View Sample Mix (M25)"))
+            else:
+                low, high = rng.choices(SLUMP_RANGES, SLUMP_WEIGHTS)[0]
+                await timed("generate", session.submit_design(
+                    rng.choices(GRADES, GRADE_WEIGHTS)[0],
+                    rng.randrange(low, high + 1, 5),
+                    rng.choices(AGG_SIZES, AGG_WEIGHTS)[0],
+                ))
+    except Exception as exc:  # one failed session must not end the run
+        errors.append(f"{type(exc).__name__}: {exc}")
+    finally:
+        errors.extend(["script exception"] * session.exceptions)
+        session.close()
+
+
+async def drive(server, args):
+    url = f"ws://127.0.0.1:{server.port}/_stcore/stream"
+    latencies, errors = {}, []
+    sampler = asyncio.ensure_future(server.sample_rss())
+    cpu_start, start = server.cpu_seconds(), time.perf_counter()
+    users = []
+    for i in range(args.users):
+        users.append(asyncio.ensure_future(user(url, args, args.seed + i, latencies, errors)))
+        if args.ramp:
+            await asyncio.sleep(args.ramp / args.users)
+    await asyncio.gather(*users)
+    elapsed = time.perf_counter() - start
+    cpu = server.cpu_seconds() - cpu_start
+    sampler.cancel()
+    return latencies, errors, elapsed, cpu
+
+
+def run_load_test(args):
+    server = Server(args.gemini_latency, args.gemini_rpm)
+    try:
+        server.wait_ready()
+        latencies, errors, elapsed, cpu = asyncio.run(drive(server, args))
+        time.sleep(0.5)  # let the last PERF_LOG lines arrive
+    finally:
+        server.stop()
+
+    stages = {}
+    for rerun in server.reruns:
+        for stage, ms in rerun["stages_ms"].items():
+            stages.setdefault(f"{rerun['scope']}/{stage}", []).append(ms / 1000)
+    payload = {}
+    for rerun in server.reruns:
+        for stage, nbytes in rerun.get("payload_bytes", {}).items():
+            payload.setdefault(f"{rerun['scope']}/{stage}", []).append(nbytes)
+    actions = sum(len(samples) for samples in latencies.values())
+    return {
+        "meta": _common.run_meta(params={
+            name: getattr(args, name) for name in
+            ("users", "actions", "think", "ramp", "gemini_latency", "gemini_rpm", "theme_rate", "sample_rate", "seed")
+        }),
+        "throughput": {
+            "actions_per_s": actions / elapsed,
+            "generates_per_s": len(latencies.get("generate", ())) / elapsed,
+            "elapsed_s": elapsed,
+            "errors": len(errors),
+        },
+        "actions": {name: _percentiles(samples) for name, samples in sorted(latencies.items())},
+        "stages": {name: _percentiles(samples) for name, samples in sorted(stages.items())},
+        "server": {
+            "cpu_s": cpu,
+            "cpu_cores_avg": cpu / elapsed,
+            "peak_rss_mb": server.peak_rss / 2**20,
+            "payload_kb_avg": {name: sum(sizes) / len(sizes) / 1024 for name, sizes in sorted(payload.items())},
+        },
+        "error_samples": sorted(set(errors))[:10],
+    }
+
+
+def report(result):
+    t, s = result["throughput"], result["server"]
+    print(f"{t['actions_per_s']:.1f} actions/s ({t['generates_per_s']:.1f} generate/s) over {t['elapsed_s']:.1f} s, "
+          f"{t['errors']} errors; server CPU {s['cpu_s']:.1f} s ({s['cpu_cores_avg']:.2f} cores), "
+          f"peak RSS {s['peak_rss_mb']:.0f} MiB")
+    if s.get("payload_kb_avg"):
+        print("  payload per rerun: " + ", ".join(f"{name} {kb:.1f} KB" for name, kb in s["payload_kb_avg"].items()))
+    for title, rows in (("action (client)", result["actions"]), ("stage (server)", result["stages"])):
+        print(f"\n  {title:<34} {'n':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+        for name, row in rows.items():
+            print(f"  {name:<34} {row['count']:6d} {row['p50_ms']:9.1f} {row['p95_ms']:9.1f} {row['p99_ms']:9.1f}")
+    for sample in result["error_samples"]:
+        print(f"  error: {sample}")
+
+
+def compare(current, baseline, threshold):
+    """Prints the comparison; returns the names of metrics that regressed."""
+    rows = [("throughput", current["throughput"]["actions_per_s"], baseline["throughput"]["actions_per_s"], True)]
+    for section in ("actions", "stages"):
+        rows += [
+            (f"{name} p95", row["p95_ms"], baseline[section].get(name, {}).get("p95_ms"), False)
+            for name, row in current[section].items()
+        ]
+    regressions = _common.compare(rows, baseline, threshold)
+    if current["meta"]["params"] != baseline["meta"].get("params"):
+        print("  note: load parameters differ from the baseline")
+    return regressions
+
+
+def main():
+    parser = _common.parser(__doc__)
+    parser.add_argument("--users", type=int, default=20, help="concurrent sessions")
+    parser.add_argument("--actions", type=int, default=10, help="actions per session after the page load")
+    parser.add_argument("--think", type=float, default=1.0, help="mean think time between actions, seconds")
+    parser.add_argument("--ramp", type=float, default=5.0, help="seconds over which sessions start")
+    parser.add_argument("--gemini-latency", type=float, default=0.5, help="fake Gemini latency, seconds")
+    parser.add_argument("--gemini-rpm", type=int, help="override GEMINI_RPM, the app's upstream budget (default: the app's)")
+    parser.add_argument("--theme-rate", type=float, default=0.1, help="share of actions that toggle the theme")
+    parser.add_argument("--sample-rate", type=float, default=0.05, help="share of actions that open the sample mix")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", help="write results JSON to this path")
+    parser.add_argument("--compare", help="baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed change before failing (default: 0.25)")
+    args = parser.parse_args()
+
+    result = run_load_test(args)
+    report(result)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(result, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(result, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
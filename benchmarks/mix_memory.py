@@ -0,0 +1,54 @@
+"""
+Memory held by a large set of cached mixes in each representation: the
+calculate_mix display dicts the app used to keep, MixRecord objects, and one
+MixColumns array. Measured with tracemalloc around building the collection
+from the same calculate_mix_batch output.
+
+Usage:  python -m benchmarks.mix_memory [--mixes 1000000]
+"""
+
+import gc
+import time
+import tracemalloc
+
+import numpy as np
+
+from concrete_mix import MixColumns, MixRecord, calculate_mix_batch
+
+from . import _common
+
+
+def measured(label, build, n):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<28} {size / 2**20:9.1f} MiB {size / n:8.1f} B/mix {elapsed:8.2f} s")
+    return result
+
+
+def main():
+    parser = _common.parser(__doc__)
+    parser.add_argument("--mixes", type=int, default=1_000_000)
+    args = parser.parse_args()
+    n = args.mixes
+
+    rng = np.random.default_rng(0)
+    batch = calculate_mix_batch(rng.integers(15, 61, n), rng.integers(25, 151, n), rng.choice([10, 20, 40], n))
+    # Plain Python values, as each would come out of lookup_mix
+    rows = list(zip(*(batch[name].tolist() for name in ('cement', 'water', 'sand', 'coarse_agg', 'wc', 'compliant'))))
+    print(f"{n:,} cached mixes")
+
+    dicts = measured("display dicts (before)", lambda: [MixRecord(*row).to_dict() for row in rows], n)
+    del dicts
+    records = measured("MixRecord (slots)", lambda: [MixRecord(*row) for row in rows], n)
+    del records
+    columns = measured("MixColumns (14 B rows)", lambda: MixColumns.from_batch(batch), n)
+    print(f"  MixColumns.nbytes: {columns.nbytes:,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Throughput and peak memory of the streaming pipeline as worker count grows.
+
+Generates a synthetic pour schedule once, then streams it with 1, 2, 4, ...
+workers up to the core count (each run in a fresh process so peak RSS is
+per run).
+
+Usage:  python -m benchmarks.pipeline_scaling [--rows 2000000] [--output csv|parquet]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from . import _common
+
+RUN_ONE = """
+import json, sys
+from concrete_mix.pipeline import run_pipeline
+print(json.dumps(run_pipeline(sys.argv[1], sys.argv[2], workers=int(sys.argv[3]), chunk_bytes=int(sys.argv[4]))))
+"""
+
+
+def make_schedule(path, rows):
+    import numpy as np
+    import pandas as pd
+    rng = np.random.default_rng(0)
+    pd.DataFrame({
+        'element': np.arange(rows),
+        'target_strength': rng.choice([20, 25, 30, 35, 40, 50], rows),
+        'slump': rng.integers(25, 151, rows),
+        'max_agg_size': rng.choice([10, 20, 40], rows),
+        'volume': rng.uniform(0.5, 40, rows).round(2),
+    }).to_csv(path, index=False)
+
+
+def main():
+    parser = _common.parser(__doc__)
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--output", choices=["csv", "parquet"], default="parquet")
+    parser.add_argument("--chunk-mb", type=int, default=8)
+    args = parser.parse_args()
+
+    counts, n = [], 1
+    while n < (os.cpu_count() or 1):
+        counts.append(n)
+        n *= 2
+    counts.append(os.cpu_count() or 1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        schedule = os.path.join(tmp, "schedule.csv")
+        make_schedule(schedule, args.rows)
+        print(f"{args.rows:,} rows, {os.path.getsize(schedule) / 1e6:.0f} MB CSV -> {args.output}")
+        base = None
+        for workers in counts:
+            output = os.path.join(tmp, f"out-{workers}.{args.output}")
+            proc = subprocess.run(
+                [sys.executable, "-c", RUN_ONE, schedule, output, str(workers), str(args.chunk_mb * 1024 * 1024)],
+                cwd=_common.ROOT, capture_output=True, text=True, check=True,
+            )
+            stats = json.loads(proc.stdout)
+            base = base or stats["rows_per_sec"]
+            print(
+                f"  workers {workers:>3}  {stats['rows_per_sec']:>12,.0f} rows/s  "
+                f"speedup {stats['rows_per_sec'] / base:4.1f}x  "
+                f"peak RSS {stats['peak_rss_mb']:.0f} MB (worker {stats['worker_peak_rss_mb']:.0f} MB)"
+            )
+
+
+if __name__ == "__main__":
+    main()
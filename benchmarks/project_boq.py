@@ -0,0 +1,90 @@
+"""
+Project tab on a large pour schedule: time per stage of the app's upload
+path (read, design, aggregate, CSV) for a synthetic schedule, and how long
+another session's Generate (a mix lookup, table and charts) stalls while it
+runs on a second thread.
+
+Usage:  python -m benchmarks.project_boq [--rows 100000]
+"""
+
+import io
+import logging
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+logging.disable(logging.WARNING)  # bare-mode warnings from importing app
+import app  # noqa: E402
+import perf  # noqa: E402
+
+from . import _common  # noqa: E402
+
+
+def schedule_csv(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "Element": [f"E{i}" for i in range(rows)],
+        "Grade": rng.choice(["M20", "M25", "M30", "M35", "M40"], rows, p=[0.15, 0.35, 0.3, 0.15, 0.05]),
+        "Slump": rng.choice([50, 75, 100, 125], rows),
+        "Aggregate Size": rng.choice([10, 20, 40], rows, p=[0.2, 0.6, 0.2]),
+        "Volume": rng.uniform(0.5, 30, rows).round(2),
+        "Pour Date": (pd.Timestamp("2026-01-01") + pd.to_timedelta(rng.integers(0, 365, rows), unit="D")).strftime("%Y-%m-%d"),
+    })
+    upload = io.BytesIO(df.to_csv(index=False).encode())
+    upload.name = "schedule.csv"
+    return upload
+
+
+def generate(strength):
+    # Another session's Generate click, uncached
+    mix, cost = app.design_mix.__wrapped__(strength, 50, 20)
+    app.proportions_table.__wrapped__(mix)
+    app.build_pie_chart.__wrapped__(app._chart_quantities(mix), False)
+
+
+def main():
+    parser = _common.parser(__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    upload = schedule_csv(args.rows)
+    generate(25)  # Plotly's lazy imports
+    app.design_uploaded_schedule(schedule_csv(100), app.DEFAULT_REGION, perf.start_rerun(False))
+
+    run = perf.start_rerun(True, scope="project")
+    start = time.perf_counter()
+    result = app.design_uploaded_schedule(upload, app.DEFAULT_REGION, run)
+    elapsed = time.perf_counter() - start
+    print(f"{args.rows:,} rows ({upload.getbuffer().nbytes / 2**20:.1f} MiB CSV) in {elapsed:.2f} s: "
+          + ", ".join(f"{stage} {seconds * 1000:.0f} ms" for stage, seconds in run.stages.items()))
+    print(f"  {len(result['summaries']['grade'])} grades, {len(result['summaries']['pour_date'])} pour dates, "
+          f"{len(result['csv']) / 2**20:.1f} MiB designed CSV")
+
+    def clicks(stop, samples):
+        strength = 15
+        while not stop.is_set():
+            t = time.perf_counter()
+            generate(strength)
+            samples.append(time.perf_counter() - t)
+            strength = 15 + (strength + 1 - 15) % 46
+
+    for label, busy in (("idle", False), ("during upload", True)):
+        stop, samples = threading.Event(), []
+        other = threading.Thread(target=clicks, args=(stop, samples))
+        other.start()
+        if busy:
+            upload.seek(0)
+            app.design_uploaded_schedule(upload, app.DEFAULT_REGION, perf.start_rerun(False))
+        else:
+            time.sleep(elapsed)
+        stop.set()
+        other.join()
+        samples = np.array(samples) * 1000
+        print(f"  other session's Generate, {label:<13}: p50 {np.median(samples):6.1f} ms, "
+              f"max {samples.max():6.1f} ms over {len(samples)} clicks")
+
+
+if __name__ == "__main__":
+    main()
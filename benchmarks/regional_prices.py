@@ -0,0 +1,82 @@
+"""
+Regional price database timing on a synthetic book (default 50 regions x
+52 weekly price lists x 6 materials): reload after an update, resolving the
+prices in force on a date, costing one mix in every region, and re-costing
+a large project per region from raw rows and from its aggregated mixes.
+
+Usage:  python -m benchmarks.regional_prices [--regions 50] [--rows 1000000]
+"""
+
+import datetime
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from concrete_mix import (
+    PRICES,
+    PriceBook,
+    aggregate_mixes,
+    calculate_mix,
+    calculate_mix_batch,
+    cost_by_region,
+    mix_quantities,
+    project_cost_by_region,
+)
+from concrete_mix.prices import MATERIALS
+
+from . import _common
+
+
+def timed(label, fn, repeat=5):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - start)
+    print(f"  {label:<44} {min(samples) * 1000:10.3f} ms")
+    return result
+
+
+def main():
+    parser = _common.parser(__doc__)
+    parser.add_argument("--regions", type=int, default=50)
+    parser.add_argument("--weeks", type=int, default=52)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    start_date = datetime.date(2025, 1, 6)
+    rows = [
+        (f"R{r:03d}", material, start_date + datetime.timedelta(weeks=w), round(PRICES[key] * rng.uniform(0.85, 1.2), 3))
+        for r in range(args.regions) for w in range(args.weeks) for material, key in MATERIALS.items()
+    ]
+    as_of = start_date + datetime.timedelta(weeks=args.weeks // 2, days=3)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        book = PriceBook(os.path.join(tmp, "prices.sqlite3"))
+        book.put(rows)
+        print(f"{len(rows):,} prices, {args.regions} regions")
+
+        def reload():
+            book.put([("R000", "cement", as_of, float(rng.uniform(6, 8)))])
+            return book.table(as_of)
+        timed("update one price + reload + resolve", reload)
+        timed("lookup, file unchanged (stat + cache hit)", lambda: book.table(as_of), repeat=1000)
+
+        mix = mix_quantities(calculate_mix(30, 75, 20))
+        timed(f"one mix x {args.regions} regions", lambda: cost_by_region(mix, book, as_of), repeat=1000)
+
+        n = args.rows
+        mixes = calculate_mix_batch(rng.integers(15, 61, n), rng.integers(25, 151, n), rng.choice([10, 20, 40], n))
+        volume = rng.uniform(1, 20, n)
+        raw = timed(f"project {n:,} rows x {args.regions} regions, raw", lambda: project_cost_by_region(mixes, volume, book, as_of), repeat=1)
+        quantities, volumes = timed("aggregate distinct mixes (once per schedule)", lambda: aggregate_mixes(mixes, volume), repeat=1)
+        grouped = timed(f"re-cost {len(volumes):,} distinct mixes x {args.regions} regions",
+                        lambda: project_cost_by_region(quantities, volumes, book, as_of))
+        print(f"  max relative difference raw vs aggregated: {np.max(np.abs(raw[1] - grouped[1]) / raw[1]):.1e}")
+
+
+if __name__ == "__main__":
+    main()
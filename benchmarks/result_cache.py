@@ -0,0 +1,68 @@
+"""
+Shared result cache under concurrent sessions: each simulated session
+clicks Generate on inputs drawn from a skewed distribution (popular grades
+and slumps dominate), going through the app's cached mix, table and chart
+builders. Reports the hit rate per kind, evictions, the cache's byte
+estimate against its budget, and process RSS.
+
+Usage:  python -m benchmarks.result_cache [--sessions 200] [--clicks 20] [--max-mb 64]
+"""
+
+import logging
+import os
+import resource
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from . import _common
+
+
+def main():
+    parser = _common.parser(__doc__)
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--clicks", type=int, default=20, help="Generate clicks per session")
+    parser.add_argument("--max-mb", type=float, default=64, help="RESULT_CACHE_MAX_BYTES in MiB")
+    parser.add_argument("--threads", type=int, default=32)
+    args = parser.parse_args()
+
+    os.environ["RESULT_CACHE_MAX_BYTES"] = str(int(args.max_mb * 2**20))
+    logging.disable(logging.WARNING)  # bare-mode warnings from importing app
+    import app
+
+    # Zipf-like popularity over strength x slump x aggregate x theme
+    rng = np.random.default_rng(0)
+    strengths, slumps = np.arange(15, 61), np.arange(25, 151, 5)
+    def skewed(values, n):
+        weights = 1 / np.arange(1, len(values) + 1) ** 1.2
+        return rng.choice(rng.permutation(values), n, p=weights / weights.sum())
+    n = args.sessions * args.clicks
+    clicks = list(zip(skewed(strengths, n).tolist(), skewed(slumps, n).tolist(),
+                      rng.choice([10, 20, 40], n, p=[0.2, 0.6, 0.2]).tolist(), (rng.random(n) < 0.3).tolist()))
+
+    def generate(click):
+        strength, slump, agg, is_dark = click
+        mix, cost = app.design_mix(strength, slump, agg)
+        app.proportions_table(mix)
+        quantities = app._chart_quantities(mix)
+        app.build_pie_chart(quantities, is_dark)
+        app.build_bar_chart(quantities, float(cost), is_dark)
+
+    generate(clicks[0])  # Plotly's lazy imports
+    start = time.perf_counter()
+    with ThreadPoolExecutor(args.threads) as pool:
+        list(pool.map(generate, clicks))
+    elapsed = time.perf_counter() - start
+
+    stats = app._result_cache().stats()
+    print(f"{args.sessions} sessions x {args.clicks} clicks on {args.threads} threads: "
+          f"{n / elapsed:,.0f} clicks/s, {stats['hit_rate']:.1%} hits overall")
+    for kind, row in stats["kinds"].items():
+        print(f"  {kind:<16} hit rate {row['hit_rate']:6.1%}  misses {row['misses']:6,}  evictions {row['evictions']:6,}")
+    print(f"  cache {stats['entries']:,} entries, {stats['bytes'] / 2**20:.1f} / {stats['max_bytes'] / 2**20:.0f} MiB; "
+          f"peak RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Cold-start import cost of app.py, per module, parsed from `python -X importtime`.
+
+Each run imports app.py in a fresh interpreter (what a container cold start
+pays before the first paint). Modules that app.py defers show as "deferred".
+
+Usage:  python -m benchmarks.startup [--runs 5]
+"""
+
+import statistics
+import subprocess
+import sys
+
+from . import _common
+
+TRACKED = [
+    "app",
+    "streamlit",
+    "numpy",
+    "pandas",
+    "pyarrow",
+    "plotly.express",
+    "plotly.graph_objects",
+    "plotly.subplots",
+    "google.generativeai",
+]
+
+
+def parse_importtime(stderr):
+    # "import time: self [us] | cumulative | imported package"; every module
+    # appears once, on the line where it was first imported
+    cumulative = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cum, name = line[len("import time:"):].split("|")
+        cumulative[name.strip()] = int(cum) / 1000
+    return cumulative
+
+
+def measure(module="app"):
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=_common.ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        sys.exit(proc.stderr)
+    return parse_importtime(proc.stderr)
+
+
+def main():
+    parser = _common.parser(__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--module", default="app", help="entry module to import (app or streamlit_app)")
+    args = parser.parse_args()
+
+    runs = [measure(args.module) for _ in range(args.runs)]
+    tracked = [args.module] + [m for m in TRACKED if m != args.module]
+    print(f"cumulative import time, median of {args.runs} runs")
+    for name in tracked:
+        samples = [run[name] for run in runs if name in run]
+        if len(samples) < len(runs):
+            print(f"  {name:<22} deferred")
+        else:
+            print(f"  {name:<22} {statistics.median(samples):8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
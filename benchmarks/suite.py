@@ -0,0 +1,234 @@
+"""
+Performance benchmark suite: mix/cost compute (scalar and bulk), chart
+building in light and dark mode, cold import, and full Streamlit reruns of
+app.py through the headless AppTest harness (including a Generate click,
+with Gemini replaced by the local fake model).
+
+Usage:
+    python -m benchmarks.suite --save results.json
+    python -m benchmarks.suite --compare results.json --threshold 0.25
+
+--compare exits with status 1 when any metric's median is slower than the
+baseline by more than the threshold (0.25 = 25%).
+"""
+
+import itertools
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Gemini stand-in and a throwaway tip cache, before app.py or ai_tips load
+os.environ["GEMINI_MODEL"] = "fake:0"
+os.environ["TIP_CACHE_PATH"] = os.path.join(tempfile.mkdtemp(), "tips.sqlite3")
+logging.disable(logging.WARNING)  # bare-mode warnings from importing app
+
+import numpy as np  # noqa: E402
+
+import concrete_mix  # noqa: E402
+
+from . import _common  # noqa: E402
+
+BENCHMARKS = {}
+
+
+def benchmark(name, repeat=7):
+    def register(setup):
+        BENCHMARKS[name] = (setup, repeat)
+        return setup
+    return register
+
+
+def _inputs(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.integers(15, 61, n), rng.integers(25, 151, n), rng.choice([10, 20, 40], n)
+
+
+# Each benchmark's setup runs once, untimed, and returns the callable to time
+
+
+@benchmark("mix_scalar_10k")
+def _mix_scalar():
+    rows = list(zip(*(a.tolist() for a in _inputs(10_000))))
+
+    def run():
+        for t, s, g in rows:
+            concrete_mix.calculate_cost(concrete_mix.calculate_mix(t, s, g))
+    return run
+
+
+@benchmark("mix_bulk_1m")
+def _mix_bulk():
+    t, s, g = _inputs(1_000_000)
+    return lambda: concrete_mix.calculate_mix_batch(t, s, g)
+
+
+@benchmark("lookup_mix_10k")
+def _lookup():
+    rows = list(zip(*(a.tolist() for a in _inputs(10_000))))
+    concrete_mix.load_mix_table()
+
+    def run():
+        for t, s, g in rows:
+            concrete_mix.lookup_mix(t, s, g)
+    return run
+
+
+@benchmark("optimize_mix_full_space")
+def _optimize():
+    # Interactive budget: well under 100 ms per search
+    return lambda: concrete_mix.optimize_mix(20, "Mild")
+
+
+@benchmark("blend_solve_all_grades")
+def _blend():
+    # One batched solve for M15-M60, as on a price edit in a bulk view
+    strengths = np.arange(15, 61)
+    return lambda: concrete_mix.solve_blend(strengths, 75, 20, {"Cement (kg/m³)": 6.5})
+
+
+@benchmark("monte_carlo_1m", repeat=3)
+def _monte_carlo():
+    return lambda: concrete_mix.simulate_mix(25, 75, 20, samples=1_000_000)
+
+
+@benchmark("surface_price_edit")
+def _surface_price_edit():
+    # What a price change costs the Sensitivity view: the cost layer only
+    surfaces = [concrete_mix.quantity_surface(g) for g in (10, 20, 40)]
+    prices = {"Cement (kg/m³)": 7.4}
+    return lambda: [concrete_mix.cost_layer(surface, prices) for surface in surfaces]
+
+
+@benchmark("regional_recost_project")
+def _regional_recost():
+    # 20 regions; a 1M-row project aggregated once, then re-costed per region
+    book = concrete_mix.PriceBook(os.path.join(tempfile.mkdtemp(), "prices.sqlite3"))
+    book.put(
+        (f"R{r:02d}", material, "2025-01-01", 1.0 + r / 10)
+        for r in range(20) for material in ("cement", "sand", "coarse_agg", "water")
+    )
+    t, s, g = _inputs(1_000_000)
+    quantities, volumes = concrete_mix.aggregate_mixes(concrete_mix.calculate_mix_batch(t, s, g), 10.0)
+    return lambda: concrete_mix.project_cost_by_region(quantities, volumes, book, "2025-06-01")
+
+
+def _charts(is_dark):
+    import app
+    mix, cost = concrete_mix.lookup_record(25, 75, 20)
+    quantities = app._chart_quantities(mix)
+
+    def run():
+        # Uncached builders: the cost of a new mix's charts
+        app.build_pie_chart.__wrapped__(quantities, is_dark)
+        app.build_bar_chart.__wrapped__(quantities, float(cost), is_dark)
+        app.build_combined_chart.__wrapped__(quantities, is_dark)
+    run()  # Plotly's lazy imports
+    return run
+
+
+benchmark("charts_light")(lambda: _charts(False))
+benchmark("charts_dark")(lambda: _charts(True))
+
+
+@benchmark("startup_cold_import_app", repeat=3)
+def _startup():
+    # Fresh interpreter each time; benchmarks/startup.py breaks this down per module
+    command = [sys.executable, "-c", "import app"]
+    return lambda: subprocess.run(command, cwd=_common.ROOT, capture_output=True, check=True)
+
+
+def _app_test():
+    from streamlit.testing.v1 import AppTest
+    at = AppTest.from_file(os.path.join(_common.ROOT, "app.py"), default_timeout=120)
+    at.secrets["GEMINI_API_KEY"] = ""
+    return at.run()
+
+
+def _generate_button(at):
+    return next(b for b in at.button if "Generate" in b.label)
+
+
+@benchmark("app_rerun")
+def _app_rerun():
+    at = _app_test()
+    return lambda: at.run()
+
+
+@benchmark("app_generate_repeat")
+def _app_generate_repeat():
+    at = _app_test()
+    _generate_button(at).click().run()
+    return lambda: _generate_button(at).click().run()
+
+
+@benchmark("app_generate_new_mix")
+def _app_generate_new_mix():
+    at = _app_test()
+    # Every click is a mix no cache has seen yet. Strengths within one w/c
+    # bracket give identical quantities, so the slump changes on each click
+    # too (each slump has its own water demand); 50 mm is the default the
+    # other benchmarks use.
+    inputs = iter(zip(itertools.cycle((18, 25, 35, 45)), (slump for slump in range(150, 24, -5) if slump != 50)))
+
+    def run():
+        strength, slump = next(inputs)
+        at.number_input[0].set_value(strength)
+        at.slider[0].set_value(slump)
+        _generate_button(at).click().run()
+    return run
+
+
+def _timed_ms(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {"median_ms": statistics.median(samples), "min_ms": min(samples), "runs": repeat}
+
+
+def run_suite(only=None):
+    results = {}
+    for name, (setup, repeat) in BENCHMARKS.items():
+        if only and not any(pattern in name for pattern in only):
+            continue
+        results[name] = _timed_ms(setup(), repeat)
+        print(f"  {name:<24} {results[name]['median_ms']:10.2f} ms  (min {results[name]['min_ms']:.2f})")
+    return {"meta": _common.run_meta(), "results": results}
+
+
+def compare(current, baseline, threshold):
+    """Prints the comparison; returns the names of metrics that regressed."""
+    rows = [
+        (name, result["median_ms"], baseline["results"].get(name, {}).get("median_ms"), False)
+        for name, result in current["results"].items()
+    ]
+    return _common.compare(rows, baseline, threshold)
+
+
+def main():
+    parser = _common.parser(__doc__)
+    parser.add_argument("--save", help="write results JSON to this path")
+    parser.add_argument("--compare", help="baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown before failing (default: 0.25)")
+    parser.add_argument("--only", nargs="*", help="run only benchmarks whose name contains one of these")
+    args = parser.parse_args()
+
+    current = run_suite(args.only)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(current, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(current, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Gemini tip latency and disk-cache hit rate, offline against the fake model.
+
+Requests are drawn from a skewed grade mix (M25/M30 most common); a second
+pass reopens the cache file to show tips surviving a restart.
+
+Usage:  python -m benchmarks.tip_cache [--requests 200] [--latency 0.3]
+"""
+
+import os
+import random
+import statistics
+import tempfile
+import time
+
+import ai_tips
+from concrete_mix import lookup_record
+
+from . import _common
+
+GRADES = [20, 25, 30, 35, 40, 50]
+WEIGHTS = [10, 35, 30, 12, 8, 5]
+
+
+def run_pass(client, cache, requests):
+    first_chunk, total = [], []
+    for strength, slump, agg in requests:
+        start = time.perf_counter()
+        chunks = iter(ai_tips.request_tip(client, cache, lookup_record(strength, slump, agg)[0], strength, "fake"))
+        next(chunks)
+        first_chunk.append(time.perf_counter() - start)
+        for _ in chunks:
+            pass
+        total.append(time.perf_counter() - start)
+    return first_chunk, total
+
+
+def report(label, cache, first_chunk, total):
+    stats = cache.stats()
+    q = statistics.quantiles(total, n=100)
+    print(
+        f"{label:<14} hit rate {stats['hit_rate']:6.1%}  "
+        f"first chunk p50 {statistics.median(first_chunk) * 1000:7.1f} ms  "
+        f"total p50 {q[49] * 1000:7.1f} ms  p95 {q[94] * 1000:7.1f} ms  "
+        f"entries {stats['entries']}  evictions {stats['evictions']}"
+    )
+
+
+def main():
+    parser = _common.parser(__doc__)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.3)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    requests = [
+        (rng.choices(GRADES, WEIGHTS)[0], rng.choice([50, 75, 100]), rng.choice([10, 20, 40]))
+        for _ in range(args.requests)
+    ]
+    model = ai_tips.FakeTipModel(latency=args.latency, chunk_delay=0.0)
+    client = ai_tips.GeminiClient(model, rpm=10_000)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tips.sqlite3")
+        cache = ai_tips.TipCache(path)
+        report("cold process", cache, *run_pass(client, cache, requests))
+        restarted = ai_tips.TipCache(path)
+        report("after restart", restarted, *run_pass(client, restarted, requests))
+    print(f"model calls: {model.calls}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Headless concrete mix design: IS 10262 formulas, costing and the
+precomputed lookup table, importable without Streamlit or Plotly.
+Command line: python -m concrete_mix --help
+"""
+
+from .core import (
+    AIR_CONTENT,
+    COMPLIANT_LABEL,
+    DENSITIES,
+    MAX_WC,
+    MIN_CEMENT,
+    PRICES,
+    REVIEW_LABEL,
+    calculate_cost,
+    calculate_cost_batch,
+    calculate_mix,
+    calculate_mix_batch,
+    is_compliant,
+)
+from .blend import calculate_blend_mix, calculate_blend_mix_batch, solve_blend
+from .optimize import EXPOSURE_LIMITS, optimize_mix, pareto_front
+from .prices import PriceBook, aggregate_mixes, cost_by_region, mix_quantities, project_cost_by_region
+from .project import design_project, project_csv, read_project_schedule, summarize_project
+from .surface import cost_layer, interpolate_surface, quantity_surface
+from .uncertainty import simulate_mix
+from .record import MixColumns, MixRecord
+from .table import build_mix_table, load_mix_table, lookup_mix, lookup_record, validate_mix_table
+from .schedule import design_schedule
+
+__all__ = [
+    "AIR_CONTENT",
+    "COMPLIANT_LABEL",
+    "DENSITIES",
+    "EXPOSURE_LIMITS",
+    "MAX_WC",
+    "MIN_CEMENT",
+    "MixColumns",
+    "MixRecord",
+    "PRICES",
+    "PriceBook",
+    "REVIEW_LABEL",
+    "aggregate_mixes",
+    "build_mix_table",
+    "calculate_blend_mix",
+    "calculate_blend_mix_batch",
+    "calculate_cost",
+    "calculate_cost_batch",
+    "calculate_mix",
+    "calculate_mix_batch",
+    "cost_by_region",
+    "cost_layer",
+    "design_project",
+    "design_schedule",
+    "interpolate_surface",
+    "is_compliant",
+    "load_mix_table",
+    "lookup_mix",
+    "lookup_record",
+    "mix_quantities",
+    "optimize_mix",
+    "pareto_front",
+    "project_cost_by_region",
+    "project_csv",
+    "quantity_surface",
+    "read_project_schedule",
+    "simulate_mix",
+    "solve_blend",
+    "summarize_project",
+    "validate_mix_table",
+]
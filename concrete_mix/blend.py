@@ -0,0 +1,163 @@
+"""
+Blended binders: OPC with fly ash (IS 3812) and/or GGBS (IS 16714)
+replacing part of the cement, and a solver for the cheapest compliant blend.
+
+Fly ash and GGBS count towards the binder at an efficiency (k-value) of 0.4
+and 0.6 of OPC, so a blend needs more binder than plain OPC for the same
+strength: binder = water / (w/c x efficiency), where w/c is the bracket
+value calculate_mix uses. The reported water-binder ratio (w/c x efficiency)
+and the binder content are what the IS 456 rule is checked against. With no
+replacement every quantity equals calculate_mix exactly.
+
+solve_blend evaluates every allowed blend (replacement levels on a 5% grid)
+for every design point at once, so a whole batch of grades is one array
+operation; it is cheap enough to rerun on every price edit.
+"""
+
+import numpy as np
+
+from .core import AIR_CONTENT, COMPLIANT_LABEL, DENSITIES, PRICES, REVIEW_LABEL, design_wc, is_compliant, water_demand
+from .optimize import EXPOSURE_LIMITS
+
+# Strength efficiency relative to OPC (k-values)
+SCM_EFFICIENCY = {'fly_ash': 0.4, 'ggbs': 0.6}
+# Replacement limits, fraction of the binder (IS 10262:2019 / IS 456)
+SCM_MAX_REPLACEMENT = {'fly_ash': 0.35, 'ggbs': 0.70}
+MAX_TOTAL_REPLACEMENT = 0.70
+# Densities, kg/m³
+SCM_DENSITY = {'fly_ash': 2200, 'ggbs': 2900}
+
+
+def _check_replacement(fly_ash, ggbs):
+    if (np.any(fly_ash < 0) or np.any(ggbs < 0) or np.any(fly_ash > SCM_MAX_REPLACEMENT['fly_ash'])
+            or np.any(ggbs > SCM_MAX_REPLACEMENT['ggbs']) or np.any(fly_ash + ggbs > MAX_TOTAL_REPLACEMENT + 1e-9)):
+        raise ValueError(
+            f"replacement out of range: fly ash 0-{SCM_MAX_REPLACEMENT['fly_ash']:.0%}, "
+            f"GGBS 0-{SCM_MAX_REPLACEMENT['ggbs']:.0%}, together at most {MAX_TOTAL_REPLACEMENT:.0%}"
+        )
+
+
+def calculate_blend_mix(target_strength, slump=50, max_agg_size=20, fly_ash=0.0, ggbs=0.0):
+    """calculate_mix for a binder with fly_ash and ggbs replacing those fractions of OPC."""
+    _check_replacement(np.asarray(fly_ash), np.asarray(ggbs))
+    wc = design_wc(target_strength)
+    water = water_demand(slump, max_agg_size)
+
+    efficiency = 1 - fly_ash * (1 - SCM_EFFICIENCY['fly_ash']) - ggbs * (1 - SCM_EFFICIENCY['ggbs'])
+    binder = max(water / (wc * efficiency), 300)
+    cement = binder * (1 - fly_ash - ggbs)
+    fly_ash_kg = binder * fly_ash
+    ggbs_kg = binder * ggbs
+    wb = wc * efficiency
+
+    total_vol = 1 - (cement/DENSITIES['cement'] + fly_ash_kg/SCM_DENSITY['fly_ash'] + ggbs_kg/SCM_DENSITY['ggbs']
+                     + water/DENSITIES['water'] + AIR_CONTENT)
+    sand = total_vol * 0.4 * DENSITIES['sand']
+    coarse_agg = total_vol * 0.6 * DENSITIES['coarse_agg']
+
+    compliant = is_compliant(wb, binder)
+    return {
+        'Cement (kg/m³)': round(cement),
+        'Fly Ash (kg/m³)': round(fly_ash_kg),
+        'GGBS (kg/m³)': round(ggbs_kg),
+        'Water (L/m³)': round(water),
+        'Fine Aggregate - Sand (kg/m³)': round(sand),
+        'Coarse Aggregate (kg/m³)': round(coarse_agg),
+        'Water-Cement Ratio (w/c)': round(wb, 2),
+        'IS Compliance': COMPLIANT_LABEL if compliant else REVIEW_LABEL
+    }
+
+
+# Same operation order as calculate_blend_mix, so rows match it exactly
+def calculate_blend_mix_batch(target_strength, slump=50, max_agg_size=20, fly_ash=0.0, ggbs=0.0, prices=PRICES):
+    target_strength, slump, max_agg_size, fly_ash, ggbs = np.broadcast_arrays(
+        *(np.asarray(a, dtype=np.float64) for a in (target_strength, slump, max_agg_size, fly_ash, ggbs))
+    )
+    _check_replacement(fly_ash, ggbs)
+    wc = design_wc(target_strength)
+    water = water_demand(slump, max_agg_size)
+
+    efficiency = 1 - fly_ash * (1 - SCM_EFFICIENCY['fly_ash']) - ggbs * (1 - SCM_EFFICIENCY['ggbs'])
+    binder = np.maximum(water / (wc * efficiency), 300)
+    cement = binder * (1 - fly_ash - ggbs)
+    fly_ash_kg = binder * fly_ash
+    ggbs_kg = binder * ggbs
+    wb = wc * efficiency
+
+    total_vol = 1 - (cement / DENSITIES['cement'] + fly_ash_kg / SCM_DENSITY['fly_ash'] + ggbs_kg / SCM_DENSITY['ggbs']
+                     + water / DENSITIES['water'] + AIR_CONTENT)
+    sand = total_vol * 0.4 * DENSITIES['sand']
+    coarse_agg = total_vol * 0.6 * DENSITIES['coarse_agg']
+
+    mixes = {
+        'cement': np.rint(cement).astype(np.int64),
+        'fly_ash': np.rint(fly_ash_kg).astype(np.int64),
+        'ggbs': np.rint(ggbs_kg).astype(np.int64),
+        'water': np.rint(water).astype(np.int64),
+        'sand': np.rint(sand).astype(np.int64),
+        'coarse_agg': np.rint(coarse_agg).astype(np.int64),
+        'wc': np.round(wb, 2),
+        'binder': binder,
+        'compliant': is_compliant(wb, binder),
+    }
+    mixes['cost'] = calculate_blend_cost_batch(mixes, prices)
+    return mixes
+
+
+def calculate_blend_cost_batch(mixes, prices=PRICES):
+    # Summed in PRICES order, as calculate_cost does
+    cost = (
+        mixes['cement'] * prices['Cement (kg/m³)']
+        + mixes['sand'] * prices['Fine Aggregate - Sand (kg/m³)']
+        + mixes['coarse_agg'] * prices['Coarse Aggregate (kg/m³)']
+        + mixes['water'] * prices['Water (L/m³)']
+        + mixes['fly_ash'] * prices['Fly Ash (kg/m³)']
+        + mixes['ggbs'] * prices['GGBS (kg/m³)']
+    )
+    return np.round(cost, 0)
+
+
+def blend_grid(step_pct=5):
+    """Every allowed (fly ash, GGBS) replacement pair on a step_pct grid, least replacement first."""
+    fly_ash = np.arange(0, round(SCM_MAX_REPLACEMENT['fly_ash'] * 100) + 1, step_pct)
+    ggbs = np.arange(0, round(SCM_MAX_REPLACEMENT['ggbs'] * 100) + 1, step_pct)
+    f, g = np.meshgrid(fly_ash, ggbs, indexing='ij')
+    f, g = f.ravel(), g.ravel()
+    allowed = f + g <= round(MAX_TOTAL_REPLACEMENT * 100)
+    f, g = f[allowed], g[allowed]
+    order = np.lexsort((g, f, f + g))
+    return f[order] / 100, g[order] / 100
+
+
+def solve_blend(target_strength, slump=50, max_agg_size=20, prices=None, exposure='Mild', step_pct=5):
+    """
+    Cheapest compliant blend for each design point (arrays broadcast like
+    calculate_mix_batch). prices overrides entries of PRICES. Returns a dict
+    of arrays, one row per point: the blend_mix_batch columns plus the
+    chosen 'fly_ash_pct' / 'ggbs_pct', 'opc_cost' (the same point without
+    replacement) and 'feasible' (False where no blend complies; that row
+    holds the plain OPC mix).
+    """
+    if exposure not in EXPOSURE_LIMITS:
+        raise ValueError(f"unknown exposure {exposure!r}; expected one of {', '.join(EXPOSURE_LIMITS)}")
+    prices = {**PRICES, **(prices or {})}
+    max_wc, min_cement = EXPOSURE_LIMITS[exposure]
+    t, s, g = (a.ravel() for a in np.broadcast_arrays(
+        np.asarray(target_strength, dtype=np.float64),
+        np.asarray(slump, dtype=np.float64),
+        np.asarray(max_agg_size, dtype=np.float64),
+    ))
+    fly_ash, ggbs = blend_grid(step_pct)
+
+    # (points, blends) in one pass; column 0 is plain OPC
+    mixes = calculate_blend_mix_batch(t[:, None], s[:, None], g[:, None], fly_ash[None, :], ggbs[None, :], prices)
+    feasible = mixes['compliant'] & (mixes['wc'] <= max_wc) & (mixes['binder'] >= min_cement)
+    best = np.argmin(np.where(feasible, mixes['cost'], np.inf), axis=1)
+    rows = np.arange(len(t))
+
+    solution = {name: values[rows, best] for name, values in mixes.items()}
+    solution['fly_ash_pct'] = fly_ash[best] * 100
+    solution['ggbs_pct'] = ggbs[best] * 100
+    solution['opc_cost'] = mixes['cost'][:, 0]
+    solution['feasible'] = feasible[rows, best]
+    return solution
@@ -0,0 +1,230 @@
+"""
+Command line for bulk mix design, without the Streamlit UI.
+
+    python -m concrete_mix design schedule.csv -o mixes.parquet
+    python -m concrete_mix stream huge.csv -o mixes.csv --workers 8 [--resume]
+    python -m concrete_mix optimize 25 --exposure Severe --slump 75 125 [--pareto]
+    python -m concrete_mix project schedule.csv --by grade -o boq.csv
+    python -m concrete_mix simulate 25 --slump 75 --samples 5000000 --volume 120
+    python -m concrete_mix prices import prices.csv
+    python -m concrete_mix prices recost mixes.csv --as-of 2025-06-01
+    python -m concrete_mix build-table
+
+A schedule needs a target_strength column (MPa); slump (mm) and max_agg_size
+(mm) are optional and default to 50 and 20 like calculate_mix. Other columns
+(element, volume, ...) are passed through. CSV and Parquet are chosen by file
+extension; "-" reads or writes CSV on stdin/stdout.
+"""
+
+import argparse
+import sys
+import time
+
+from .optimize import EXPOSURE_LIMITS, optimize_mix
+from .schedule import OUTPUT_COLUMNS, design_schedule
+from .table import MIX_TABLE_PATH, load_mix_table
+
+
+def read_schedule(path):
+    import pandas as pd
+    if path == "-":
+        return pd.read_csv(sys.stdin)
+    if path.endswith((".parquet", ".pq")):
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+
+def write_mixes(df, path):
+    if path == "-":
+        df.to_csv(sys.stdout, index=False)
+    elif path.endswith((".parquet", ".pq")):
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+
+
+def _design(args):
+    start = time.perf_counter()
+    df = read_schedule(args.schedule)
+    try:
+        out = design_schedule(df)
+    except ValueError as exc:
+        raise SystemExit(f"error: {exc}")
+    write_mixes(out, args.output)
+    if args.output != "-":
+        elapsed = time.perf_counter() - start
+        print(f"{len(out)} rows -> {args.output} in {elapsed:.2f} s", file=sys.stderr)
+
+
+def _stream(args):
+    from .pipeline import run_pipeline
+
+    def progress(stats):
+        print(f"\r{stats['rows']:,} rows  {stats['rows_per_sec']:,.0f} rows/s", end="", file=sys.stderr)
+
+    try:
+        stats = run_pipeline(
+            args.schedule, args.output, workers=args.workers,
+            chunk_bytes=args.chunk_mb * 1024 * 1024, resume=args.resume, progress=progress,
+        )
+    except ValueError as exc:
+        raise SystemExit(f"error: {exc}")
+    rss = "n/a" if stats['peak_rss_mb'] is None else f"{stats['peak_rss_mb']:.0f} MB (workers {stats['worker_peak_rss_mb']:.0f} MB)"
+    print(
+        f"\n{stats['rows']:,} rows -> {args.output} in {stats['seconds']:.2f} s, "
+        f"{stats['rows_per_sec']:,.0f} rows/s, peak RSS {rss}",
+        file=sys.stderr,
+    )
+
+
+def _optimize(args):
+    import pandas as pd
+    try:
+        result = optimize_mix(args.grade, args.exposure, tuple(args.slump), tuple(args.agg), top=args.top)
+    except ValueError as exc:
+        raise SystemExit(f"error: {exc}")
+    columns = ['target_strength', 'slump', 'max_agg_size'] + OUTPUT_COLUMNS
+    mixes = result['pareto' if args.pareto else 'cheapest']
+    pd.DataFrame({name: mixes[name] for name in columns}).to_csv(sys.stdout, index=False)
+    print(f"{result['feasible']} of {result['evaluated']} candidates compliant", file=sys.stderr)
+
+
+def _project(args):
+    from .project import design_project, read_project_schedule, summarize_project
+    start = time.perf_counter()
+    try:
+        designed = design_project(read_project_schedule(read_schedule(args.schedule)))
+        out = designed if args.by == "rows" else summarize_project(designed, args.by)
+    except ValueError as exc:
+        raise SystemExit(f"error: {exc}")
+    write_mixes(out, args.output)
+    elapsed = time.perf_counter() - start
+    print(f"{len(designed):,} elements, {designed['volume'].sum():,.1f} m³, "
+          f"₹{designed['amount'].sum():,.0f} in {elapsed:.2f} s", file=sys.stderr)
+
+
+def _simulate(args):
+    from .uncertainty import simulate_mix
+    start = time.perf_counter()
+    try:
+        result = simulate_mix(args.strength, args.slump, args.agg, samples=args.samples, volume=args.volume, seed=args.seed)
+    except ValueError as exc:
+        raise SystemExit(f"error: {exc}")
+    print(f"{'quantity':<14}{'P5':>14}{'P50':>14}{'P95':>14}")
+    for name, values in result['percentiles'].items():
+        print(f"{name:<14}" + "".join(f"{values[p]:>14,.3f}" for p in (5, 50, 95)))
+    print(f"P(non-compliance) {result['p_noncompliant']:.2%}")
+    elapsed = time.perf_counter() - start
+    print(f"{args.samples:,} samples in {elapsed:.2f} s", file=sys.stderr)
+
+
+def _price_book(args):
+    from .prices import PRICE_DB_PATH, PriceBook
+    return PriceBook(args.db or PRICE_DB_PATH)
+
+
+def _prices_import(args):
+    book = _price_book(args)
+    try:
+        count = book.import_csv(args.csv)
+    except ValueError as exc:
+        raise SystemExit(f"error: {exc}")
+    print(f"{count} prices -> {book.path} ({len(book.regions())} regions)", file=sys.stderr)
+
+
+def _prices_show(args):
+    import pandas as pd
+    from .prices import MATERIALS
+    try:
+        regions, table = _price_book(args).table(args.as_of)
+    except ValueError as exc:
+        raise SystemExit(f"error: {exc}")
+    pd.DataFrame(table, index=pd.Index(regions, name='region'), columns=list(MATERIALS)).to_csv(sys.stdout)
+
+
+def _prices_recost(args):
+    from .prices import aggregate_mixes, project_cost_by_region
+    df = read_schedule(args.schedule)
+    book = _price_book(args)
+    try:
+        if 'cement' not in df.columns:
+            df = design_schedule(df)
+        start = time.perf_counter()
+        quantities, volumes = aggregate_mixes(
+            {name: df[name].to_numpy() for name in ('cement', 'sand', 'coarse_agg', 'water', 'fly_ash', 'ggbs') if name in df.columns},
+            df['volume'].to_numpy() if 'volume' in df.columns else 1.0,
+        )
+        regions, totals = project_cost_by_region(quantities, volumes, book, args.as_of)
+    except ValueError as exc:
+        raise SystemExit(f"error: {exc}")
+    elapsed = time.perf_counter() - start
+    for region, total in sorted(zip(regions, totals), key=lambda item: item[1]):
+        print(f"{region},{total:.0f}")
+    print(f"{len(df)} rows ({len(volumes)} distinct mixes) x {len(regions)} regions in {elapsed * 1000:.1f} ms", file=sys.stderr)
+
+
+def _build_table(args):
+    table = load_mix_table()
+    print(f"{len(table)} mixes in {MIX_TABLE_PATH}", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m concrete_mix", description="Bulk IS 10262 concrete mix design.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    design = commands.add_parser("design", help="design a mix and cost for every row of a pour schedule")
+    design.add_argument("schedule", help="input CSV or Parquet file, or - for CSV on stdin")
+    design.add_argument("-o", "--output", default="-", help="output CSV or Parquet file (default: CSV on stdout)")
+    design.set_defaults(func=_design)
+
+    stream = commands.add_parser("stream", help="design a schedule larger than memory in chunks across processes")
+    stream.add_argument("schedule", help="input CSV or Parquet file")
+    stream.add_argument("-o", "--output", required=True, help="output CSV file, or Parquet directory (one part per chunk)")
+    stream.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    stream.add_argument("--chunk-mb", type=int, default=16, help="CSV input chunk size in MB (default: 16)")
+    stream.add_argument("--resume", action="store_true", help="continue after the last completed chunk of an interrupted run")
+    stream.set_defaults(func=_stream)
+
+    optimize = commands.add_parser("optimize", help="cheapest compliant mixes and the cost-vs-slump Pareto front for a grade")
+    optimize.add_argument("grade", type=int, help="required characteristic strength (MPa)")
+    optimize.add_argument("--exposure", default="Mild", choices=list(EXPOSURE_LIMITS), help="IS 456 exposure (default: Mild)")
+    optimize.add_argument("--slump", type=int, nargs=2, default=[25, 150], metavar=("LOW", "HIGH"), help="acceptable slump range in mm (default: 25 150)")
+    optimize.add_argument("--agg", type=int, nargs="+", default=[10, 20, 40], help="allowed max aggregate sizes in mm (default: 10 20 40)")
+    optimize.add_argument("--top", type=int, default=5, help="how many of the cheapest mixes to list (default: 5)")
+    optimize.add_argument("--pareto", action="store_true", help="print the cost-vs-slump Pareto front instead")
+    optimize.set_defaults(func=_optimize)
+
+    project = commands.add_parser("project", help="bill of quantities for a pour schedule, totalled by grade or pour date")
+    project.add_argument("schedule", help="schedule CSV or Parquet (element, grade, slump, max_agg_size, volume, pour_date), or - for stdin")
+    project.add_argument("--by", default="grade", choices=["grade", "pour_date", "rows"], help="totals per grade or pour date, or every designed row (default: grade)")
+    project.add_argument("-o", "--output", default="-", help="output CSV or Parquet file (default: CSV on stdout)")
+    project.set_defaults(func=_project)
+
+    simulate = commands.add_parser("simulate", help="Monte Carlo percentiles and non-compliance risk for one mix")
+    simulate.add_argument("strength", type=float, help="target strength (MPa)")
+    simulate.add_argument("--slump", type=float, default=50, help="slump in mm (default: 50)")
+    simulate.add_argument("--agg", type=int, default=20, help="max aggregate size in mm (default: 20)")
+    simulate.add_argument("--samples", type=int, default=1_000_000, help="simulated batches (default: 1000000)")
+    simulate.add_argument("--volume", type=float, default=1.0, help="project volume in m³ for project_cost (default: 1)")
+    simulate.add_argument("--seed", type=int, default=0, help="random seed (default: 0)")
+    simulate.set_defaults(func=_simulate)
+
+    prices = commands.add_parser("prices", help="regional price database: import prices, show them, re-cost a schedule per region")
+    prices.add_argument("--db", help="price database file (default: PRICE_DB_PATH)")
+    prices_commands = prices.add_subparsers(dest="prices_command", required=True)
+    prices_import = prices_commands.add_parser("import", help="add or update prices from a CSV (region,material,effective_date,price)")
+    prices_import.add_argument("csv")
+    prices_import.set_defaults(func=_prices_import)
+    prices_show = prices_commands.add_parser("show", help="prices in force per region as CSV")
+    prices_show.add_argument("--as-of", help="date, YYYY-MM-DD (default: today)")
+    prices_show.set_defaults(func=_prices_show)
+    prices_recost = prices_commands.add_parser("recost", help="total cost of a schedule in every region (volume column in m³, default 1)")
+    prices_recost.add_argument("schedule", help="schedule or designed mixes, CSV or Parquet")
+    prices_recost.add_argument("--as-of", help="date, YYYY-MM-DD (default: today)")
+    prices_recost.set_defaults(func=_prices_recost)
+
+    build = commands.add_parser("build-table", help="build and validate the precomputed UI mix table")
+    build.set_defaults(func=_build_table)
+
+    args = parser.parse_args(argv)
+    args.func(args)
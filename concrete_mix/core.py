@@ -0,0 +1,135 @@
+"""
+IS 10262 mix formulas, the price table and the compliance rule, for one mix
+(calculate_mix / calculate_cost) or a whole schedule at once
+(calculate_mix_batch / calculate_cost_batch).
+"""
+
+import numpy as np
+
+# Cost basis, ₹ per unit (Avg. India 2025)
+PRICES = {'Cement (kg/m³)': 7, 'Fine Aggregate - Sand (kg/m³)': 1.8, 'Coarse Aggregate (kg/m³)': 1.1, 'Water (L/m³)': 0.05,
+          'Fly Ash (kg/m³)': 2.5, 'GGBS (kg/m³)': 3.8}
+
+# Densities for the volume-to-mass conversion (kg/m³) and entrapped air
+# (fraction of 1 m³); concrete_mix.uncertainty samples around these
+DENSITIES = {'cement': 3100, 'water': 1000, 'sand': 2600, 'coarse_agg': 1600}
+AIR_CONTENT = 0.02
+
+# IS 456 durability limits checked for every mix
+MAX_WC = 0.50
+MIN_CEMENT = 300
+
+COMPLIANT_LABEL = ' Fully Compliant'
+REVIEW_LABEL = '⚠️ Review Required'
+
+# IS 10262 w/c brackets: (highest target strength in MPa, w/c), and the w/c
+# above the last bracket
+WC_BRACKETS = ((20, 0.60), (30, 0.50), (40, 0.42))
+WC_ABOVE = 0.38
+
+# Water demand: 186 L/m³ at 50 mm slump, 3 L per mm of slump, adjusted for
+# the maximum aggregate size (mm)
+BASE_WATER = 186
+WATER_PER_MM_SLUMP = 3
+AGG_WATER_ADJUSTMENT = {10: -10, 40: 10}
+
+
+def is_compliant(wc, cement):
+    # Works elementwise on arrays as well as on plain numbers
+    return (wc <= MAX_WC) & (cement >= MIN_CEMENT)
+
+
+# The w/c and water rules shared by every mix calculation in the package
+# (plain, blended, simulated, optimizer brackets). Scalars stay scalars;
+# arrays are worked elementwise with the same operation order, so batch rows
+# match the scalar functions exactly.
+def design_wc(target_strength):
+    if not isinstance(target_strength, np.ndarray):
+        for top, wc in WC_BRACKETS:
+            if target_strength <= top:
+                return wc
+        return WC_ABOVE
+    return np.select(
+        [target_strength <= top for top, _ in WC_BRACKETS], [wc for _, wc in WC_BRACKETS], default=WC_ABOVE,
+    )
+
+
+def water_demand(slump, max_agg_size):
+    water = BASE_WATER + (slump - 50) * WATER_PER_MM_SLUMP
+    if not isinstance(max_agg_size, np.ndarray):
+        return water + AGG_WATER_ADJUSTMENT.get(max_agg_size, 0)
+    return water + np.select(
+        [max_agg_size == size for size in AGG_WATER_ADJUSTMENT], list(AGG_WATER_ADJUSTMENT.values()), default=0,
+    ).astype(np.float64)
+
+
+# IS 10262 simple formulas, on the w/c and water rules of design_wc / water_demand
+def calculate_mix(target_strength, slump=50, max_agg_size=20):
+    wc = design_wc(target_strength)
+    water = water_demand(slump, max_agg_size)
+    
+    cement = max(water / wc, 300)
+    
+    total_vol = 1 - (cement/DENSITIES['cement'] + water/DENSITIES['water'] + AIR_CONTENT)
+    sand_vol = total_vol * 0.4
+    agg_vol = total_vol * 0.6
+    sand = sand_vol * DENSITIES['sand']
+    coarse_agg = agg_vol * DENSITIES['coarse_agg']
+    
+    compliant = is_compliant(wc, cement)
+    return {
+        'Cement (kg/m³)': round(cement),
+        'Water (L/m³)': round(water),
+        'Fine Aggregate - Sand (kg/m³)': round(sand),
+        'Coarse Aggregate (kg/m³)': round(coarse_agg),
+        'Water-Cement Ratio (w/c)': round(wc, 2),
+        'IS Compliance': COMPLIANT_LABEL if compliant else REVIEW_LABEL
+    }
+
+
+# Cost calc (prices may override PRICES, e.g. regional rates)
+def calculate_cost(mix, prices=PRICES):
+    cost = sum(mix[k] * prices[k] for k in prices if k in mix)
+    return round(cost, 0)
+
+
+# Batch versions of calculate_mix / calculate_cost for whole pour schedules.
+# Same rules and the same floating-point operation order as the scalar
+# functions, so every row matches them exactly (np.rint rounds half-to-even
+# like round()).
+def calculate_mix_batch(target_strength, slump=50, max_agg_size=20):
+    target_strength, slump, max_agg_size = np.broadcast_arrays(
+        np.asarray(target_strength, dtype=np.float64),
+        np.asarray(slump, dtype=np.float64),
+        np.asarray(max_agg_size, dtype=np.float64),
+    )
+    wc = design_wc(target_strength)
+    water = water_demand(slump, max_agg_size)
+
+    cement = np.maximum(water / wc, 300)
+
+    total_vol = 1 - (cement / DENSITIES['cement'] + water / DENSITIES['water'] + AIR_CONTENT)
+    sand = total_vol * 0.4 * DENSITIES['sand']
+    coarse_agg = total_vol * 0.6 * DENSITIES['coarse_agg']
+
+    mixes = {
+        'cement': np.rint(cement).astype(np.int64),
+        'water': np.rint(water).astype(np.int64),
+        'sand': np.rint(sand).astype(np.int64),
+        'coarse_agg': np.rint(coarse_agg).astype(np.int64),
+        'wc': np.round(wc, 2),
+        'compliant': is_compliant(wc, cement),
+    }
+    mixes['cost'] = calculate_cost_batch(mixes)
+    return mixes
+
+
+def calculate_cost_batch(mixes, prices=PRICES):
+    # Summed in PRICES order, as calculate_cost does
+    cost = (
+        mixes['cement'] * prices['Cement (kg/m³)']
+        + mixes['sand'] * prices['Fine Aggregate - Sand (kg/m³)']
+        + mixes['coarse_agg'] * prices['Coarse Aggregate (kg/m³)']
+        + mixes['water'] * prices['Water (L/m³)']
+    )
+    return np.round(cost, 0)
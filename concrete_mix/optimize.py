@@ -0,0 +1,81 @@
+"""
+Cost optimizer: the cheapest compliant mixes for a required grade, and the
+cost-vs-workability Pareto front, found by evaluating the whole candidate
+grid (design strength x slump x aggregate size) with calculate_mix_batch.
+
+The design w/c only changes at the 20/30/40 MPa bracket edges, so every
+strength inside a bracket gives the same mix; only the lowest strength of
+each bracket at or above the grade is evaluated. That prunes the grid to at
+most four strengths before anything is computed.
+"""
+
+import numpy as np
+
+from .core import WC_BRACKETS, calculate_mix_batch
+
+# IS 456 Table 5 (reinforced concrete): max w/c and min cement (kg/m³),
+# checked on top of the MAX_WC / MIN_CEMENT compliance rule
+EXPOSURE_LIMITS = {
+    'Mild': (0.55, 300),
+    'Moderate': (0.50, 300),
+    'Severe': (0.45, 320),
+    'Very Severe': (0.45, 340),
+    'Extreme': (0.40, 360),
+}
+
+# Upper strength of each w/c bracket in calculate_mix
+_WC_BRACKET_TOPS = tuple(top for top, _ in WC_BRACKETS)
+
+
+def _design_strengths(grade):
+    # Lowest strength of every bracket from the grade's own bracket upwards
+    strengths = [grade] + [top + 1 for top in _WC_BRACKET_TOPS if top + 1 > grade]
+    return np.asarray(strengths)
+
+
+def _take(candidates, order):
+    return {name: values[order] for name, values in candidates.items()}
+
+
+def pareto_front(cost, slump):
+    """Indices of the mixes no other mix beats on both cost (lower) and slump (higher), cheapest first."""
+    order = np.lexsort((-slump, cost))
+    slump_sorted = slump[order]
+    # A mix is on the front when it is more workable than every cheaper one
+    best_before = np.maximum.accumulate(np.concatenate(([-np.inf], slump_sorted[:-1])))
+    return order[slump_sorted > best_before]
+
+
+def optimize_mix(grade, exposure='Mild', slump_range=(25, 150), agg_sizes=(10, 20, 40), top=5):
+    """
+    Search every design strength >= grade, every whole-mm slump in
+    slump_range and every size in agg_sizes. Returns a dict with
+    'cheapest' (the `top` cheapest compliant mixes, ties broken by higher
+    slump then lower strength) and 'pareto' (the cost-vs-slump front,
+    cheapest first), both dicts of arrays with the calculate_mix_batch
+    columns plus target_strength, slump and max_agg_size; and the
+    'evaluated' and 'feasible' candidate counts.
+    """
+    if exposure not in EXPOSURE_LIMITS:
+        raise ValueError(f"unknown exposure {exposure!r}; expected one of {', '.join(EXPOSURE_LIMITS)}")
+    if slump_range[0] > slump_range[1]:
+        raise ValueError("slump_range must be (low, high)")
+    if not agg_sizes:
+        raise ValueError("agg_sizes must not be empty")
+    max_wc, min_cement = EXPOSURE_LIMITS[exposure]
+
+    slumps = np.arange(slump_range[0], slump_range[1] + 1)
+    t, s, g = np.meshgrid(_design_strengths(grade), slumps, np.asarray(agg_sizes), indexing='ij')
+    candidates = {'target_strength': t.ravel(), 'slump': s.ravel(), 'max_agg_size': g.ravel()}
+    candidates.update(calculate_mix_batch(candidates['target_strength'], candidates['slump'], candidates['max_agg_size']))
+
+    feasible = candidates['compliant'] & (candidates['wc'] <= max_wc) & (candidates['cement'] >= min_cement)
+    candidates = _take(candidates, feasible)
+
+    order = np.lexsort((candidates['target_strength'], -candidates['slump'], candidates['cost']))
+    return {
+        'cheapest': _take(candidates, order[:top]),
+        'pareto': _take(candidates, pareto_front(candidates['cost'], candidates['slump'])),
+        'evaluated': int(feasible.size),
+        'feasible': int(feasible.sum()),
+    }
@@ -0,0 +1,274 @@
+"""
+Streaming mix design for pour schedules larger than memory.
+
+The input is cut into chunks (byte ranges of a CSV, row groups of a
+Parquet file) that worker processes read, design and format themselves, so
+parsing scales with cores as well as the formula. At most two chunks per
+worker are in flight, which keeps memory flat whatever the file size.
+Results are written in input order:
+
+- CSV output is one file, appended by the parent as chunks complete.
+- Parquet output is a directory of part-NNNNNN.parquet files, one per
+  chunk, written by the workers.
+
+Every chunk is read with the same column dtypes, taken from the first
+chunk (CSV) or the file schema (Parquet), so a column is formatted alike in
+every part of the output and Parquet parts share one schema.
+
+After every written chunk a <output>.checkpoint.json records progress, and
+resume=True continues after the last completed chunk following a crash.
+CSV input is split on line boundaries, so quoted fields must not contain
+newlines.
+"""
+
+import io
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import resource
+except ImportError:  # Windows: no peak RSS reporting
+    resource = None
+
+from .schedule import OUTPUT_COLUMNS, design_schedule
+
+DEFAULT_CHUNK_BYTES = 16 * 1024 * 1024
+
+
+def _is_parquet(path):
+    return path.endswith((".parquet", ".pq"))
+
+
+def _csv_chunks(path, chunk_bytes):
+    # (start, end) byte ranges covering whole lines after the header
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        f.readline()
+        start = f.tell()
+        while start < size:
+            f.seek(min(start + chunk_bytes, size))
+            f.readline()
+            end = min(f.tell(), size)
+            yield start, end
+            start = end
+
+
+def _parquet_chunks(path):
+    import pyarrow.parquet as pq
+    for i in range(pq.ParquetFile(path).num_row_groups):
+        yield i, None
+
+
+def _read_chunk(path, start, end, dtypes=None):
+    import pandas as pd
+    if _is_parquet(path):
+        import pyarrow.parquet as pq
+        frame = pq.ParquetFile(path).read_row_group(start).to_pandas()
+        return frame if dtypes is None else frame.astype(dtypes)
+    with open(path, "rb") as f:
+        header = f.readline()
+        f.seek(start)
+        data = f.read(end - start)
+    try:
+        return pd.read_csv(io.BytesIO(header + data), dtype=dtypes)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"bytes {start}-{end} of {path}: {exc} (the first chunk set this column's type)") from None
+
+
+def _chunk_dtypes(path, chunk_bytes):
+    # One dtype per column for every chunk, so that chunks agree: integers
+    # and booleans become nullable (a later chunk may have blanks), and a
+    # column with no values in the first chunk is read as text (pandas'
+    # string dtype, which Parquet stores as string even when all blank)
+    import pandas as pd
+    if _is_parquet(path):
+        import pyarrow.parquet as pq
+        frame = pq.ParquetFile(path).schema_arrow.empty_table().to_pandas()
+    else:
+        first = next(_csv_chunks(path, chunk_bytes), None)
+        if first is None:
+            return None
+        frame = _read_chunk(path, *first)
+    dtypes = {}
+    for column, dtype in frame.dtypes.items():
+        if pd.api.types.is_bool_dtype(dtype):
+            dtypes[column] = "boolean"
+        elif pd.api.types.is_integer_dtype(dtype):
+            dtypes[column] = "Int64"
+        elif pd.api.types.is_float_dtype(dtype) and not (len(frame) and frame[column].isna().all()):
+            dtypes[column] = "float64"
+        elif not pd.api.types.is_datetime64_any_dtype(dtype):
+            dtypes[column] = "string"
+    return dtypes
+
+
+def _part_path(output, index):
+    return os.path.join(output, f"part-{index:06d}.parquet")
+
+
+def _design_chunk(path, start, end, output, index, dtypes):
+    # Runs in a worker: read, design and format one chunk
+    chunk = _read_chunk(path, start, end, dtypes)
+    try:
+        out = design_schedule(chunk)
+    except ValueError as exc:
+        where = f"row group {start}" if _is_parquet(path) else f"bytes {start}-{end}"
+        raise ValueError(f"{path}, chunk at {where}: {exc}") from None
+    if _is_parquet(output):
+        out.to_parquet(_part_path(output, index), index=False)
+        return len(out), None
+    return len(out), out.to_csv(index=False, header=False).encode()
+
+
+def _output_header(path):
+    import pandas as pd
+    if _is_parquet(path):
+        import pyarrow.parquet as pq
+        columns = pq.ParquetFile(path).schema_arrow.names
+    else:
+        with open(path, "rb") as f:
+            columns = list(pd.read_csv(io.BytesIO(f.readline()), nrows=0).columns)
+    if 'target_strength' not in columns:
+        raise ValueError("schedule needs a 'target_strength' column")
+    return pd.DataFrame(columns=columns + OUTPUT_COLUMNS).to_csv(index=False).encode()
+
+
+def _peak_rss_mb():
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    if resource is None:
+        return None, None
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+    workers = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale
+    return own, workers
+
+
+class _Checkpoint:
+    def __init__(self, output, params):
+        self.path = output.rstrip("/" + os.sep) + ".checkpoint.json"
+        self.params = params
+        self.chunks_done = self.rows_done = self.output_bytes = 0
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return False
+        with open(self.path) as f:
+            state = json.load(f)
+        if state["params"] != self.params:
+            raise ValueError(f"{self.path} was written for a different input or chunk size; delete it to start over")
+        self.chunks_done = state["chunks_done"]
+        self.rows_done = state["rows_done"]
+        self.output_bytes = state["output_bytes"]
+        return True
+
+    def save(self):
+        state = {
+            "params": self.params,
+            "chunks_done": self.chunks_done,
+            "rows_done": self.rows_done,
+            "output_bytes": self.output_bytes,
+        }
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp, self.path)
+
+    def remove(self):
+        os.remove(self.path)
+
+
+def run_pipeline(input_path, output_path, workers=None, chunk_bytes=DEFAULT_CHUNK_BYTES,
+                 resume=False, progress=None):
+    """
+    Design every row of input_path into output_path; returns a stats dict
+    (rows, chunks, seconds, rows_per_sec, peak_rss_mb, worker_peak_rss_mb).
+    progress(stats) is called after each chunk is written.
+    """
+    workers = workers or os.cpu_count() or 1
+    header = _output_header(input_path)
+    dtypes = _chunk_dtypes(input_path, chunk_bytes)
+    if _is_parquet(input_path):
+        chunks = _parquet_chunks(input_path)
+    else:
+        chunks = _csv_chunks(input_path, chunk_bytes)
+
+    checkpoint = _Checkpoint(output_path, {
+        "input": os.path.abspath(input_path),
+        "input_size": os.path.getsize(input_path),
+        "chunk_bytes": None if _is_parquet(input_path) else chunk_bytes,
+    })
+    resumed = resume and checkpoint.load()
+    for _ in range(checkpoint.chunks_done):
+        next(chunks)
+
+    csv_out = None
+    if _is_parquet(output_path):
+        if resumed and not all(os.path.isfile(_part_path(output_path, i)) for i in range(checkpoint.chunks_done)):
+            raise ValueError(f"{output_path} is missing parts that {checkpoint.path} records; delete the checkpoint to start over")
+        os.makedirs(output_path, exist_ok=True)
+        if not resumed:
+            for name in os.listdir(output_path):
+                if name.startswith("part-") and name.endswith(".parquet"):
+                    os.remove(os.path.join(output_path, name))
+    elif resumed:
+        if not os.path.isfile(output_path) or os.path.getsize(output_path) < checkpoint.output_bytes:
+            raise ValueError(f"{output_path} is missing or shorter than {checkpoint.path} records; delete the checkpoint to start over")
+        csv_out = open(output_path, "r+b")
+        csv_out.truncate(checkpoint.output_bytes)
+        csv_out.seek(checkpoint.output_bytes)
+    else:
+        csv_out = open(output_path, "wb")
+        csv_out.write(header)
+        checkpoint.output_bytes = len(header)
+
+    start_time = time.perf_counter()
+    rows_at_start = checkpoint.rows_done
+
+    def stats():
+        elapsed = time.perf_counter() - start_time
+        rows = checkpoint.rows_done - rows_at_start
+        own, children = _peak_rss_mb()
+        return {
+            "rows": checkpoint.rows_done,
+            "chunks": checkpoint.chunks_done,
+            "seconds": elapsed,
+            "rows_per_sec": rows / elapsed if elapsed else 0.0,
+            "peak_rss_mb": own,
+            "worker_peak_rss_mb": children,
+        }
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+            index = checkpoint.chunks_done
+            for start, end in chunks:
+                pending.append(pool.submit(_design_chunk, input_path, start, end, output_path, index, dtypes))
+                index += 1
+                if len(pending) >= 2 * workers:
+                    _write_next(pending, csv_out, checkpoint, progress, stats)
+            while pending:
+                _write_next(pending, csv_out, checkpoint, progress, stats)
+    finally:
+        if csv_out is not None:
+            csv_out.close()
+    if os.path.exists(checkpoint.path):
+        checkpoint.remove()
+    return stats()
+
+
+def _write_next(pending, csv_out, checkpoint, progress, stats):
+    # Oldest chunk first, so output order always matches input order
+    rows, data = pending.popleft().result()
+    if csv_out is not None:
+        csv_out.write(data)
+        csv_out.flush()
+        checkpoint.output_bytes += len(data)
+    checkpoint.chunks_done += 1
+    checkpoint.rows_done += rows
+    checkpoint.save()
+    if progress is not None:
+        progress(stats())
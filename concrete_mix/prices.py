@@ -0,0 +1,217 @@
+"""
+Regional price database: unit prices per region, material and effective
+date in a SQLite file, kept in memory and reloaded only when the file
+changes (checked by mtime/size on each lookup, a single stat call), so a
+weekly price update needs no redeploy.
+
+    python -m concrete_mix prices import prices.csv    # region,material,effective_date,price
+    python -m concrete_mix prices show --as-of 2025-06-01
+
+A region's price for a material is the latest one effective on or before
+the as-of date; materials a region has no price for fall back to PRICES.
+cost_by_region costs one mix or a whole batch against every region at once;
+project_cost_by_region totals a schedule per region.
+"""
+
+import bisect
+import csv
+import datetime
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+from .core import PRICES
+
+PRICE_DB_PATH = os.environ.get(
+    "PRICE_DB_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "prices.sqlite3"),
+)
+
+# Short material names used in the database and in batch mixes, in PRICES order
+MATERIALS = {
+    'cement': 'Cement (kg/m³)',
+    'sand': 'Fine Aggregate - Sand (kg/m³)',
+    'coarse_agg': 'Coarse Aggregate (kg/m³)',
+    'water': 'Water (L/m³)',
+    'fly_ash': 'Fly Ash (kg/m³)',
+    'ggbs': 'GGBS (kg/m³)',
+}
+
+
+def _as_of(date):
+    if date is None:
+        return datetime.date.today().isoformat()
+    if isinstance(date, datetime.date):
+        return date.isoformat()
+    try:
+        return datetime.date.fromisoformat(date).isoformat()
+    except (TypeError, ValueError):
+        raise ValueError(f"as_of {date!r} is not a YYYY-MM-DD date") from None
+
+
+def mix_quantities(mix):
+    """A calculate_mix / calculate_blend_mix dict as the short-named quantities cost_by_region takes."""
+    return {name: mix[key] for name, key in MATERIALS.items() if key in mix}
+
+
+class PriceBook:
+    """In-memory view of the price database, refreshed whenever the file changes."""
+
+    def __init__(self, path=PRICE_DB_PATH):
+        self.path = path
+        self.reloads = 0
+        self._lock = threading.Lock()
+        self._stamp = None
+        self._history = None
+        self._regions = ()
+        self._tables = {}
+
+    @contextmanager
+    def _db(self):
+        # Default rollback journal: every commit rewrites the main file, so
+        # its mtime is a reliable change signal (WAL mode would not be)
+        db = sqlite3.connect(self.path, timeout=10)
+        try:
+            with db:
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS prices ("
+                    "region TEXT NOT NULL, material TEXT NOT NULL, effective_date TEXT NOT NULL, price REAL NOT NULL, "
+                    "PRIMARY KEY (region, material, effective_date))"
+                )
+                yield db
+        finally:
+            db.close()
+
+    def _refresh(self):
+        try:
+            stat = os.stat(self.path)
+            stamp = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            stamp = None
+        with self._lock:
+            if self._history is not None and stamp == self._stamp:
+                return
+            history = {}
+            if stamp is not None:
+                with self._db() as db:
+                    rows = db.execute(
+                        "SELECT region, material, effective_date, price FROM prices "
+                        "ORDER BY region, material, effective_date"
+                    ).fetchall()
+                for region, material, date, price in rows:
+                    dates, prices = history.setdefault((region, material), ([], []))
+                    dates.append(date)
+                    prices.append(price)
+            self._history = history
+            self._regions = tuple(sorted({region for region, _ in history}))
+            self._tables = {}
+            self._stamp = stamp
+            self.reloads += 1
+
+    def regions(self):
+        self._refresh()
+        return self._regions
+
+    def table(self, as_of=None):
+        """(regions, array of shape (regions, MATERIALS)) of the prices in force on as_of (default today)."""
+        self._refresh()
+        as_of = _as_of(as_of)
+        with self._lock:
+            cached = self._tables.get(as_of)
+            if cached is not None:
+                return cached
+            defaults = np.array([PRICES[key] for key in MATERIALS.values()], dtype=np.float64)
+            table = np.tile(defaults, (len(self._regions), 1))
+            rows = {region: i for i, region in enumerate(self._regions)}
+            columns = {material: j for j, material in enumerate(MATERIALS)}
+            for (region, material), (dates, prices) in self._history.items():
+                i = bisect.bisect_right(dates, as_of) - 1
+                if i >= 0 and material in columns:
+                    table[rows[region], columns[material]] = prices[i]
+            table.flags.writeable = False
+            self._tables[as_of] = (self._regions, table)
+            return self._tables[as_of]
+
+    def prices(self, region, as_of=None):
+        """PRICES-style dict for one region, ready for calculate_cost(mix, prices)."""
+        regions, table = self.table(as_of)
+        if region not in regions:
+            raise KeyError(f"no prices for region {region!r}")
+        row = table[regions.index(region)]
+        return {key: float(price) for key, price in zip(MATERIALS.values(), row)}
+
+    def put(self, rows):
+        """Insert or replace (region, material, effective_date, price) rows."""
+        rows = [(region, material, _as_of(date), float(price)) for region, material, date, price in rows]
+        unknown = {material for _, material, _, _ in rows} - set(MATERIALS)
+        if unknown:
+            raise ValueError(f"unknown material(s) {', '.join(sorted(unknown))}; expected {', '.join(MATERIALS)}")
+        with self._db() as db:
+            db.executemany("INSERT OR REPLACE INTO prices VALUES (?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def import_csv(self, path):
+        with open(path, newline='') as f:
+            reader = csv.DictReader(f)
+            missing = {'region', 'material', 'effective_date', 'price'} - set(reader.fieldnames or ())
+            if missing:
+                raise ValueError(f"{path} is missing column(s) {', '.join(sorted(missing))}")
+            return self.put((row['region'], row['material'], row['effective_date'], row['price']) for row in reader)
+
+
+def cost_by_region(mixes, book, as_of=None):
+    """
+    (regions, costs): costs[..., r] is calculate_cost of each mix at region
+    r's prices, for short-named quantities (scalars or arrays, e.g. from
+    calculate_mix_batch or mix_quantities). Summed in PRICES order, so every
+    value matches calculate_cost(mix, book.prices(region)) exactly.
+    """
+    regions, table = book.table(as_of)
+    cost = 0
+    for j, name in enumerate(MATERIALS):
+        if name in mixes:
+            cost = cost + np.asarray(mixes[name])[..., None] * table[:, j]
+    return regions, np.round(cost, 0)
+
+
+def aggregate_mixes(mixes, volume=1.0):
+    """
+    (quantities, volumes): the distinct mixes of a batch and the total
+    volume of each. Identical rows cost the same, so project totals from
+    the aggregate equal those from the rows; build it once per schedule and
+    re-costing after a price update only touches the few distinct mixes.
+    """
+    names = [name for name in MATERIALS if name in mixes]
+    columns = [np.asarray(mixes[name]) for name in names]
+    volume = np.broadcast_to(np.asarray(volume, dtype=np.float64), columns[0].shape)
+    bits = [int(column.max()).bit_length() if len(column) else 0 for column in columns]
+    if all(column.dtype.kind in 'iu' and column.min(initial=0) >= 0 for column in columns) and sum(bits) <= 63:
+        # Pack each row's quantities into one int64 key: a 1-D unique is
+        # far faster than np.unique(axis=0)
+        key = np.zeros(len(columns[0]), dtype=np.int64)
+        for column, width in zip(columns, bits):
+            key = (key << width) | column
+        _, first, inverse = np.unique(key, return_index=True, return_inverse=True)
+    else:
+        _, first, inverse = np.unique(np.stack(columns, axis=1), axis=0, return_index=True, return_inverse=True)
+    quantities = {name: column[first] for name, column in zip(names, columns)}
+    return quantities, np.bincount(inverse.ravel(), weights=volume, minlength=len(first))
+
+
+def project_cost_by_region(mixes, volume, book, as_of=None, chunk_rows=65536):
+    """
+    (regions, totals): sum of volume x cost per m³ over all rows, per
+    region. Pass the output of aggregate_mixes to re-cost a large schedule
+    in milliseconds; raw rows are costed in chunks of chunk_rows.
+    """
+    regions, _ = book.table(as_of)
+    rows = len(np.asarray(mixes['cement']))
+    volume = np.broadcast_to(np.asarray(volume, dtype=np.float64), (rows,))
+    totals = np.zeros(len(regions))
+    for start in range(0, rows, chunk_rows):
+        chunk = {name: np.asarray(values)[start:start + chunk_rows] for name, values in mixes.items() if name in MATERIALS}
+        totals += volume[start:start + chunk_rows] @ cost_by_region(chunk, book, as_of)[1]
+    return regions, totals
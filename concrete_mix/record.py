@@ -0,0 +1,160 @@
+"""
+Compact mix representations for hot paths and caches.
+
+MixRecord is one mix as six slotted fields (no per-instance dict, no label
+strings); MixColumns holds many mixes as one packed structured array, 14
+bytes per mix. Both turn into the calculate_mix display dict only when
+something is rendered (to_dict / to_frame); costing, charts, tip keys and
+hashing use the fields directly.
+"""
+
+import numpy as np
+
+from .core import COMPLIANT_LABEL, PRICES, REVIEW_LABEL, calculate_cost_batch
+
+# One packed mix: quantities as int16, w/c in hundredths, cost in whole ₹
+MIX_RECORD_DTYPE = np.dtype([
+    ('cement', '<i2'), ('water', '<i2'), ('sand', '<i2'), ('coarse_agg', '<i2'),
+    ('wc100', 'u1'), ('compliant', '?'), ('cost', '<i4'),
+])
+
+# Display keys of calculate_mix, in its order
+MIX_LABELS = {
+    'cement': 'Cement (kg/m³)',
+    'water': 'Water (L/m³)',
+    'sand': 'Fine Aggregate - Sand (kg/m³)',
+    'coarse_agg': 'Coarse Aggregate (kg/m³)',
+    'wc': 'Water-Cement Ratio (w/c)',
+    'compliant': 'IS Compliance',
+}
+
+
+class MixRecord:
+    """One designed mix: integer quantities per m³, w/c and the compliance flag."""
+
+    __slots__ = ('cement', 'water', 'sand', 'coarse_agg', 'wc', 'compliant')
+
+    def __init__(self, cement, water, sand, coarse_agg, wc, compliant):
+        self.cement = cement
+        self.water = water
+        self.sand = sand
+        self.coarse_agg = coarse_agg
+        self.wc = wc
+        self.compliant = compliant
+
+    @classmethod
+    def from_dict(cls, mix):
+        """From a calculate_mix display dict."""
+        return cls(
+            mix['Cement (kg/m³)'], mix['Water (L/m³)'], mix['Fine Aggregate - Sand (kg/m³)'],
+            mix['Coarse Aggregate (kg/m³)'], mix['Water-Cement Ratio (w/c)'], mix['IS Compliance'] == COMPLIANT_LABEL,
+        )
+
+    @classmethod
+    def from_row(cls, row):
+        """From one MIX_RECORD_DTYPE row (mix table or MixColumns)."""
+        return cls(
+            int(row['cement']), int(row['water']), int(row['sand']), int(row['coarse_agg']),
+            int(row['wc100']) / 100, bool(row['compliant']),
+        )
+
+    def _fields(self):
+        return (self.cement, self.water, self.sand, self.coarse_agg, self.wc, self.compliant)
+
+    def __eq__(self, other):
+        return isinstance(other, MixRecord) and self._fields() == other._fields()
+
+    def __hash__(self):
+        return hash(self._fields())
+
+    def __repr__(self):
+        return (f"MixRecord(cement={self.cement}, water={self.water}, sand={self.sand}, "
+                f"coarse_agg={self.coarse_agg}, wc={self.wc}, compliant={self.compliant})")
+
+    def quantities(self):
+        """Short-named quantities, as cost_by_region and the batch functions take them."""
+        return {'cement': self.cement, 'sand': self.sand, 'coarse_agg': self.coarse_agg, 'water': self.water}
+
+    def cost(self, prices=PRICES):
+        # Summed in PRICES order from 0, so it equals calculate_cost(self.to_dict(), prices)
+        return round(
+            0
+            + self.cement * prices['Cement (kg/m³)']
+            + self.sand * prices['Fine Aggregate - Sand (kg/m³)']
+            + self.coarse_agg * prices['Coarse Aggregate (kg/m³)']
+            + self.water * prices['Water (L/m³)'],
+            0,
+        )
+
+    def to_dict(self):
+        """The calculate_mix display dict, for rendering."""
+        return {
+            'Cement (kg/m³)': self.cement,
+            'Water (L/m³)': self.water,
+            'Fine Aggregate - Sand (kg/m³)': self.sand,
+            'Coarse Aggregate (kg/m³)': self.coarse_agg,
+            'Water-Cement Ratio (w/c)': self.wc,
+            'IS Compliance': COMPLIANT_LABEL if self.compliant else REVIEW_LABEL
+        }
+
+
+def _fitting(name, values):
+    # NumPy casts silently, so 40000 kg would wrap to a negative int16
+    values = np.asarray(values)
+    info = np.iinfo(MIX_RECORD_DTYPE[name])
+    if values.size and not (info.min <= values.min() and values.max() <= info.max):  # NaN fails both
+        bad = values[~((values >= info.min) & (values <= info.max))].flat[0]
+        raise ValueError(f"{name} {bad} does not fit a packed mix ({info.min} to {info.max})")
+    return values
+
+
+class MixColumns:
+    """Many mixes as one MIX_RECORD_DTYPE array; indexing yields MixRecord."""
+
+    __slots__ = ('data',)
+
+    def __init__(self, data):
+        if data.dtype != MIX_RECORD_DTYPE:
+            raise ValueError("MixColumns needs a MIX_RECORD_DTYPE array")
+        self.data = data
+
+    @classmethod
+    def from_batch(cls, mixes):
+        """
+        From calculate_mix_batch output (cost is computed if missing).
+        Raises ValueError if a value does not fit its packed field, e.g. a
+        quantity above 32767 or a cost above 2**31 - 1.
+        """
+        data = np.empty(len(mixes['cement']), dtype=MIX_RECORD_DTYPE)
+        for name in ('cement', 'water', 'sand', 'coarse_agg'):
+            data[name] = _fitting(name, mixes[name])
+        data['compliant'] = mixes['compliant']
+        data['wc100'] = _fitting('wc100', np.rint(np.asarray(mixes['wc']) * 100))
+        data['cost'] = _fitting('cost', mixes['cost'] if 'cost' in mixes else calculate_cost_batch(mixes))
+        return cls(data)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return MixRecord.from_row(self.data[index])
+        return MixColumns(self.data[index])
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes
+
+    def column(self, name):
+        """One column as an array; 'wc' is converted back from hundredths."""
+        if name == 'wc':
+            return self.data['wc100'] / 100
+        return self.data[name]
+
+    def to_frame(self):
+        """pandas DataFrame with calculate_mix display columns plus 'Cost (₹/m³)', for rendering."""
+        import pandas as pd
+        frame = pd.DataFrame({label: self.column(name) for name, label in MIX_LABELS.items()})
+        frame['IS Compliance'] = np.where(self.data['compliant'], COMPLIANT_LABEL, REVIEW_LABEL)
+        frame['Cost (₹/m³)'] = self.data['cost']
+        return frame
@@ -0,0 +1,52 @@
+"""
+Pour schedules as DataFrames: parsing of their numeric columns and the
+batch design behind `python -m concrete_mix design` and the streaming
+pipeline.
+
+A schedule needs a target_strength column (MPa); slump (mm) and
+max_agg_size (mm) are optional and default to 50 and 20 like
+calculate_mix. Values such as "M25" or "1,250" are read as numbers; a blank
+or unreadable value raises ValueError naming its row.
+"""
+
+import numpy as np
+
+from .core import calculate_mix_batch
+
+OUTPUT_COLUMNS = ['cement', 'water', 'sand', 'coarse_agg', 'wc', 'compliant', 'cost']
+
+
+def _numeric(df, name, default=None):
+    import pandas as pd
+    if name not in df.columns:
+        if default is None:
+            raise ValueError(f"schedule needs a '{name}' column")
+        return np.full(len(df), default, dtype=np.float64)
+    values = df[name]
+    if not pd.api.types.is_numeric_dtype(values):
+        # "M25", "25 MPa", "1,250": parse each distinct spelling once
+        codes, uniques = pd.factorize(values)
+        parsed = pd.Series(uniques).astype(str).str.replace(',', '', regex=False)
+        parsed = pd.to_numeric(parsed.str.extract(r'(-?\d+(?:\.\d+)?)', expand=False), errors='coerce').to_numpy()
+        values = np.where(codes >= 0, parsed[codes], np.nan)
+    values = pd.to_numeric(values, errors='coerce')
+    values = np.asarray(values, dtype=np.float64)
+    bad = np.flatnonzero(np.isnan(values))
+    if len(bad):
+        value = df[name].iloc[bad[0]]
+        problem = "is blank" if pd.isna(value) else f"{value!r} is not a number"
+        raise ValueError(f"row {bad[0] + 2}: {name} {problem} ({len(bad)} such rows)")
+    return values
+
+
+def design_schedule(df):
+    """Designed mix and cost columns appended to a schedule DataFrame."""
+    mixes = calculate_mix_batch(
+        _numeric(df, 'target_strength'),
+        _numeric(df, 'slump', 50),
+        _numeric(df, 'max_agg_size', 20),
+    )
+    out = df.copy()
+    for name in OUTPUT_COLUMNS:
+        out[name] = mixes[name]
+    return out
@@ -0,0 +1,51 @@
+"""
+Response surfaces for what-if views: every quantity over the strength x
+slump grid of the mix table, for one aggregate size.
+
+The quantity layers do not depend on prices, so they are sliced out of the
+precomputed table once; cost_layer recomputes only the cost from them when
+prices change. interpolate_surface answers points between grid nodes
+without running the formula: along strength it takes the next node up,
+which is exact because w/c is a step function that is constant on
+(k, k + 1]; along slump it interpolates linearly, matching the formula's
+linear water demand to within rounding (and the 300 kg cement floor's kink).
+"""
+
+import numpy as np
+
+from .core import PRICES, calculate_cost_batch
+from .table import MIX_TABLE_AGG_SIZES, MIX_TABLE_SLUMPS, MIX_TABLE_STRENGTHS, load_mix_table
+
+QUANTITY_LAYERS = ('cement', 'water', 'sand', 'coarse_agg')
+
+
+def quantity_surface(max_agg_size):
+    """{'strengths', 'slumps', 'cement', 'water', 'sand', 'coarse_agg', 'wc', 'compliant'}; layers are (strength, slump) arrays."""
+    if max_agg_size not in MIX_TABLE_AGG_SIZES:
+        raise ValueError(f"max_agg_size must be one of {MIX_TABLE_AGG_SIZES}")
+    strengths = np.arange(MIX_TABLE_STRENGTHS[0], MIX_TABLE_STRENGTHS[1] + 1)
+    slumps = np.arange(MIX_TABLE_SLUMPS[0], MIX_TABLE_SLUMPS[1] + 1)
+    rows = load_mix_table().reshape(len(strengths), len(slumps), len(MIX_TABLE_AGG_SIZES))
+    rows = np.array(rows[:, :, MIX_TABLE_AGG_SIZES.index(max_agg_size)])
+    surface = {'strengths': strengths, 'slumps': slumps}
+    for name in QUANTITY_LAYERS:
+        surface[name] = rows[name].astype(np.int64)
+    surface['wc'] = rows['wc100'] / 100
+    surface['compliant'] = rows['compliant']
+    return surface
+
+
+def cost_layer(surface, prices=None):
+    """Cost per m³ over the surface grid; prices overrides entries of PRICES."""
+    return calculate_cost_batch(surface, {**PRICES, **(prices or {})})
+
+
+def interpolate_surface(surface, layer, strength, slump):
+    """Value of a layer (an array over the surface grid) at off-grid strength / slump points."""
+    strengths, slumps = surface['strengths'], surface['slumps']
+    strength = np.clip(np.asarray(strength, dtype=np.float64), strengths[0], strengths[-1])
+    slump = np.clip(np.asarray(slump, dtype=np.float64), slumps[0], slumps[-1])
+    i = np.searchsorted(strengths, strength, side='left')
+    j = np.clip(np.searchsorted(slumps, slump, side='right') - 1, 0, len(slumps) - 2)
+    weight = (slump - slumps[j]) / (slumps[j + 1] - slumps[j])
+    return layer[i, j] * (1 - weight) + layer[i, j + 1] * weight
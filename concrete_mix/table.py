@@ -0,0 +1,145 @@
+"""
+Precomputed mix table: one packed row per discrete UI input combination
+(strength 15-60 MPa x slump 25-150 mm x aggregate 10/20/40 mm), built on
+first use and saved next to a key of the code that made it. A saved table
+is memory-mapped and reused while that key matches (and a strided sample of
+rows still matches calculate_mix); editing core.py, record.py, this module or
+the grid rebuilds it.
+
+Lookups read rows from a list of plain tuples made once per process, so a
+UI mix is an index and one MixRecord, faster than calculate_mix +
+calculate_cost. Inputs off the grid fall back to the formula.
+"""
+
+import hashlib
+import os
+import sys
+import threading
+
+import numpy as np
+
+from . import core, record
+from .core import calculate_cost, calculate_mix, calculate_mix_batch
+from .record import MIX_RECORD_DTYPE, MixColumns, MixRecord
+
+MIX_TABLE_PATH = os.environ.get(
+    "MIX_TABLE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "mix_table.npy")
+)
+MIX_TABLE_STRENGTHS = (15, 60)
+MIX_TABLE_SLUMPS = (25, 150)
+MIX_TABLE_AGG_SIZES = (10, 20, 40)
+MIX_TABLE_DTYPE = MIX_RECORD_DTYPE
+
+_mix_table = None
+_mix_rows = None
+_mix_table_lock = threading.Lock()
+
+
+def _mix_table_grid():
+    strengths = np.arange(MIX_TABLE_STRENGTHS[0], MIX_TABLE_STRENGTHS[1] + 1)
+    slumps = np.arange(MIX_TABLE_SLUMPS[0], MIX_TABLE_SLUMPS[1] + 1)
+    t, s, g = np.meshgrid(strengths, slumps, MIX_TABLE_AGG_SIZES, indexing='ij')
+    return t.ravel(), s.ravel(), g.ravel()
+
+
+def _mix_table_index(target_strength, slump, max_agg_size):
+    # Row index for on-grid inputs, None for anything the table does not cover
+    if max_agg_size not in MIX_TABLE_AGG_SIZES:
+        return None
+    if target_strength != int(target_strength) or slump != int(slump):
+        return None
+    t = int(target_strength) - MIX_TABLE_STRENGTHS[0]
+    s = int(slump) - MIX_TABLE_SLUMPS[0]
+    n_t = MIX_TABLE_STRENGTHS[1] - MIX_TABLE_STRENGTHS[0] + 1
+    n_s = MIX_TABLE_SLUMPS[1] - MIX_TABLE_SLUMPS[0] + 1
+    if not (0 <= t < n_t and 0 <= s < n_s):
+        return None
+    return (t * n_s + s) * len(MIX_TABLE_AGG_SIZES) + MIX_TABLE_AGG_SIZES.index(max_agg_size)
+
+
+def build_mix_table():
+    return MixColumns.from_batch(calculate_mix_batch(*_mix_table_grid())).data
+
+
+def mix_table_key():
+    """Hash of what a table depends on: the source of core.py, record.py and this module, the grid and the row dtype."""
+    digest = hashlib.sha256()
+    for module in (core, record, sys.modules[__name__]):
+        with open(module.__file__, 'rb') as f:
+            digest.update(f.read())
+    digest.update(repr((MIX_TABLE_STRENGTHS, MIX_TABLE_SLUMPS, MIX_TABLE_AGG_SIZES, MIX_TABLE_DTYPE.descr)).encode())
+    return digest.hexdigest()
+
+
+def validate_mix_table(table):
+    # Shape and dtype, plus a strided sample of rows against
+    # calculate_mix/calculate_cost themselves
+    grid = _mix_table_grid()
+    if table.dtype != MIX_TABLE_DTYPE or table.shape != grid[0].shape:
+        return False
+    for i in range(0, len(table), 97):
+        t, s, g = (int(a[i]) for a in grid)
+        mix = calculate_mix(t, s, g)
+        if MixRecord.from_row(table[i]).to_dict() != mix or float(table[i]['cost']) != calculate_cost(mix):
+            return False
+    return True
+
+
+def load_mix_table():
+    # Loaded (and checked) once per process; every session shares it
+    global _mix_table
+    with _mix_table_lock:
+        if _mix_table is None:
+            _mix_table = _open_mix_table()
+        return _mix_table
+
+
+def _open_mix_table():
+    key = mix_table_key()
+    key_path = MIX_TABLE_PATH + ".key"
+    try:
+        with open(key_path) as f:
+            saved_key = f.read().strip()
+        table = np.load(MIX_TABLE_PATH, mmap_mode='r')
+        if saved_key == key and validate_mix_table(table):
+            return table
+    except (OSError, ValueError):
+        pass
+    table = build_mix_table()
+    try:
+        for path, write in ((MIX_TABLE_PATH, lambda f: np.save(f, table)), (key_path, lambda f: f.write(key.encode()))):
+            with open(path + ".tmp", 'wb') as f:
+                write(f)
+            os.replace(path + ".tmp", path)
+        return np.load(MIX_TABLE_PATH, mmap_mode='r')
+    except (OSError, ValueError):
+        return table  # read-only deploy: serve the in-memory copy
+
+
+def _rows():
+    # The table as plain tuples: indexing a list and building a MixRecord
+    # from Python ints is several times cheaper than reading a numpy row
+    global _mix_rows
+    if _mix_rows is None:
+        rows = [
+            (MixRecord(cement, water, sand, coarse_agg, wc100 / 100, compliant), float(cost))
+            for cement, water, sand, coarse_agg, wc100, compliant, cost in load_mix_table().tolist()
+        ]
+        with _mix_table_lock:
+            if _mix_rows is None:
+                _mix_rows = rows
+    return _mix_rows
+
+
+def lookup_record(target_strength, slump=50, max_agg_size=20):
+    # (MixRecord, cost): what the app keeps in session state and caches
+    idx = _mix_table_index(target_strength, slump, max_agg_size)
+    if idx is None:
+        mix = calculate_mix(target_strength, slump, max_agg_size)
+        return MixRecord.from_dict(mix), calculate_cost(mix)
+    return _rows()[idx]
+
+
+def lookup_mix(target_strength, slump=50, max_agg_size=20):
+    record, cost = lookup_record(target_strength, slump, max_agg_size)
+    return record.to_dict(), cost
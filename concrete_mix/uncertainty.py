@@ -0,0 +1,155 @@
+"""
+Monte Carlo uncertainty for one designed mix: material densities, entrapped
+air, batching errors on cement and water, and unit prices are drawn around
+their nominal values and pushed through the mix formula in chunks.
+
+Each quantity goes into a StreamingHistogram as it is produced, so memory
+stays at one chunk plus a few thousand bins whatever the sample count, and
+percentiles come from the merged histogram. Non-compliance is judged on the
+as-batched water/cement ratio and cement content of every sample.
+"""
+
+import numpy as np
+
+from .core import AIR_CONTENT, DENSITIES, PRICES, design_wc, is_compliant, water_demand
+
+# Standard deviation of each input as a fraction of its nominal value
+DEFAULT_SPREAD = {
+    'cement_density': 0.01,
+    'water_density': 0.002,
+    'sand_density': 0.03,
+    'coarse_agg_density': 0.05,
+    'air': 0.25,              # 2% ± 0.5% entrapped air
+    'cement_batching': 0.01,  # weigh-batching error on cement
+    'water_batching': 0.02,   # and on water (incl. aggregate moisture)
+    'price': 0.08,            # every unit price
+}
+
+SIMULATED_QUANTITIES = ('cement', 'water', 'sand', 'coarse_agg', 'wc', 'cost')
+DEFAULT_PERCENTILES = (5, 50, 95)
+DEFAULT_CHUNK_SIZE = 250_000
+
+
+class StreamingHistogram:
+    """
+    Fixed-bin histogram over [low, high) that values are added to chunk by
+    chunk; out-of-range values are counted at the edges. Percentiles are
+    interpolated within a bin, so they are exact to (high - low) / bins.
+    """
+
+    def __init__(self, low, high, bins=4096):
+        self.edges = np.linspace(low, high, bins + 1)
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.below = self.above = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values):
+        self.counts += np.histogram(values, self.edges)[0]
+        self.below += int(np.count_nonzero(values < self.edges[0]))
+        self.above += int(np.count_nonzero(values >= self.edges[-1]))
+        self.count += len(values)
+        self.total += float(values.sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else float('nan')
+
+    def percentile(self, q):
+        rank = q / 100 * self.count
+        if rank <= self.below:
+            return self.min
+        cumulative = self.below + np.cumsum(self.counts)
+        i = int(np.searchsorted(cumulative, rank))
+        if i >= len(self.counts):
+            return self.max
+        before = cumulative[i] - self.counts[i]
+        fraction = (rank - before) / self.counts[i]
+        return float(self.edges[i] + fraction * (self.edges[i + 1] - self.edges[i]))
+
+    def coarsen(self, bins):
+        """(edges, counts) regrouped to about `bins` bins, for charts."""
+        step = max(1, len(self.counts) // bins)
+        usable = len(self.counts) // step * step
+        return self.edges[:usable + 1:step], self.counts[:usable].reshape(-1, step).sum(axis=1)
+
+
+def _nominal_mix(target_strength, slump, max_agg_size):
+    # Unrounded cement and water, as calculate_mix computes them
+    wc = design_wc(target_strength)
+    water = water_demand(slump, max_agg_size)
+    return max(water / wc, 300), water
+
+
+def _sample(rng, nominal, spread, n):
+    return nominal * (1 + spread * rng.standard_normal(n))
+
+
+def _simulate_chunk(rng, cement, water, prices, spread, n):
+    cement = _sample(rng, cement, spread['cement_batching'], n)
+    water = _sample(rng, water, spread['water_batching'], n)
+    air = np.maximum(_sample(rng, AIR_CONTENT, spread['air'], n), 0)
+    total_vol = 1 - (cement / _sample(rng, DENSITIES['cement'], spread['cement_density'], n)
+                     + water / _sample(rng, DENSITIES['water'], spread['water_density'], n) + air)
+    sand = total_vol * 0.4 * _sample(rng, DENSITIES['sand'], spread['sand_density'], n)
+    coarse_agg = total_vol * 0.6 * _sample(rng, DENSITIES['coarse_agg'], spread['coarse_agg_density'], n)
+    cost = (
+        cement * _sample(rng, prices['Cement (kg/m³)'], spread['price'], n)
+        + sand * _sample(rng, prices['Fine Aggregate - Sand (kg/m³)'], spread['price'], n)
+        + coarse_agg * _sample(rng, prices['Coarse Aggregate (kg/m³)'], spread['price'], n)
+        + water * _sample(rng, prices['Water (L/m³)'], spread['price'], n)
+    )
+    wc = water / cement
+    return {'cement': cement, 'water': water, 'sand': sand, 'coarse_agg': coarse_agg, 'wc': wc, 'cost': cost}
+
+
+def simulate_mix(target_strength, slump=50, max_agg_size=20, samples=1_000_000, volume=1.0,
+                 spread=None, prices=None, chunk_size=DEFAULT_CHUNK_SIZE, percentiles=DEFAULT_PERCENTILES, seed=0):
+    """
+    Draw `samples` batches of the mix calculate_mix designs for these
+    inputs. spread and prices override DEFAULT_SPREAD / PRICES entries.
+    Returns a dict: 'samples', 'p_noncompliant', 'percentiles'
+    ({quantity: {p: value}} per m³, plus 'project_cost' for `volume` m³),
+    'mean' ({quantity: value}) and 'histograms' ({quantity: StreamingHistogram}).
+    Project cost scales the per-m³ cost, i.e. prices and batching are
+    treated as shared by the whole pour, which gives the wider band.
+    """
+    if samples < 1:
+        raise ValueError("samples must be at least 1")
+    spread = {**DEFAULT_SPREAD, **(spread or {})}
+    prices = {**PRICES, **(prices or {})}
+    rng = np.random.default_rng(seed)
+    cement, water = _nominal_mix(target_strength, slump, max_agg_size)
+
+    histograms = None
+    noncompliant = 0
+    done = 0
+    while done < samples:
+        n = min(chunk_size, samples - done)
+        chunk = _simulate_chunk(rng, cement, water, prices, spread, n)
+        if histograms is None:
+            # Bins span 8 standard deviations either side of the first chunk
+            histograms = {}
+            for name, values in chunk.items():
+                centre, width = float(values.mean()), 8 * float(values.std()) or 1.0
+                histograms[name] = StreamingHistogram(centre - width, centre + width)
+        for name, values in chunk.items():
+            histograms[name].update(values)
+        noncompliant += n - int(np.count_nonzero(is_compliant(chunk['wc'], chunk['cement'])))
+        done += n
+
+    result_percentiles = {
+        name: {p: histograms[name].percentile(p) for p in percentiles} for name in SIMULATED_QUANTITIES
+    }
+    result_percentiles['project_cost'] = {p: value * volume for p, value in result_percentiles['cost'].items()}
+    return {
+        'samples': samples,
+        'p_noncompliant': noncompliant / samples,
+        'percentiles': result_percentiles,
+        'mean': {name: histograms[name].mean for name in SIMULATED_QUANTITIES},
+        'histograms': histograms,
+    }
@@ -0,0 +1,196 @@
+"""
+Stage timing for app.py reruns.
+
+Each script run, and each fragment rerun, creates a Rerun labelled with its
+scope ("app" for a full run, the fragment's name otherwise);
+`with rerun.span("stage"):` times a stage, rerun.add_bytes("stage", n) counts
+bytes sent to the browser (e.g. chart specs), and finish() folds both into
+process-wide histograms / totals. A rerun that is not instrumented hands
+out one shared no-op context manager, so the disabled cost is a method call
+per stage.
+
+Export (any of these also turns instrumentation on for every rerun):
+- PERF_LOG=1: one JSON log line per rerun on stderr (logger "perf")
+- PERF_METRICS_FILE=path: Prometheus text file, rewritten after each rerun
+- PERF_METRICS_PORT=9464: Prometheus endpoint at http://host:port/metrics
+
+Other process-wide components (the result cache) add their own series with
+add_metrics(fn), fn returning Prometheus text.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PERF_LOG = os.environ.get("PERF_LOG", "") not in ("", "0")
+PERF_METRICS_FILE = os.environ.get("PERF_METRICS_FILE", "")
+PERF_METRICS_PORT = int(os.environ.get("PERF_METRICS_PORT", 0))
+EXPORT_ENABLED = bool(PERF_LOG or PERF_METRICS_FILE or PERF_METRICS_PORT)
+
+# Histogram bucket upper bounds, seconds
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+logger = logging.getLogger("perf")
+if PERF_LOG and not logger.handlers:
+    logger.addHandler(logging.StreamHandler())
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+_NO_SPAN = nullcontext()
+
+
+class _Histograms:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages = {}  # (scope, stage) -> [bucket counts..., sum, count]
+        self._payload = {}  # (scope, stage) -> [bytes sum, count]
+
+    def observe_bytes(self, scope, stage, nbytes):
+        with self._lock:
+            row = self._payload.setdefault((scope, stage), [0, 0])
+            row[0] += nbytes
+            row[1] += 1
+
+    def observe(self, scope, stage, seconds):
+        with self._lock:
+            row = self._stages.setdefault((scope, stage), [0] * len(BUCKETS) + [0.0, 0])
+            for i, bound in enumerate(BUCKETS):
+                if seconds <= bound:
+                    row[i] += 1
+            row[-2] += seconds
+            row[-1] += 1
+
+    def prometheus_text(self):
+        lines = [
+            "# HELP app_stage_seconds Time spent in each app.py stage per rerun.",
+            "# TYPE app_stage_seconds histogram",
+        ]
+        with self._lock:
+            stages = {stage: list(row) for stage, row in self._stages.items()}
+            payload = {stage: list(row) for stage, row in self._payload.items()}
+        for (scope, stage), row in sorted(stages.items()):
+            labels = f'scope="{scope}",stage="{stage}"'
+            for bound, count in zip(BUCKETS, row):
+                lines.append(f'app_stage_seconds_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'app_stage_seconds_bucket{{{labels},le="+Inf"}} {row[-1]}')
+            lines.append(f'app_stage_seconds_sum{{{labels}}} {row[-2]:.6f}')
+            lines.append(f'app_stage_seconds_count{{{labels}}} {row[-1]}')
+        if payload:
+            lines += [
+                "# HELP app_payload_bytes Bytes sent to the browser per app.py stage and rerun.",
+                "# TYPE app_payload_bytes summary",
+            ]
+            for (scope, stage), (total, count) in sorted(payload.items()):
+                labels = f'scope="{scope}",stage="{stage}"'
+                lines.append(f'app_payload_bytes_sum{{{labels}}} {total}')
+                lines.append(f'app_payload_bytes_count{{{labels}}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+histograms = _Histograms()
+_extra_metrics = []
+
+
+def add_metrics(fn):
+    """Appends fn()'s Prometheus text to every export; registering fn twice is a no-op."""
+    if fn not in _extra_metrics:
+        _extra_metrics.append(fn)
+
+
+def prometheus_text():
+    return histograms.prometheus_text() + "".join(fn() for fn in list(_extra_metrics))
+
+
+class _Span:
+    __slots__ = ("rerun", "stage", "start")
+
+    def __init__(self, rerun, stage):
+        self.rerun = rerun
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        stages = self.rerun.stages
+        stages[self.stage] = stages.get(self.stage, 0.0) + time.perf_counter() - self.start
+
+
+class Rerun:
+    """Stage timings of one script run; a stage entered twice accumulates."""
+
+    def __init__(self, enabled, scope="app"):
+        self.enabled = enabled
+        self.scope = scope
+        self.stages = {}
+        self.payload = {}
+        self.start = time.perf_counter()
+
+    def span(self, stage):
+        return _Span(self, stage) if self.enabled else _NO_SPAN
+
+    def add_bytes(self, stage, nbytes):
+        self.payload[stage] = self.payload.get(stage, 0) + nbytes
+
+    def finish(self):
+        if not self.enabled:
+            return
+        self.stages["total"] = time.perf_counter() - self.start
+        for stage, seconds in self.stages.items():
+            histograms.observe(self.scope, stage, seconds)
+        for stage, nbytes in self.payload.items():
+            histograms.observe_bytes(self.scope, stage, nbytes)
+        if PERF_LOG:
+            logger.info(json.dumps({
+                "event": "rerun",
+                "scope": self.scope,
+                "stages_ms": {stage: round(seconds * 1000, 3) for stage, seconds in self.stages.items()},
+                "payload_bytes": self.payload,
+            }))
+        if PERF_METRICS_FILE:
+            write_prometheus(PERF_METRICS_FILE)
+
+
+def start_rerun(enabled=False, scope="app"):
+    return Rerun(enabled or EXPORT_ENABLED, scope)
+
+
+def write_prometheus(path):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        f.write(prometheus_text())
+    os.replace(tmp, path)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path != "/metrics":
+            self.send_error(404)
+            return
+        body = prometheus_text().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server_lock = threading.Lock()
+_server = None
+
+
+def serve_metrics(port=PERF_METRICS_PORT):
+    """Starts the /metrics endpoint once per process; no-op without a port."""
+    global _server
+    with _server_lock:
+        if _server is None and port:
+            _server = ThreadingHTTPServer(("0.0.0.0", port), _MetricsHandler)
+            threading.Thread(target=_server.serve_forever, name="perf-metrics", daemon=True).start()
+    return _server
@@ -0,0 +1,177 @@
+"""
+Process-wide result cache for app.py: designed mixes, rendered tables, chart
+figures, simulations and response surfaces, shared by every session and
+bounded by an estimate of the bytes its entries hold
+(RESULT_CACHE_MAX_BYTES); the least recently used entries are evicted first.
+
+Entries are keyed by (kind, normalized inputs), so 25 and 25.0 MPa, or a
+numpy and a Python int, share one entry. Concurrent misses on one key are
+merged: the first caller computes, the others wait for its result. Hit,
+miss and eviction counters per kind are shown in the sidebar performance
+panel and exported with perf's Prometheus metrics.
+
+Nothing here imports Streamlit.
+"""
+
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+RESULT_CACHE_MAX_BYTES = int(os.environ.get("RESULT_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+# Plotly figure objects hold about this many times their JSON size
+# (tracemalloc, light and dark px figures: 16-18x)
+FIGURE_FOOTPRINT = 18
+
+
+def normalize(value):
+    """Hashable, type-stable form of a cache key part."""
+    if isinstance(value, (tuple, list)):
+        return tuple(normalize(v) for v in value)
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if hasattr(value, "item") and getattr(value, "ndim", None) == 0:
+        value = value.item()  # numpy scalar
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def estimate_nbytes(value):
+    """Approximate memory held by a cached value."""
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(estimate_nbytes(v) for v in value)
+    if isinstance(value, dict):  # simulation results, surfaces
+        return sys.getsizeof(value) + sum(estimate_nbytes(k) + estimate_nbytes(v) for k, v in value.items())
+    if hasattr(value, "memory_usage"):  # pandas
+        return int(value.memory_usage(deep=True).sum())
+    if hasattr(value, "nbytes"):  # numpy, MixColumns
+        return int(value.nbytes)
+    if hasattr(value, "to_plotly_json"):  # plotly figure
+        return len(value.to_json(validate=False)) * FIGURE_FOOTPRINT
+    if hasattr(value, "__slots__"):  # MixRecord
+        return sys.getsizeof(value) + sum(sys.getsizeof(getattr(value, name)) for name in value.__slots__)
+    if hasattr(value, "__dict__") and not isinstance(value, type):  # StreamingHistogram
+        return sys.getsizeof(value) + estimate_nbytes(vars(value))
+    return sys.getsizeof(value)
+
+
+class _Pending:
+    __slots__ = ("done", "value", "failed")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.failed = False
+
+
+class ResultCache:
+    """In-memory LRU cache with a byte budget and per-kind hit/miss/eviction counters."""
+
+    def __init__(self, max_bytes=RESULT_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # (kind, key) -> (value, nbytes)
+        self._pending = {}
+        self._counts = {}  # kind -> [hits, misses, evictions]
+
+    def _count(self, kind, column):
+        self._counts.setdefault(kind, [0, 0, 0])[column] += 1
+
+    def get(self, kind, key, compute, sizeof=estimate_nbytes):
+        """Cached value for (kind, key), computing and storing it on a miss."""
+        key = (kind, normalize(key))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._count(kind, 0)
+                return entry[0]
+            pending = self._pending.get(key)
+            leader = pending is None
+            if leader:
+                pending = self._pending[key] = _Pending()
+                self._count(kind, 1)
+            else:
+                self._count(kind, 0)
+        if not leader:
+            pending.done.wait()
+            if not pending.failed:
+                return pending.value
+            return compute()
+        try:
+            value = compute()
+        except BaseException:
+            pending.failed = True
+            raise
+        else:
+            pending.value = value
+            self._put(key, value, sizeof(value))
+            return value
+        finally:
+            with self._lock:
+                del self._pending[key]
+            pending.done.set()
+
+    def _put(self, key, value, nbytes):
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            self._entries[key] = (value, nbytes)
+            self.bytes += nbytes
+            while self.bytes > self.max_bytes:
+                (kind, _), (_, size) = self._entries.popitem(last=False)
+                self.bytes -= size
+                self._count(kind, 2)
+
+    def clear(self, kind=None):
+        """Drops every entry, or only those of one kind."""
+        with self._lock:
+            for key in [key for key in self._entries if kind is None or key[0] == kind]:
+                self.bytes -= self._entries.pop(key)[1]
+
+    def stats(self):
+        """{'hits', 'misses', 'evictions', 'hit_rate', 'entries', 'bytes', 'max_bytes', 'kinds': {kind: {...}}}."""
+        with self._lock:
+            counts = {kind: list(row) for kind, row in self._counts.items()}
+            entries, size = len(self._entries), self.bytes
+        kinds = {
+            kind: {"hits": h, "misses": m, "evictions": e, "hit_rate": h / (h + m) if h + m else 0.0}
+            for kind, (h, m, e) in sorted(counts.items())
+        }
+        hits = sum(row["hits"] for row in kinds.values())
+        misses = sum(row["misses"] for row in kinds.values())
+        return {
+            "hits": hits,
+            "misses": misses,
+            "evictions": sum(row["evictions"] for row in kinds.values()),
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "kinds": kinds,
+        }
+
+    def prometheus_text(self):
+        stats = self.stats()
+        lines = []
+        for name, help_text in (("hits", "Result cache hits."), ("misses", "Result cache misses."),
+                                ("evictions", "Result cache LRU evictions.")):
+            lines.append(f"# HELP app_result_cache_{name}_total {help_text}")
+            lines.append(f"# TYPE app_result_cache_{name}_total counter")
+            for kind, row in stats["kinds"].items():
+                lines.append(f'app_result_cache_{name}_total{{kind="{kind}"}} {row[name]}')
+        lines += [
+            "# HELP app_result_cache_bytes Estimated bytes held by the result cache.",
+            "# TYPE app_result_cache_bytes gauge",
+            f"app_result_cache_bytes {stats['bytes']}",
+            "# HELP app_result_cache_max_bytes Result cache byte budget.",
+            "# TYPE app_result_cache_max_bytes gauge",
+            f"app_result_cache_max_bytes {stats['max_bytes']}",
+        ]
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,89 @@
+"""
+TipCache LRU eviction and GeminiClient coalescing, retry and backoff,
+against the offline FakeTipModel.
+
+Run from the repo root:  python -m pytest -q
+"""
+
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ai_tips  # noqa: E402
+from ai_tips import FakeTipModel, GeminiClient, QuotaExceeded, TipCache, request_tip  # noqa: E402
+from concrete_mix import lookup_record  # noqa: E402
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # A strictly increasing last_used, so LRU order never rests on a tie
+    ticks = itertools.count(1)
+    monkeypatch.setattr(ai_tips, "time", SimpleNamespace(time=lambda: float(next(ticks))))
+
+
+def test_tip_cache_evicts_least_recently_used(tmp_path, clock):
+    cache = TipCache(str(tmp_path / "tips.sqlite3"), max_bytes=30)
+    cache.put("a", "x" * 10)
+    cache.put("b", "y" * 10)
+    cache.put("c", "z" * 10)
+    assert cache.get("a") == "x" * 10  # 'b' is now the least recently used
+    cache.put("d", "w" * 10)
+
+    assert cache.get("b") is None
+    assert [cache.get(key) is not None for key in "acd"] == [True, True, True]
+    stats = cache.stats()
+    assert (stats["entries"], stats["bytes"], stats["evictions"]) == (3, 30, 1)
+    assert (stats["hits"], stats["misses"]) == (4, 1)
+
+
+def test_tip_cache_skips_tips_larger_than_the_budget(tmp_path):
+    cache = TipCache(str(tmp_path / "tips.sqlite3"), max_bytes=30)
+    cache.put("a", "x" * 31)
+    assert cache.get("a") is None and cache.stats()["entries"] == 0
+
+
+def test_identical_prompts_share_one_call():
+    model = FakeTipModel(latency=0.2, chunk_delay=0)
+    client = GeminiClient(model, rpm=1000)
+    with ThreadPoolExecutor(8) as pool:
+        tips = list(pool.map(lambda _: client.generate("same prompt"), range(8)))
+    assert tips == [model.text] * 8
+    assert model.calls == 1
+    assert client.stats()["coalesced"] == 7
+    client.generate("another prompt")
+    assert model.calls == 2
+
+
+def test_quota_errors_back_off_and_retry():
+    model = FakeTipModel(latency=0, chunk_delay=0, quota_errors=2)
+    client = GeminiClient(model, rpm=1000, backoff_base=0.01)
+    start = time.monotonic()
+    assert client.generate("prompt") == model.text
+    assert time.monotonic() - start >= 0.01 + 0.02  # paused 1x then 2x the base
+    stats = client.stats()
+    assert (model.calls, stats["retries"], stats["quota_errors"], stats["requests"]) == (3, 2, 2, 3)
+
+
+def test_quota_errors_past_max_retries_reach_the_caller():
+    model = FakeTipModel(latency=0, chunk_delay=0, quota_errors=5)
+    client = GeminiClient(model, rpm=1000, max_retries=2, backoff_base=0.01)
+    with pytest.raises(QuotaExceeded):
+        client.generate("prompt")
+    assert model.calls == 3
+    assert client.stats()["in_flight"] == 0
+
+
+def test_request_tip_fills_the_cache(tmp_path):
+    model = FakeTipModel(latency=0, chunk_delay=0)
+    client, cache = GeminiClient(model, rpm=1000), TipCache(str(tmp_path / "tips.sqlite3"))
+    mix = lookup_record(25)[0]
+    assert "".join(request_tip(client, cache, mix, 25, "fake")) == model.text
+    assert request_tip(client, cache, mix, 25, "fake") == [model.text]
+    assert model.calls == 1
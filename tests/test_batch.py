@@ -0,0 +1,79 @@
+"""
+calculate_mix_batch / calculate_cost_batch against the scalar
+calculate_mix / calculate_cost, row by row.
+
+Run from the repo root:  python -m pytest -q
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from concrete_mix import (  # noqa: E402
+    COMPLIANT_LABEL,
+    PRICES,
+    calculate_cost,
+    calculate_cost_batch,
+    calculate_mix,
+    calculate_mix_batch,
+)
+from concrete_mix.table import MIX_TABLE_AGG_SIZES, MIX_TABLE_SLUMPS, MIX_TABLE_STRENGTHS  # noqa: E402
+
+# Batch column of each calculate_mix key
+COLUMNS = {
+    'Cement (kg/m³)': 'cement',
+    'Water (L/m³)': 'water',
+    'Fine Aggregate - Sand (kg/m³)': 'sand',
+    'Coarse Aggregate (kg/m³)': 'coarse_agg',
+    'Water-Cement Ratio (w/c)': 'wc',
+}
+
+
+def assert_rows_match(strengths, slumps, agg_sizes, prices=PRICES):
+    mixes = calculate_mix_batch(strengths, slumps, agg_sizes)
+    costs = calculate_cost_batch(mixes, prices)
+    for i, inputs in enumerate(zip(strengths, slumps, agg_sizes)):
+        mix = calculate_mix(*(float(value) for value in inputs))
+        row = {key: mixes[name][i] for key, name in COLUMNS.items()}
+        assert row == {key: mix[key] for key in COLUMNS}, inputs
+        assert bool(mixes['compliant'][i]) == (mix['IS Compliance'] == COMPLIANT_LABEL), inputs
+        assert costs[i] == calculate_cost(mix, prices), inputs
+
+
+def test_ui_grid():
+    # Every input the design form can submit: whole MPa, whole mm of slump
+    strengths, slumps, agg_sizes = np.meshgrid(
+        np.arange(MIX_TABLE_STRENGTHS[0], MIX_TABLE_STRENGTHS[1] + 1),
+        np.arange(MIX_TABLE_SLUMPS[0], MIX_TABLE_SLUMPS[1] + 1),
+        MIX_TABLE_AGG_SIZES,
+        indexing='ij',
+    )
+    assert_rows_match(strengths.ravel(), slumps.ravel(), agg_sizes.ravel())
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_off_grid(seed):
+    # Fractional strengths and slumps from schedules, bracket edges and
+    # aggregate sizes the water rule has no adjustment for
+    rng = np.random.default_rng(seed)
+    n = 2000
+    strengths = np.concatenate([rng.uniform(5, 80, n), [20, 30, 40, 20.000001, 29.999999]])
+    slumps = np.concatenate([rng.uniform(0, 250, n), [0, 50, 50.5, 150, 250]])
+    agg_sizes = np.concatenate([rng.choice([10, 12.5, 20, 25, 40, 63], n), [10, 20, 40, 12.5, 63]])
+    assert_rows_match(strengths, slumps, agg_sizes)
+
+
+def test_regional_prices():
+    prices = {key: price * 1.137 for key, price in PRICES.items()}
+    rng = np.random.default_rng(7)
+    assert_rows_match(rng.uniform(15, 60, 500), rng.uniform(25, 150, 500), rng.choice([10, 20, 40], 500), prices)
+
+
+def test_scalar_broadcast():
+    mixes = calculate_mix_batch(np.arange(15, 61), 75, 20)
+    assert mixes['cement'].shape == (46,)
+    assert (mixes['water'] == calculate_mix(15, 75, 20)['Water (L/m³)']).all()
@@ -0,0 +1,62 @@
+"""
+solve_blend against a brute-force search over calculate_blend_mix /
+calculate_cost, blend by blend.
+
+Run from the repo root:  python -m pytest -q
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from concrete_mix import COMPLIANT_LABEL, EXPOSURE_LIMITS, PRICES, calculate_cost, solve_blend  # noqa: E402
+from concrete_mix.blend import blend_grid, calculate_blend_mix  # noqa: E402
+
+POINTS = [(15, 25, 10), (25, 50, 20), (30, 75, 20), (40, 100, 40), (50, 150, 10), (60, 125, 20)]
+
+
+def brute_force(strength, slump, agg, prices, exposure):
+    max_wc, min_cement = EXPOSURE_LIMITS[exposure]
+    best = None
+    for fly_ash, ggbs in zip(*blend_grid()):
+        mix = calculate_blend_mix(strength, slump, agg, fly_ash, ggbs)
+        binder = mix['Cement (kg/m³)'] + mix['Fly Ash (kg/m³)'] + mix['GGBS (kg/m³)']
+        if mix['IS Compliance'] != COMPLIANT_LABEL or mix['Water-Cement Ratio (w/c)'] > max_wc or binder < min_cement:
+            continue
+        cost = calculate_cost(mix, prices)
+        if best is None or cost < best[0]:
+            best = (cost, fly_ash * 100, ggbs * 100)
+    return best
+
+
+@pytest.mark.parametrize('prices', [
+    {},
+    {'Cement (kg/m³)': 6.2, 'GGBS (kg/m³)': 4.4},
+    {'Cement (kg/m³)': 3.0, 'Fly Ash (kg/m³)': 5.0, 'GGBS (kg/m³)': 6.0},
+])
+@pytest.mark.parametrize('exposure', ['Mild', 'Severe'])
+def test_picks_the_cheapest_compliant_blend(prices, exposure):
+    t, s, g = (np.array(column) for column in zip(*POINTS))
+    solution = solve_blend(t, s, g, prices, exposure=exposure)
+    for i, point in enumerate(POINTS):
+        expected = brute_force(*point, {**PRICES, **prices}, exposure)
+        assert solution['feasible'][i] == (expected is not None)
+        if expected is None:
+            # No blend complies: the row holds the plain OPC mix
+            expected = (solution['opc_cost'][i], 0, 0)
+        assert solution['cost'][i] == pytest.approx(expected[0])
+        assert (solution['fly_ash_pct'][i], solution['ggbs_pct'][i]) == pytest.approx(expected[1:])
+
+
+def test_opc_cost_is_the_unblended_mix():
+    solution = solve_blend(30, 75, 20)
+    assert solution['opc_cost'][0] == pytest.approx(calculate_cost(calculate_blend_mix(30, 75, 20)))
+
+
+def test_unknown_exposure_raises():
+    with pytest.raises(ValueError, match="unknown exposure"):
+        solve_blend(30, exposure='Coastal')
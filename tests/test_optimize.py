@@ -0,0 +1,63 @@
+"""
+optimize_mix / pareto_front against an unpruned search of every design
+strength and a pairwise dominance check.
+
+Run from the repo root:  python -m pytest -q
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from concrete_mix import EXPOSURE_LIMITS, calculate_mix_batch, optimize_mix, pareto_front  # noqa: E402
+
+
+def dominated(cost, slump, i):
+    return np.any((cost <= cost[i]) & (slump >= slump[i]) & ((cost < cost[i]) | (slump > slump[i])))
+
+
+def test_pareto_front_is_every_undominated_point():
+    rng = np.random.default_rng(0)
+    cost, slump = rng.integers(0, 40, 300).astype(float), rng.integers(25, 151, 300).astype(float)
+    front = pareto_front(cost, slump)
+    assert list(cost[front]) == sorted(cost[front])
+    assert not any(dominated(cost, slump, i) for i in front)
+    # Points tied on both cost and slump are kept once
+    kept = {(cost[i], slump[i]) for i in front}
+    assert len(kept) == len(front)
+    assert kept == {(cost[i], slump[i]) for i in range(300) if not dominated(cost, slump, i)}
+
+
+@pytest.mark.parametrize('grade, exposure', [(20, 'Mild'), (25, 'Moderate'), (32, 'Severe'), (45, 'Extreme')])
+def test_pruned_search_matches_every_strength(grade, exposure):
+    result = optimize_mix(grade, exposure, slump_range=(25, 150), agg_sizes=(10, 20, 40))
+
+    # Unpruned: every whole MPa from the grade to 60
+    t, s, g = (a.ravel() for a in np.meshgrid(np.arange(grade, 61), np.arange(25, 151), [10, 20, 40], indexing='ij'))
+    mixes = calculate_mix_batch(t, s, g)
+    max_wc, min_cement = EXPOSURE_LIMITS[exposure]
+    feasible = mixes['compliant'] & (mixes['wc'] <= max_wc) & (mixes['cement'] >= min_cement)
+    assert result['feasible'] > 0
+
+    # Strengths inside one w/c bracket give the same mix: compare distinct mixes
+    distinct = np.unique(np.column_stack([mixes['cost'], s, g])[feasible], axis=0)
+    top = len(result['cheapest']['cost'])
+    np.testing.assert_array_equal(result['cheapest']['cost'], np.sort(distinct[:, 0])[:top])
+
+    front = pareto_front(mixes['cost'][feasible], s[feasible])
+    np.testing.assert_array_equal(result['pareto']['cost'], mixes['cost'][feasible][front])
+    np.testing.assert_array_equal(result['pareto']['slump'], s[feasible][front])
+    assert np.all(result['pareto']['target_strength'] >= grade)
+
+
+def test_bad_arguments_raise():
+    with pytest.raises(ValueError, match="unknown exposure"):
+        optimize_mix(25, 'Coastal')
+    with pytest.raises(ValueError, match="slump_range"):
+        optimize_mix(25, slump_range=(100, 50))
+    with pytest.raises(ValueError, match="agg_sizes"):
+        optimize_mix(25, agg_sizes=())
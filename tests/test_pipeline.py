@@ -0,0 +1,97 @@
+"""
+Streaming pipeline: chunks read with one set of dtypes, resume checks.
+
+Run from the repo root:  python -m pytest -q
+"""
+
+import json
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from concrete_mix.pipeline import run_pipeline  # noqa: E402
+
+CHUNK_BYTES = 4096  # a few hundred rows per chunk
+
+
+def write_schedule(path, rows=2000):
+    # crew is blank in the first half, bay in the second, and flag switches
+    # from text to numbers: each chunk alone would infer a different type
+    half = rows // 2
+    pd.DataFrame({
+        'element': range(rows),
+        'target_strength': 25,
+        'slump': [50] * half + [75] * (rows - half),
+        'crew': [''] * half + [str(i) for i in range(rows - half)],
+        'bay': [str(i) for i in range(half)] + [''] * (rows - half),
+        'flag': ['x'] * half + ['1'] * (rows - half),
+    }).to_csv(path, index=False)
+
+
+def test_csv_output_formats_columns_alike(tmp_path):
+    schedule, output = tmp_path / "schedule.csv", tmp_path / "mixes.csv"
+    write_schedule(schedule)
+    stats = run_pipeline(str(schedule), str(output), workers=2, chunk_bytes=CHUNK_BYTES)
+    assert stats['chunks'] > 4
+    text = pd.read_csv(output, dtype=str, keep_default_na=False)
+    assert len(text) == 2000
+    for column in ('element', 'slump', 'crew', 'bay'):
+        assert not text[column].str.contains(r'\.').any(), column
+
+
+def test_parquet_parts_share_one_schema(tmp_path):
+    import pyarrow.parquet as pq
+    schedule, output = tmp_path / "schedule.csv", tmp_path / "mixes.parquet"
+    write_schedule(schedule)
+    run_pipeline(str(schedule), str(output), workers=2, chunk_bytes=CHUNK_BYTES)
+    schemas = {pq.read_schema(path) for path in sorted(output.iterdir())}
+    assert len(schemas) == 1
+    out = pd.read_parquet(output)
+    assert len(out) == 2000 and out['element'].is_monotonic_increasing
+
+
+def test_resume_without_output_is_a_value_error(tmp_path):
+    schedule, output = tmp_path / "schedule.csv", tmp_path / "mixes.csv"
+    write_schedule(schedule)
+    checkpoint = tmp_path / "mixes.csv.checkpoint.json"
+    checkpoint.write_text(json.dumps({
+        "params": {"input": str(schedule), "input_size": os.path.getsize(schedule), "chunk_bytes": CHUNK_BYTES},
+        "chunks_done": 2, "rows_done": 300, "output_bytes": 9000,
+    }))
+    with pytest.raises(ValueError, match="delete the checkpoint"):
+        run_pipeline(str(schedule), str(output), workers=1, chunk_bytes=CHUNK_BYTES, resume=True)
+
+
+class Interrupted(Exception):
+    pass
+
+
+@pytest.mark.parametrize('suffix', ['csv', 'parquet'])
+def test_resume_after_a_crash_matches_an_uninterrupted_run(tmp_path, suffix):
+    schedule = tmp_path / "schedule.csv"
+    write_schedule(schedule)
+    expected, output = tmp_path / f"expected.{suffix}", tmp_path / f"mixes.{suffix}"
+    run_pipeline(str(schedule), str(expected), workers=2, chunk_bytes=CHUNK_BYTES)
+
+    def crash(stats):
+        if stats['chunks'] == 3:
+            raise Interrupted
+    with pytest.raises(Interrupted):
+        run_pipeline(str(schedule), str(output), workers=2, chunk_bytes=CHUNK_BYTES, progress=crash)
+    checkpoint = json.loads((tmp_path / f"mixes.{suffix}.checkpoint.json").read_text())
+    assert checkpoint['chunks_done'] == 3
+    if suffix == 'csv':
+        with open(output, 'ab') as f:
+            f.write(b"half a chunk written before the crash")
+
+    stats = run_pipeline(str(schedule), str(output), workers=2, chunk_bytes=CHUNK_BYTES, resume=True)
+    assert stats['rows'] == 2000
+    assert not (tmp_path / f"mixes.{suffix}.checkpoint.json").exists()
+    if suffix == 'csv':
+        assert output.read_bytes() == expected.read_bytes()
+    else:
+        pd.testing.assert_frame_equal(pd.read_parquet(output), pd.read_parquet(expected))
@@ -0,0 +1,77 @@
+"""
+PriceBook: as-of lookup of regional prices and reloading when the database
+file changes.
+
+Run from the repo root:  python -m pytest -q
+"""
+
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from concrete_mix import PRICES, PriceBook, calculate_cost, calculate_mix, cost_by_region, mix_quantities  # noqa: E402
+
+CEMENT, SAND = 'Cement (kg/m³)', 'Fine Aggregate - Sand (kg/m³)'
+
+
+@pytest.fixture
+def book(tmp_path):
+    book = PriceBook(str(tmp_path / "prices.sqlite3"))
+    book.put([
+        ('North', 'cement', '2025-01-01', 7.0),
+        ('North', 'cement', '2025-06-01', 8.0),
+        ('North', 'sand', '2025-03-01', 1.5),
+        ('South', 'cement', '2025-02-01', 6.5),
+    ])
+    return book
+
+
+@pytest.mark.parametrize('as_of, cement, sand', [
+    ('2024-12-31', PRICES[CEMENT], PRICES[SAND]),
+    ('2025-01-01', 7.0, PRICES[SAND]),
+    ('2025-05-31', 7.0, 1.5),
+    ('2025-06-01', 8.0, 1.5),
+    ('2030-01-01', 8.0, 1.5),
+])
+def test_latest_price_on_or_before_the_date(book, as_of, cement, sand):
+    prices = book.prices('North', as_of)
+    assert (prices[CEMENT], prices[SAND]) == (cement, sand)
+    assert prices['Water (L/m³)'] == PRICES['Water (L/m³)']
+
+
+def test_cost_by_region_matches_calculate_cost(book):
+    mix = calculate_mix(30, 75, 20)
+    regions, costs = cost_by_region(mix_quantities(mix), book, '2025-04-01')
+    assert regions == ('North', 'South')
+    for region, cost in zip(regions, costs):
+        assert cost == calculate_cost(mix, book.prices(region, '2025-04-01'))
+
+
+def test_reloads_only_when_the_file_changes(book):
+    book.prices('North', '2025-07-01')
+    book.prices('South', '2025-07-01')
+    assert book.reloads == 1
+
+    time.sleep(0.05)  # the file's mtime moves in clock ticks
+    PriceBook(book.path).put([('North', 'cement', '2025-07-01', 9.0), ('East', 'sand', '2025-01-01', 1.2)])
+    assert book.prices('North', '2025-07-01')[CEMENT] == 9.0
+    assert book.regions() == ('East', 'North', 'South')
+    assert book.reloads == 2
+
+
+def test_missing_file_has_no_regions(tmp_path):
+    book = PriceBook(str(tmp_path / "none.sqlite3"))
+    assert book.regions() == ()
+    with pytest.raises(KeyError, match="no prices for region 'North'"):
+        book.prices('North')
+
+
+def test_bad_rows_and_dates_raise(book):
+    with pytest.raises(ValueError, match="unknown material"):
+        book.put([('North', 'steel', '2025-01-01', 60.0)])
+    with pytest.raises(ValueError, match="is not a YYYY-MM-DD date"):
+        book.prices('North', '01/06/2025')
@@ -0,0 +1,71 @@
+"""
+read_project_schedule / summarize_project: column aliases, blank pour
+dates, bad values and per-grade / per-date totals.
+
+Run from the repo root:  python -m pytest -q
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from concrete_mix import calculate_mix, design_project, read_project_schedule, summarize_project  # noqa: E402
+from concrete_mix.project import UNSCHEDULED  # noqa: E402
+
+
+def schedule(**columns):
+    return pd.DataFrame({
+        'Element': ['F1', 'C1', 'S1', 'B1'],
+        'Grade': ['M25', 'M30', 'M25', 'M40'],
+        'Volume m3': [10.0, 2.5, 30.0, 4.0],
+        **columns,
+    })
+
+
+def test_aliases_are_read_and_other_columns_kept():
+    df = read_project_schedule(schedule(**{'Slump MM': [50, 75, 100, 125], 'Crew': list('abcd')}))
+    assert list(df.columns) == ['element', 'target_strength', 'slump', 'max_agg_size', 'volume', 'Crew']
+    np.testing.assert_array_equal(df['target_strength'], [25, 30, 25, 40])
+    np.testing.assert_array_equal(df['max_agg_size'], 20)
+
+
+def test_blank_pour_dates_are_totalled_last_as_unscheduled():
+    df = read_project_schedule(schedule(**{'Pour Date': ['2026-03-02', '', None, '2026-03-01']}))
+    assert df['pour_date'].isna().tolist() == [False, True, True, False]
+    summary = summarize_project(design_project(df), by='pour_date')
+    assert summary['pour_date'].tolist() == ['2026-03-01', '2026-03-02', UNSCHEDULED]
+    assert summary['elements'].tolist() == [1, 1, 2]
+    assert summary['volume'].tolist() == [4.0, 10.0, 32.5]
+
+
+def test_grade_totals_are_volume_times_the_design():
+    summary = summarize_project(design_project(read_project_schedule(schedule())), by='grade')
+    assert summary['grade'].tolist() == ['M25', 'M30', 'M40']
+    assert summary['elements'].tolist() == [2, 1, 1]
+    m25 = calculate_mix(25)
+    assert summary['cement_kg'][0] == pytest.approx(m25['Cement (kg/m³)'] * 40.0)
+
+
+@pytest.mark.parametrize('columns, message', [
+    ({'Date': ['2026-03-01'] * 4, 'Pour': ['2026-03-01'] * 4}, "columns 'Date' and 'Pour' both give pour_date"),
+    ({'Qty': [1.0] * 4}, "columns 'Volume m3' and 'Qty' both give volume"),
+    ({'Volume m3': [10.0, -2.5, 30.0, 4.0]}, "row 3: volume is negative"),
+    ({'Volume m3': [10.0, None, 30.0, 4.0]}, "row 3: volume is blank"),
+    ({'Pour Date': ['2026-03-01', 'next week', '', '2026-03-04']}, "row 3: pour_date 'next week' is not a date"),
+])
+def test_bad_schedules_raise(columns, message):
+    with pytest.raises(ValueError, match=message):
+        read_project_schedule(schedule(**columns))
+
+
+def test_summary_needs_a_known_grouping():
+    designed = design_project(read_project_schedule(schedule()))
+    with pytest.raises(ValueError, match="no 'pour_date' column"):
+        summarize_project(designed, by='pour_date')
+    with pytest.raises(ValueError, match="by must be one of"):
+        summarize_project(designed, by='element')
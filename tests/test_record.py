@@ -0,0 +1,34 @@
+"""
+MixRecord / MixColumns: packing round trip and range checks.
+
+Run from the repo root:  python -m pytest -q
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from concrete_mix import MixColumns, MixRecord, calculate_cost, calculate_mix, calculate_mix_batch  # noqa: E402
+
+
+def test_round_trip_matches_calculate_mix():
+    strengths, slumps = np.array([15, 25, 40, 60]), np.array([25, 50, 100, 150])
+    columns = MixColumns.from_batch(calculate_mix_batch(strengths, slumps, 20))
+    assert columns.nbytes == 14 * 4
+    for i, (strength, slump) in enumerate(zip(strengths, slumps)):
+        mix = calculate_mix(int(strength), int(slump), 20)
+        assert columns[i] == MixRecord.from_dict(mix)
+        assert columns[i].to_dict() == mix
+        assert columns.data['cost'][i] == calculate_cost(mix)
+
+
+@pytest.mark.parametrize('name, scale', [('cement', 100), ('sand', -100), ('cost', 1e6), ('wc', np.nan)])
+def test_values_that_do_not_fit_raise(name, scale):
+    mixes = calculate_mix_batch([25, 30], 50, 20)
+    mixes[name] = mixes[name] * scale
+    with pytest.raises(ValueError, match="does not fit a packed mix"):
+        MixColumns.from_batch(mixes)
@@ -0,0 +1,82 @@
+"""
+ResultCache: byte-bounded LRU eviction, normalized keys and merging of
+concurrent misses.
+
+Run from the repo root:  python -m pytest -q
+"""
+
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from result_cache import ResultCache  # noqa: E402
+
+
+def sized(nbytes):
+    return lambda value: nbytes
+
+
+def test_evicts_least_recently_used_past_the_byte_budget():
+    cache = ResultCache(max_bytes=100)
+    for key in ('a', 'b'):
+        cache.get('mix', key, lambda: key.upper(), sized(40))
+    cache.get('mix', 'a', lambda: pytest.fail("'a' should be cached"))  # 'a' is now the most recent
+    cache.get('chart', 'c', lambda: 'C', sized(40))
+
+    assert cache.bytes == 80
+    assert cache.stats()['kinds']['mix']['evictions'] == 1
+    assert cache.get('mix', 'a', lambda: None) == 'A'
+    assert cache.get('mix', 'b', lambda: 'recomputed', sized(40)) == 'recomputed'
+    assert cache.bytes == 80
+
+
+def test_entry_larger_than_the_budget_is_not_kept():
+    cache = ResultCache(max_bytes=100)
+    calls = []
+    for _ in range(2):
+        cache.get('surface', 1, lambda: calls.append(1), sized(101))
+    assert len(calls) == 2
+    assert cache.bytes == 0 and cache.stats()['entries'] == 0
+
+
+def test_equal_inputs_share_an_entry():
+    cache = ResultCache()
+    cache.get('mix', (25, 50.0, np.int64(20)), lambda: 'M25')
+    assert cache.get('mix', (25.0, np.float64(50), 20), lambda: pytest.fail("key not normalized")) == 'M25'
+    assert cache.get('mix', (25, 50, 20, True), lambda: 'dark') == 'dark'
+    assert cache.stats()['kinds']['mix'] == {'hits': 1, 'misses': 2, 'evictions': 0, 'hit_rate': 1 / 3}
+
+
+def test_concurrent_misses_compute_once():
+    cache = ResultCache()
+    calls = []
+
+    def compute():
+        calls.append(threading.get_ident())
+        time.sleep(0.1)
+        return 'mix'
+
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(lambda _: cache.get('mix', 30, compute), range(8)))
+    assert results == ['mix'] * 8
+    assert len(calls) == 1
+
+
+def test_failed_compute_is_not_cached():
+    cache = ResultCache()
+
+    def fail():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        cache.get('mix', 30, fail)
+    assert cache.get('mix', 30, lambda: 'mix') == 'mix'
+    cache.clear('mix')
+    assert cache.bytes == 0 and cache.stats()['entries'] == 0
@@ -0,0 +1,50 @@
+"""
+design_schedule: parsing and validation of a schedule's design columns.
+
+Run from the repo root:  python -m pytest -q
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from concrete_mix import calculate_mix_batch, design_schedule  # noqa: E402
+from concrete_mix.schedule import OUTPUT_COLUMNS  # noqa: E402
+
+
+def test_appends_designed_columns_and_keeps_the_rest():
+    df = pd.DataFrame({'element': ['C1', 'C2'], 'target_strength': [25, 40], 'slump': [50, 100]})
+    out = design_schedule(df)
+    assert list(out.columns) == list(df.columns) + OUTPUT_COLUMNS
+    expected = calculate_mix_batch([25, 40], [50, 100], 20)
+    for name in OUTPUT_COLUMNS:
+        np.testing.assert_array_equal(out[name].to_numpy(), expected[name])
+    assert 'cement' not in df.columns
+
+
+def test_grade_labels_are_read_as_strengths():
+    out = design_schedule(pd.DataFrame({'target_strength': ['M25', '30 MPa'], 'max_agg_size': [10, 40]}))
+    expected = calculate_mix_batch([25, 30], 50, [10, 40])
+    np.testing.assert_array_equal(out['cement'].to_numpy(), expected['cement'])
+
+
+@pytest.mark.parametrize('column, values, message', [
+    ('target_strength', [25, None], "row 3: target_strength is blank"),
+    ('target_strength', [25, 'high'], "row 3: target_strength 'high' is not a number"),
+    ('slump', [np.nan, 50], "row 2: slump is blank"),
+])
+def test_blank_or_unreadable_values_raise(column, values, message):
+    df = pd.DataFrame({'target_strength': [25, 30], 'slump': [50, 75]})
+    df[column] = pd.Series(values, dtype=object)
+    with pytest.raises(ValueError, match=message):
+        design_schedule(df)
+
+
+def test_target_strength_is_required():
+    with pytest.raises(ValueError, match="needs a 'target_strength' column"):
+        design_schedule(pd.DataFrame({'slump': [50]}))